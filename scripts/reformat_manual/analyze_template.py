@@ -1,28 +1,77 @@
 #!/usr/bin/env python3
 """
-Template analysis script for analyzing Chapter 0 and Chapter 2 formatting.
-Extracts formatting patterns to document in the formatting guide.
+Template analysis script for analyzing the formatting of every chapter.
+Extracts formatting patterns to document in the formatting guide: a detailed
+analysis per chapter plus a corpus-wide summary merged from per-chapter
+statistics (see utils/template_stats.py).
 """
 
+import re
 import sys
 import json
+import time
+import unicodedata
 import argparse
 from pathlib import Path
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
 
 # Add utils to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils.pdf_utils import extract_chapter, detect_headings
-
-
-def analyze_heading_patterns(text: str) -> dict:
+from utils.build_manifest import MANIFEST_FILENAME, BuildManifest
+from utils.chapter_scheduler import plan_chapter_tasks
+from utils.compact_io import dump_json, output_path_for
+from utils.pdf_backends import BACKENDS, DEFAULT_BACKEND
+from utils.pdf_utils import (
+    PAGE_SEPARATOR,
+    Chapter,
+    extract_chapter,
+    detect_headings,
+    get_page_count
+)
+from utils.line_classifier import ClassifiedLine, classify_lines
+from utils.profiling import (
+    PROFILE_MODES,
+    enable_profiling,
+    get_profiler,
+    profile_path_for,
+    resolve_profile_mode
+)
+from utils.template_stats import TemplateStatistics
+
+
+# Common unicode brackets
+UNICODE_BRACKETS = {
+    '˹': 'LEFT TORTOISE SHELL BRACKET (U+02F9)',
+    '˺': 'RIGHT TORTOISE SHELL BRACKET (U+02FA)',
+    '〔': 'LEFT TORTOISE SHELL BRACKET (U+3014)',
+    '〕': 'RIGHT TORTOISE SHELL BRACKET (U+3015)',
+    '【': 'LEFT BLACK LENTICULAR BRACKET (U+3010)',
+    '】': 'RIGHT BLACK LENTICULAR BRACKET (U+3011)',
+    '「': 'LEFT CORNER BRACKET (U+300C)',
+    '」': 'RIGHT CORNER BRACKET (U+300D)'
+}
+
+
+def analyze_heading_patterns(text: str, page_for_line=None,
+                             lines: Optional[List[ClassifiedLine]] = None) -> dict:
     """
     Analyze heading patterns in the text.
 
+    Args:
+        text: Chapter text
+        page_for_line: Optional callable mapping a line index to its PDF
+            page number (e.g. Chapter.page_for_line); when given, each
+            entry also records 'page_number'
+        lines: Output of classify_lines(text), to avoid classifying again
+
     Returns dictionary with heading analysis.
     """
-    lines = text.split('\n')
+    if lines is None:
+        lines = classify_lines(text)
+
     heading_patterns = {
         'all_caps': [],
         'numbered': [],
@@ -30,112 +79,144 @@ def analyze_heading_patterns(text: str) -> dict:
         'short_lines': []
     }
 
-    for i, line in enumerate(lines):
-        line_stripped = line.strip()
-        if not line_stripped:
+    for line in lines:
+        if line.blank:
             continue
 
         # All caps (potential heading)
-        if line_stripped.isupper() and len(line_stripped) > 2:
+        if line.all_caps:
             heading_patterns['all_caps'].append({
-                'text': line_stripped,
-                'line_num': i
+                'text': line.stripped,
+                'line_num': line.index
             })
 
         # Numbered headings (e.g., "1.2 Title")
-        import re
-        if re.match(r'^(\d+\.)+\d*\s+', line_stripped):
+        if line.numbered_heading:
             heading_patterns['numbered'].append({
-                'text': line_stripped,
-                'line_num': i
+                'text': line.stripped,
+                'line_num': line.index
             })
 
         # Bracketed headings (e.g., "[1.2 Title")
-        if re.match(r'^\[.*\d+\.', line_stripped):
+        if line.bracketed:
             heading_patterns['bracketed'].append({
-                'text': line_stripped,
-                'line_num': i
+                'text': line.stripped,
+                'line_num': line.index
             })
 
         # Short lines followed by blank (potential heading)
-        if (len(line_stripped) < 80 and
-            i + 1 < len(lines) and
-            not lines[i + 1].strip()):
+        if len(line.stripped) < 80 and line.followed_by_blank:
             heading_patterns['short_lines'].append({
-                'text': line_stripped,
-                'line_num': i
+                'text': line.stripped,
+                'line_num': line.index
             })
 
+    if page_for_line is not None:
+        for entries in heading_patterns.values():
+            for entry in entries:
+                entry['page_number'] = page_for_line(entry['line_num'])
+
     return heading_patterns
 
 
-def analyze_list_patterns(text: str) -> dict:
+def analyze_list_patterns(text: str,
+                          lines: Optional[List[ClassifiedLine]] = None) -> dict:
     """
     Analyze list formatting patterns.
 
+    Args:
+        text: Chapter text
+        lines: Output of classify_lines(text), to avoid classifying again
+
     Returns dictionary with list analysis.
     """
-    lines = text.split('\n')
+    if lines is None:
+        lines = classify_lines(text)
+
     list_patterns = {
         'bullet_markers': Counter(),
         'numbered_lists': [],
         'indentation_levels': []
     }
 
-    import re
-
     for line in lines:
         # Count bullet markers
-        if re.match(r'^\s*[●•\-\*]\s+', line):
-            marker = re.match(r'^\s*([●•\-\*])', line).group(1)
-            list_patterns['bullet_markers'][marker] += 1
+        if line.bullet:
+            list_patterns['bullet_markers'][line.bullet] += 1
 
             # Track indentation
-            indent = len(line) - len(line.lstrip())
-            list_patterns['indentation_levels'].append(indent)
+            list_patterns['indentation_levels'].append(line.indent)
 
         # Numbered lists
-        if re.match(r'^\s*\d+[\.\)]\s+', line):
-            list_patterns['numbered_lists'].append(line.strip())
+        if line.numbered_list:
+            list_patterns['numbered_lists'].append(line.stripped)
 
     return list_patterns
 
 
-def analyze_unicode_brackets(text: str) -> dict:
+def analyze_unicode_brackets(text: str, brackets: Optional[Dict[str, str]] = None,
+                             max_examples: int = 5, context: int = 40) -> dict:
     """
     Analyze unicode bracket usage patterns.
 
+    All configured brackets are counted in a single traversal of the text.
+    Context examples are collected only until max_examples per bracket are
+    found. Each example is the same window re.findall('.{0,40}X.{0,40}')
+    would return: non-overlapping and never crossing a line break.
+
+    Args:
+        text: Chapter text
+        brackets: Mapping of bracket character to description
+            (default: UNICODE_BRACKETS)
+        max_examples: Number of context examples to keep per bracket
+        context: Characters of context on each side of an example
+
     Returns dictionary with unicode bracket analysis.
     """
-    import re
-
-    # Common unicode brackets
-    unicode_brackets = {
-        '˹': 'LEFT TORTOISE SHELL BRACKET (U+02F9)',
-        '˺': 'RIGHT TORTOISE SHELL BRACKET (U+02FA)',
-        '〔': 'LEFT TORTOISE SHELL BRACKET (U+3014)',
-        '〕': 'RIGHT TORTOISE SHELL BRACKET (U+3015)',
-        '【': 'LEFT BLACK LENTICULAR BRACKET (U+3010)',
-        '】': 'RIGHT BLACK LENTICULAR BRACKET (U+3011)',
-        '「': 'LEFT CORNER BRACKET (U+300C)',
-        '」': 'RIGHT CORNER BRACKET (U+300D)'
-    }
+    if brackets is None:
+        brackets = UNICODE_BRACKETS
+
+    counts = dict.fromkeys(brackets, 0)
+    found = {bracket: [] for bracket in brackets}
+    # End of the previous example per bracket; earlier hits were consumed by it
+    resume_at = dict.fromkeys(brackets, 0)
+
+    if brackets:
+        pattern = re.compile('|'.join(re.escape(bracket) for bracket in brackets))
+
+        for match in pattern.finditer(text):
+            bracket = match.group()
+            pos = match.start()
+            counts[bracket] += 1
+
+            if len(found[bracket]) >= max_examples or pos < resume_at[bracket]:
+                continue
+
+            line_start = text.rfind('\n', 0, pos) + 1
+            line_end = text.find('\n', pos)
+            if line_end == -1:
+                line_end = len(text)
+
+            # Leading context is greedy, so the window ends at the last
+            # occurrence of the bracket reachable from its start
+            start = max(resume_at[bracket], line_start, pos - context)
+            last = text.rfind(bracket, pos, min(start + context + len(bracket),
+                                                line_end))
+            end = min(last + len(bracket) + context, line_end)
+
+            found[bracket].append(text[start:end])
+            resume_at[bracket] = end
 
     bracket_usage = {}
     examples = {}
 
-    for bracket, description in unicode_brackets.items():
-        count = text.count(bracket)
-        if count > 0:
+    for bracket, description in brackets.items():
+        if counts[bracket] > 0:
             bracket_usage[bracket] = {
-                'count': count,
+                'count': counts[bracket],
                 'description': description
             }
-
-            # Find examples
-            pattern = f'[^{bracket}]*{bracket}[^{bracket}]*'
-            matches = re.findall(f'.{{0,40}}{re.escape(bracket)}.{{0,40}}', text)
-            examples[bracket] = matches[:5]  # First 5 examples
+            examples[bracket] = found[bracket]
 
     return {
         'bracket_usage': bracket_usage,
@@ -143,13 +224,25 @@ def analyze_unicode_brackets(text: str) -> dict:
     }
 
 
-def analyze_spacing_patterns(text: str) -> dict:
+def bracket_description(bracket: str) -> str:
+    """Describe a bracket character in UNICODE_BRACKETS style."""
+    name = unicodedata.name(bracket, 'UNKNOWN CHARACTER')
+    return f"{name} (U+{ord(bracket):04X})"
+
+
+def analyze_spacing_patterns(text: str,
+                             lines: Optional[List[ClassifiedLine]] = None) -> dict:
     """
     Analyze spacing patterns in the text.
 
+    Args:
+        text: Chapter text
+        lines: Output of classify_lines(text), to avoid classifying again
+
     Returns dictionary with spacing analysis.
     """
-    lines = text.split('\n')
+    if lines is None:
+        lines = classify_lines(text)
 
     spacing_patterns = {
         'consecutive_blank_lines': [],
@@ -158,8 +251,8 @@ def analyze_spacing_patterns(text: str) -> dict:
     }
 
     blank_count = 0
-    for i, line in enumerate(lines):
-        if not line.strip():
+    for line in lines:
+        if line.blank:
             blank_count += 1
         else:
             if blank_count > 0:
@@ -169,63 +262,203 @@ def analyze_spacing_patterns(text: str) -> dict:
     return spacing_patterns
 
 
-def analyze_chapter(chapter_data: dict) -> dict:
+def analyze_chapter(chapter_data: dict,
+                    brackets: Optional[Dict[str, str]] = None) -> dict:
     """
     Perform comprehensive analysis of a chapter.
 
     Args:
         chapter_data: Chapter data from extract_chapter
+        brackets: Bracket set for analyze_unicode_brackets
 
     Returns:
         Dictionary with complete analysis
     """
-    text = chapter_data['full_text']
+    profiler = get_profiler()
+
+    with profiler.stage('build_full_text'):
+        text = chapter_data['full_text']
+
+    # Chapter objects can trace line positions back to PDF pages and carry
+    # their own classified lines; classify plain dictionaries once here
+    page_for_line = getattr(chapter_data, 'page_for_line', None)
+    with profiler.stage('classify_lines'):
+        lines = getattr(chapter_data, 'lines', None)
+        if lines is None:
+            lines = classify_lines(text)
 
     analysis = {
         'chapter_name': chapter_data['chapter_name'],
-        'page_count': chapter_data['page_count'],
-        'heading_patterns': analyze_heading_patterns(text),
-        'list_patterns': analyze_list_patterns(text),
-        'unicode_brackets': analyze_unicode_brackets(text),
-        'spacing_patterns': analyze_spacing_patterns(text),
-        'detected_headings': chapter_data['headings']
+        'page_count': chapter_data['page_count']
     }
 
+    with profiler.stage('heading_patterns'):
+        analysis['heading_patterns'] = analyze_heading_patterns(text, page_for_line, lines)
+    with profiler.stage('list_patterns'):
+        analysis['list_patterns'] = analyze_list_patterns(text, lines)
+    with profiler.stage('unicode_brackets'):
+        analysis['unicode_brackets'] = analyze_unicode_brackets(text, brackets)
+    with profiler.stage('spacing_patterns'):
+        analysis['spacing_patterns'] = analyze_spacing_patterns(text, lines)
+    with profiler.stage('heading_detection'):
+        analysis['detected_headings'] = chapter_data['headings']
+
     return analysis
 
 
+class ChapterSource(NamedTuple):
+    """One chapter to analyze, read from the PDF or from a raw chapter file."""
+    name: str                       # Output key, e.g. 'chapter_5_part1'
+    chapter_name: str               # Chapter marker (or file name for raw files)
+    size: int                       # Pages or bytes, to schedule the largest first
+    start_page: Optional[int] = None
+    end_page: Optional[int] = None
+    path: Optional[str] = None      # Raw chapter file; None reads the PDF
+    # (PDF page number, first line) pairs from the build manifest
+    page_lines: Tuple[Tuple[int, int], ...] = ()
+
+
+def load_raw_chapter(path: str, chapter_name: str,
+                     page_lines: Sequence[Sequence[int]] = ()) -> Chapter:
+    """
+    Rebuild a Chapter from a raw chapter file (TextPageWriter layout).
+
+    With the manifest's page line map the file is split back into its
+    pages, so headings carry PDF page numbers; without it the whole file is
+    one page with an unknown page number.
+
+    Args:
+        path: Raw chapter file
+        chapter_name: Name recorded in the analysis
+        page_lines: (PDF page number, first line) pairs from the build manifest
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    if not page_lines:
+        return Chapter(chapter_name, None, None,
+                       [{'page_number': None, 'text': text.removesuffix(PAGE_SEPARATOR)}])
+
+    # Every page is followed by PAGE_SEPARATOR, so the next page starts on
+    # the line after the separator's first newline
+    lines = text.split('\n')
+    pages = []
+    for i, (page_number, start) in enumerate(page_lines):
+        stop = page_lines[i + 1][1] if i + 1 < len(page_lines) else len(lines)
+        chunk = '\n'.join(lines[start:stop]) + ('\n' if stop < len(lines) else '')
+        pages.append({'page_number': page_number,
+                      'text': chunk.removesuffix(PAGE_SEPARATOR)})
+    return Chapter(chapter_name, page_lines[0][0], page_lines[-1][0], pages)
+
+
+def chapter_statistics(chapter: Chapter, analysis: dict) -> TemplateStatistics:
+    """
+    Mergeable statistics of an analyzed chapter.
+
+    Reuses the chapter's classified lines and the analysis's bracket counts,
+    so nothing is scanned a second time.
+    """
+    bracket_counts = {bracket: usage['count'] for bracket, usage
+                      in analysis['unicode_brackets']['bracket_usage'].items()}
+    return TemplateStatistics.for_chapter(chapter.lines, analysis['page_count'],
+                                          bracket_counts)
+
+
+def analyze_with_statistics(chapter: Chapter,
+                            brackets: Optional[Dict[str, str]] = None) -> Tuple[dict, TemplateStatistics]:
+    """analyze_chapter plus the chapter's statistics (for run_pipeline.py)."""
+    analysis = analyze_chapter(chapter, brackets)
+    return analysis, chapter_statistics(chapter, analysis)
+
+
+def analyze_source(source: ChapterSource, pdf_path: Optional[str] = None,
+                   brackets: Optional[Dict[str, str]] = None, use_cache: bool = True,
+                   backend: str = DEFAULT_BACKEND) -> Tuple[dict, TemplateStatistics]:
+    """
+    Worker entry point: load, analyze and summarize one chapter.
+
+    Returns:
+        (analyze_chapter result, the chapter's TemplateStatistics)
+    """
+    profiler = get_profiler()
+    with profiler.stage('extract_chapter'):
+        if source.path:
+            chapter = load_raw_chapter(source.path, source.chapter_name, source.page_lines)
+        else:
+            chapter = extract_chapter(pdf_path, source.chapter_name, source.start_page,
+                                      source.end_page, use_cache=use_cache,
+                                      backend=backend)
+
+    analysis = analyze_chapter(chapter, brackets)
+    if source.path and not source.page_lines:
+        # A raw file without a page map is loaded as a single page
+        analysis['page_count'] = None
+
+    with profiler.stage('statistics'):
+        statistics = chapter_statistics(chapter, analysis)
+
+    return analysis, statistics
+
+
+def pdf_chapter_sources(chapters: List[Dict[str, any]], total_pages: int) -> List[ChapterSource]:
+    """One source per chapter boundary, named as extract_all_chapters.py names its files."""
+    sources = []
+    for (task, _), chapter in zip(plan_chapter_tasks(chapters, Path('.')), chapters):
+        end = task.end_page if task.end_page is not None else total_pages - 1
+        sources.append(ChapterSource(task.name, chapter['chapter_marker'],
+                                     end - task.start_page + 1, task.start_page,
+                                     task.end_page))
+    return sources
+
+
+def raw_chapter_sources(raw_dir: Path) -> List[ChapterSource]:
+    """One source per chapter_*.md file, with page maps from the build manifest."""
+    manifest = BuildManifest(raw_dir / MANIFEST_FILENAME)
+    sources = []
+    for path in sorted(raw_dir.glob('chapter_*.md')):
+        entry = manifest.get(path.name) or {}
+        page_lines = tuple(tuple(pair) for pair in entry.get('page_lines', []))
+        sources.append(ChapterSource(path.stem, path.name, path.stat().st_size,
+                                     path=str(path), page_lines=page_lines))
+    return sources
+
+
 def main():
-    """Analyze formatting patterns in template chapters."""
+    """Analyze formatting patterns across all chapters."""
     parser = argparse.ArgumentParser(
-        description='Analyze formatting patterns in Chapter 0 and Chapter 2'
+        description='Analyze formatting patterns in every chapter and summarize them'
     )
     parser.add_argument(
         'pdf_path',
-        help='Path to the PDF file'
+        nargs='?',
+        help='PDF to read the chapters in --boundaries from; without it the '
+             'raw chapter files in --raw-dir are analyzed'
     )
     parser.add_argument(
-        '--chapter-0-start',
-        type=int,
-        default=2,
-        help='Chapter 0 start page (default: 2)'
+        '--boundaries',
+        type=str,
+        default='output/chapter_boundaries.json',
+        help='Chapter boundaries used with pdf_path '
+             '(default: output/chapter_boundaries.json)'
     )
     parser.add_argument(
-        '--chapter-0-end',
-        type=int,
-        default=8,
-        help='Chapter 0 end page (default: 8)'
+        '--raw-dir',
+        type=str,
+        default='output/chapters/00_raw',
+        help='Raw chapter files analyzed without pdf_path '
+             '(default: output/chapters/00_raw)'
     )
     parser.add_argument(
-        '--chapter-2-start',
-        type=int,
-        default=9,
-        help='Chapter 2 start page (default: 9)'
+        '--chapters',
+        nargs='+',
+        metavar='NUMBER',
+        help='Only analyze these chapter numbers (e.g. "--chapters 0 2")'
     )
     parser.add_argument(
-        '--chapter-2-end',
+        '--jobs',
         type=int,
-        default=30,
-        help='Chapter 2 end page (default: 30)'
+        default=1,
+        help='Number of chapters to analyze concurrently (default: 1)'
     )
     parser.add_argument(
         '--output',
@@ -233,61 +466,144 @@ def main():
         default='output/template_analysis.json',
         help='Output file path (JSON format)'
     )
+    parser.add_argument(
+        '--format',
+        choices=('json', 'compact'),
+        default='json',
+        help='Output layout: indented "json" (default) or "compact"'
+    )
+    parser.add_argument(
+        '--gzip',
+        action='store_true',
+        help='gzip the output (adds .gz to --output)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the on-disk page cache'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=sorted(BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=f'Text extraction backend used with pdf_path (default: {DEFAULT_BACKEND})'
+    )
+    parser.add_argument(
+        '--extra-brackets',
+        type=str,
+        default='',
+        help='Additional bracket characters to analyze, e.g. "『』〈〉"'
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='basic',
+        choices=PROFILE_MODES,
+        help='Record stage and per-page timings next to the output '
+             '("cprofile" also dumps cProfile stats); or set EL_PROFILE. '
+             'Stages are only timed with --jobs 1'
+    )
 
     args = parser.parse_args()
 
-    # Validate PDF file exists
-    pdf_path = Path(args.pdf_path)
-    if not pdf_path.exists():
-        print(f"Error: PDF file not found: {pdf_path}", file=sys.stderr)
+    brackets = dict(UNICODE_BRACKETS)
+    for bracket in args.extra_brackets:
+        if not bracket.isspace():
+            brackets.setdefault(bracket, bracket_description(bracket))
+
+    use_cache = not args.no_cache
+    pdf_path = None
+
+    if args.pdf_path:
+        pdf_path = Path(args.pdf_path)
+        if not pdf_path.exists():
+            print(f"Error: PDF file not found: {pdf_path}", file=sys.stderr)
+            return 1
+        boundaries_path = Path(args.boundaries)
+        if not boundaries_path.exists():
+            print(f"Error: {boundaries_path} not found", file=sys.stderr)
+            print("Run extract_pdf.py --find-chapters first to detect chapters",
+                  file=sys.stderr)
+            return 1
+        with open(boundaries_path, 'r', encoding='utf-8') as f:
+            chapters = json.load(f)
+        sources = pdf_chapter_sources(chapters, get_page_count(str(pdf_path), use_cache,
+                                                               args.backend))
+        pdf_path = str(pdf_path)
+    else:
+        raw_dir = Path(args.raw_dir)
+        if not raw_dir.is_dir():
+            print(f"Error: raw chapter directory not found: {raw_dir}", file=sys.stderr)
+            return 1
+        sources = raw_chapter_sources(raw_dir)
+
+    if args.chapters:
+        wanted = set(args.chapters)
+        sources = [source for source in sources
+                   if source.name.split('_')[1] in wanted]
+
+    if not sources:
+        print("Error: no chapters to analyze", file=sys.stderr)
         return 1
 
+    profiler = enable_profiling(resolve_profile_mode(args.profile))
+    profiler.start()
+
     try:
-        print("Analyzing Chapter 0...")
-        chapter_0 = extract_chapter(
-            str(pdf_path),
-            "Chapter 0",
-            args.chapter_0_start,
-            args.chapter_0_end
-        )
-        analysis_0 = analyze_chapter(chapter_0)
-
-        print("Analyzing Chapter 2...")
-        chapter_2 = extract_chapter(
-            str(pdf_path),
-            "Chapter 2",
-            args.chapter_2_start,
-            args.chapter_2_end
-        )
-        analysis_2 = analyze_chapter(chapter_2)
-
-        # Compare patterns
+        print(f"Analyzing {len(sources)} chapters with {args.jobs} job(s)...")
+        started = time.perf_counter()
+
+        # Largest chapters first; partial statistics are merged as they land
+        ordered = sorted(sources, key=lambda source: source.size, reverse=True)
+        analyses = {}
+        summary = TemplateStatistics()
+
+        def finish(source, analysis, statistics):
+            analyses[source.name] = analysis
+            summary.merge(statistics)
+            print(f"  ✓ {source.name}: {statistics.lines} lines, "
+                  f"{statistics.heading_types['numbered']} numbered headings, "
+                  f"{sum(statistics.bullet_markers.values())} bullets")
+
+        if args.jobs <= 1 or len(sources) < 2:
+            for source in ordered:
+                finish(source, *analyze_source(source, pdf_path, brackets, use_cache,
+                                               args.backend))
+        else:
+            with ProcessPoolExecutor(max_workers=min(args.jobs, len(sources))) as executor:
+                futures = {executor.submit(analyze_source, source, pdf_path, brackets,
+                                           use_cache, args.backend): source
+                           for source in ordered}
+                for future in as_completed(futures):
+                    finish(futures[future], *future.result())
+
+        elapsed = time.perf_counter() - started
+
+        summary_data = summary.to_dict()
         print("\n=== ANALYSIS SUMMARY ===")
-        print(f"\nChapter 0:")
-        print(f"  Pages: {analysis_0['page_count']}")
-        print(f"  All-caps headings: {len(analysis_0['heading_patterns']['all_caps'])}")
-        print(f"  Numbered headings: {len(analysis_0['heading_patterns']['numbered'])}")
-        print(f"  Bracketed headings: {len(analysis_0['heading_patterns']['bracketed'])}")
-        print(f"  Unicode bracket types: {len(analysis_0['unicode_brackets']['bracket_usage'])}")
-
-        print(f"\nChapter 2:")
-        print(f"  Pages: {analysis_2['page_count']}")
-        print(f"  All-caps headings: {len(analysis_2['heading_patterns']['all_caps'])}")
-        print(f"  Numbered headings: {len(analysis_2['heading_patterns']['numbered'])}")
-        print(f"  Bracketed headings: {len(analysis_2['heading_patterns']['bracketed'])}")
-        print(f"  Unicode bracket types: {len(analysis_2['unicode_brackets']['bracket_usage'])}")
+        print(f"  Chapters: {summary.chapters}")
+        if summary.pages:
+            print(f"  Pages: {summary.pages}")
+        print(f"  Lines: {summary.lines} ({summary.blank_lines} blank)")
+        for kind in ('numbered', 'all_caps', 'bracketed'):
+            print(f"  {kind.replace('_', '-').capitalize()} headings: "
+                  f"{summary.heading_types[kind]}")
+        print(f"  Numbered heading depths: {summary_data['heading_depths']}")
+        print(f"  Bullet markers: {summary_data['bullet_markers']}")
+        print(f"  Blank-line runs: {summary_data['blank_runs']}")
+        print(f"  Unicode bracket types: {len(summary.brackets)}")
+        print(f"  Analyzed in {elapsed:.2f}s")
 
         # Save analysis
-        output_path = Path(args.output)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path = output_path_for(args.output, args.gzip)
 
         full_analysis = {
-            'chapter_0': analysis_0,
-            'chapter_2': analysis_2
+            'chapters': {source.name: analyses[source.name] for source in sources},
+            'summary': summary_data
         }
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(full_analysis, f, indent=2, ensure_ascii=False)
+        with profiler.stage('json_output'):
+            dump_json(full_analysis, output_path, args.format, args.gzip)
 
         print(f"\nAnalysis saved to {output_path}")
         print("\nNext step: Review the analysis and document patterns in formatting-guide.md")
@@ -300,6 +616,15 @@ def main():
         traceback.print_exc()
         return 1
 
+    finally:
+        if profiler.enabled:
+            profiler.stop()
+            profile_path = profiler.write(profile_path_for(
+                args.output, 'output/template_analysis.profile.json'
+            ))
+            profiler.print_summary()
+            print(f"Profile saved to {profile_path}")
+
 
 if __name__ == '__main__':
     sys.exit(main())
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Batch chapter detection and extraction for a directory (or glob) of manuals.
+Every document gets its own output tree; all documents share one worker pool.
+"""
+
+import sys
+import glob
+import json
+import time
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List
+
+# Add utils to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.build_manifest import MANIFEST_FILENAME, BuildManifest, extractor_version
+from utils.chapter_scheduler import (
+    ChapterResult,
+    extract_chapter_to_text,
+    plan_chapter_tasks,
+    schedule_largest_first
+)
+from utils.page_cache import file_hash
+from utils.pdf_backends import BACKENDS, DEFAULT_BACKEND
+from utils.pdf_utils import find_chapter_boundaries, get_page_count
+
+
+def resolve_inputs(inputs: List[str]) -> List[Path]:
+    """
+    Expand directories and glob patterns into a sorted list of PDF files.
+
+    Args:
+        inputs: Directories, glob patterns or PDF paths
+
+    Returns:
+        Unique PDF paths in sorted order
+    """
+    pdfs = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            pdfs.update(p for p in path.glob('*.pdf') if p.is_file())
+        elif path.is_file():
+            pdfs.add(path)
+        else:
+            pdfs.update(Path(p) for p in glob.glob(item, recursive=True)
+                        if p.lower().endswith('.pdf'))
+    return sorted(pdfs)
+
+
+def document_dirs(pdfs: List[Path], output_root: Path) -> Dict[Path, Path]:
+    """Give each PDF its own output directory, named after the file stem."""
+    dirs = {}
+    used = set()
+    for pdf in pdfs:
+        name = pdf.stem
+        suffix = 2
+        while name in used:
+            name = f"{pdf.stem}_{suffix}"
+            suffix += 1
+        used.add(name)
+        dirs[pdf] = output_root / name
+    return dirs
+
+
+def main():
+    """Detect and extract chapters for every PDF in the batch."""
+    parser = argparse.ArgumentParser(
+        description='Detect chapters and extract them for a directory or glob of manuals'
+    )
+    parser.add_argument(
+        'inputs',
+        nargs='+',
+        help='PDF files, directories of PDFs or glob patterns (quote globs)'
+    )
+    parser.add_argument(
+        '--output-root',
+        type=str,
+        default='output/documents',
+        help='Root of the per-document output trees (default: output/documents)'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Worker processes shared by all documents (default: 1)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the on-disk page cache'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=sorted(BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=f'Text extraction backend (default: {DEFAULT_BACKEND})'
+    )
+    parser.add_argument(
+        '--fast-scan',
+        action='store_true',
+        help='Pre-screen pages with pypdfium2 during chapter detection'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-extract every chapter, even if its build manifest says it is current'
+    )
+
+    args = parser.parse_args()
+
+    pdfs = resolve_inputs(args.inputs)
+    if not pdfs:
+        print(f"Error: no PDF files found in {', '.join(args.inputs)}", file=sys.stderr)
+        return 1
+
+    use_cache = not args.no_cache
+    output_root = Path(args.output_root)
+    doc_dirs = document_dirs(pdfs, output_root)
+    extractor = extractor_version(args.backend)
+
+    documents = {}
+    for pdf in pdfs:
+        documents[pdf] = {
+            'pdf_path': str(pdf),
+            'output_dir': str(doc_dirs[pdf]),
+            'page_count': 0,
+            'chapters': 0,
+            'extracted': 0,
+            'skipped': 0,
+            'failed': [],
+            'error': None
+        }
+        try:
+            documents[pdf]['page_count'] = get_page_count(str(pdf), use_cache,
+                                                          args.backend)
+        except Exception as e:
+            documents[pdf]['error'] = f"{type(e).__name__}: {e}"
+            print(f"  ✗ {pdf.stem}: cannot open PDF: {e}", file=sys.stderr)
+
+    total_pages = sum(doc['page_count'] for doc in documents.values())
+    print(f"Processing {len(pdfs)} document(s), {total_pages} pages, "
+          f"with {args.jobs} job(s)...")
+    print()
+
+    manifests = {}
+    chapter_inputs = {}
+    started = time.perf_counter()
+
+    # One pool for everything: boundary detection for each document, then
+    # that document's chapters (largest first) as soon as its boundaries land
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        pending = {}
+        for pdf in pdfs:
+            if documents[pdf]['error']:
+                continue
+            future = executor.submit(find_chapter_boundaries, str(pdf), 1,
+                                     use_cache, args.fast_scan, args.backend)
+            pending[future] = ('boundaries', pdf, None)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, pdf, task = pending.pop(future)
+                doc = documents[pdf]
+
+                if kind == 'chapter':
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = ChapterResult(task, 0, 0.0, f"{type(e).__name__}: {e}")
+
+                    if result.error:
+                        doc['failed'].append({'chapter': task.name, 'error': result.error})
+                        print(f"  ✗ {pdf.stem}/{task.name}: failed", file=sys.stderr)
+                    else:
+                        doc['extracted'] += 1
+                        manifests[pdf].record(Path(task.output_path),
+                                              chapter_inputs[pdf][task.index],
+                                              result.page_count, result.page_lines)
+                        print(f"  ✓ {pdf.stem}/{task.name}: {result.page_count} pages "
+                              f"in {result.seconds:.1f}s")
+                    continue
+
+                try:
+                    chapters = future.result()
+                except Exception as e:
+                    doc['error'] = f"{type(e).__name__}: {e}"
+                    print(f"  ✗ {pdf.stem}: chapter detection failed: {e}", file=sys.stderr)
+                    continue
+
+                doc_dir = doc_dirs[pdf]
+                chapters_dir = doc_dir / 'chapters' / '00_raw'
+                chapters_dir.mkdir(parents=True, exist_ok=True)
+                with open(doc_dir / 'chapter_boundaries.json', 'w', encoding='utf-8') as f:
+                    json.dump(chapters, f, indent=2, ensure_ascii=False)
+
+                doc['chapters'] = len(chapters)
+                print(f"  {pdf.stem}: {len(chapters)} chapter(s) detected")
+
+                manifest = BuildManifest(chapters_dir / MANIFEST_FILENAME)
+                manifests[pdf] = manifest
+                pdf_hash = file_hash(str(pdf))
+                planned = plan_chapter_tasks(chapters, chapters_dir)
+                chapter_inputs[pdf] = [manifest.inputs(pdf_hash, chapter, extractor)
+                                       for chapter in chapters]
+                manifest.prune(Path(t.output_path).name for t, _ in planned)
+
+                tasks = []
+                for chapter_task, _ in planned:
+                    inputs = chapter_inputs[pdf][chapter_task.index]
+                    if not args.force and manifest.is_current(
+                            Path(chapter_task.output_path), inputs):
+                        doc['skipped'] += 1
+                    else:
+                        tasks.append(chapter_task)
+
+                for chapter_task in schedule_largest_first(tasks, doc['page_count']):
+                    future = executor.submit(extract_chapter_to_text, str(pdf),
+                                             chapter_task, use_cache, args.backend)
+                    pending[future] = ('chapter', pdf, chapter_task)
+
+    elapsed = time.perf_counter() - started
+
+    for manifest in manifests.values():
+        manifest.save()
+
+    print("\n=== SUMMARY ===")
+    for pdf in pdfs:
+        doc = documents[pdf]
+        if doc['error']:
+            status = f"FAILED ({doc['error']})"
+        else:
+            status = (f"{doc['chapters']} chapters: {doc['extracted']} extracted, "
+                      f"{doc['skipped']} unchanged, {len(doc['failed'])} failed")
+        print(f"  {pdf.stem} ({doc['page_count']} pages): {status}")
+
+    pages_per_second = total_pages / elapsed if elapsed > 0 else None
+    print(f"\nTotal: {total_pages} pages in {elapsed:.2f}s "
+          f"({pages_per_second or 0:.1f} pages/s)")
+
+    summary = {
+        'documents': list(documents.values()),
+        'total_pages': total_pages,
+        'wall_seconds': elapsed,
+        'pages_per_second': pages_per_second,
+        'jobs': args.jobs,
+        'backend': args.backend
+    }
+    output_root.mkdir(parents=True, exist_ok=True)
+    summary_path = output_root / 'batch_summary.json'
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    print(f"Summary saved to {summary_path}")
+
+    failed = any(doc['error'] or doc['failed'] for doc in documents.values())
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
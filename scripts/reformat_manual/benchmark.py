@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Benchmark the extraction pipeline on a deterministic synthetic manual.
+Times each stage and saves JSON results for comparison across commits.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import statistics
+import subprocess
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add utils to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import pdfplumber
+
+from utils.pdf_utils import (
+    Chapter,
+    extract_chapter,
+    extract_text_by_page,
+    find_chapter_boundaries
+)
+from utils.synthetic_pdf import expected_boundaries, write_manual_pdf
+from analyze_template import analyze_chapter
+
+
+def rss_high_water_kb() -> int:
+    """
+    Peak resident set size of this process so far, in KiB.
+
+    This is the process-wide high-water mark, so it never decreases: the
+    figure recorded after a stage is the maximum over that stage and every
+    stage before it. Use --trace-memory for a per-stage (Python heap) peak.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports KiB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def git_commit() -> str:
+    """Return the current git commit hash, or 'unknown'."""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True,
+                                cwd=Path(__file__).parent)
+        return result.stdout.strip() or 'unknown'
+    except OSError:
+        return 'unknown'
+
+
+def run_stage(name: str, func, pages: int, repeat: int,
+              trace_memory: bool = False, setup=None) -> dict:
+    """
+    Time one pipeline stage.
+
+    Args:
+        name: Stage name (for progress output)
+        func: Callable run once per repetition; receives setup()'s result
+        pages: Number of PDF pages the stage processes (for pages/sec)
+        repeat: Number of timed repetitions
+        trace_memory: Record Python heap peak with tracemalloc (slower)
+        setup: Optional untimed callable run before each repetition
+
+    Returns:
+        Dictionary with timings, throughput and memory figures
+    """
+    print(f"  {name}...", end='', flush=True)
+
+    timings = []
+    traced_peak = 0
+    result = None
+
+    for _ in range(repeat):
+        arg = setup() if setup else None
+
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = func(arg)
+        elapsed = time.perf_counter() - start
+        if trace_memory:
+            traced_peak = max(traced_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        timings.append(elapsed)
+
+    best = min(timings)
+    stage = {
+        'wall_seconds': timings,
+        'best_seconds': best,
+        'median_seconds': statistics.median(timings),
+        'pages': pages,
+        'pages_per_second': pages / best if best > 0 else None,
+        # Cumulative across stages, see rss_high_water_kb
+        'rss_high_water_kb': rss_high_water_kb()
+    }
+    if trace_memory:
+        stage['peak_traced_kb'] = traced_peak // 1024
+
+    print(f" {best:.3f}s ({stage['pages_per_second'] or 0:.1f} pages/s)")
+    return stage, result
+
+
+def compare_results(current: dict, baseline: dict) -> None:
+    """Print per-stage speed ratios against a previous results file."""
+    print(f"\n=== COMPARISON vs {baseline['meta'].get('commit', '?')} ===")
+    for name, stage in current['stages'].items():
+        old = baseline['stages'].get(name)
+        if not old:
+            print(f"  {name}: (new stage)")
+            continue
+        ratio = old['best_seconds'] / stage['best_seconds'] if stage['best_seconds'] else 0
+        change = 'faster' if ratio >= 1 else 'slower'
+        print(f"  {name}: {stage['best_seconds']:.3f}s vs {old['best_seconds']:.3f}s "
+              f"({ratio:.2f}x {change})")
+
+
+def main():
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark PDF extraction and analysis on a synthetic manual'
+    )
+    parser.add_argument(
+        '--pages',
+        type=int,
+        default=60,
+        help='Number of pages in the synthetic manual (default: 60)'
+    )
+    parser.add_argument(
+        '--chapters',
+        type=int,
+        default=6,
+        help='Number of chapters in the synthetic manual (default: 6)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='Random seed for the synthetic content (default: 0)'
+    )
+    parser.add_argument(
+        '--pdf',
+        type=str,
+        help='Benchmark an existing PDF instead of generating one'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='Timed repetitions per stage (default: 3)'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Worker processes for page extraction (default: 1)'
+    )
+    parser.add_argument(
+        '--trace-memory',
+        action='store_true',
+        help='Also record the Python heap peak per stage (slower)'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        help='Output file path (default: output/benchmarks/bench_<commit>.json)'
+    )
+    parser.add_argument(
+        '--compare',
+        type=str,
+        help='Previous results file to compare against'
+    )
+
+    args = parser.parse_args()
+
+    commit = git_commit()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Isolated page cache so cold and warm runs are meaningful
+        os.environ['EL_PAGE_CACHE_DIR'] = str(Path(tmp_dir) / 'cache')
+
+        if args.pdf:
+            pdf_path = args.pdf
+            expected = None
+        else:
+            pdf_path = str(Path(tmp_dir) / 'synthetic_manual.pdf')
+            print(f"Generating synthetic manual ({args.pages} pages, "
+                  f"{args.chapters} chapters, seed {args.seed})...")
+            write_manual_pdf(pdf_path, args.pages, args.chapters, args.seed)
+            expected = expected_boundaries(args.pages, args.chapters)
+
+        with pdfplumber.open(pdf_path) as pdf:
+            page_count = len(pdf.pages)
+
+        print(f"Benchmarking {pdf_path} ({page_count} pages, "
+              f"{args.repeat} repetitions, {args.jobs} job(s))")
+
+        stages = {}
+        jobs = args.jobs
+
+        stages['extract_text_by_page'], pages = run_stage(
+            'extract_text_by_page', lambda _: extract_text_by_page(
+                pdf_path, workers=jobs, use_cache=False),
+            page_count, args.repeat, args.trace_memory)
+
+        # Warm the cache once, then time cached reads
+        extract_text_by_page(pdf_path, workers=jobs)
+        stages['extract_text_by_page_cached'], _ = run_stage(
+            'extract_text_by_page (cached)', lambda _: extract_text_by_page(pdf_path),
+            page_count, args.repeat, args.trace_memory)
+
+        stages['extract_text_by_page_pypdfium2'], _ = run_stage(
+            'extract_text_by_page (pypdfium2)', lambda _: extract_text_by_page(
+                pdf_path, workers=jobs, use_cache=False, backend='pypdfium2'),
+            page_count, args.repeat, args.trace_memory)
+
+        stages['find_chapter_boundaries'], boundaries = run_stage(
+            'find_chapter_boundaries', lambda _: find_chapter_boundaries(
+                pdf_path, workers=jobs, use_cache=False),
+            page_count, args.repeat, args.trace_memory)
+
+        stages['find_chapter_boundaries_fast'], fast_boundaries = run_stage(
+            'find_chapter_boundaries (fast)', lambda _: find_chapter_boundaries(
+                pdf_path, workers=jobs, use_cache=False, fast=True),
+            page_count, args.repeat, args.trace_memory)
+
+        # Largest chapter dominates real runs, so benchmark that one
+        if boundaries:
+            spans = [((b['end_page'] if b['end_page'] is not None else page_count - 1)
+                      - b['page_number'] + 1, b) for b in boundaries]
+            chapter_pages, largest = max(spans, key=lambda span: span[0])
+            chapter_args = (largest['chapter_marker'], largest['page_number'],
+                            largest['end_page'])
+        else:
+            chapter_pages = page_count
+            chapter_args = ('Whole document', None, None)
+
+        stages['extract_chapter'], chapter = run_stage(
+            'extract_chapter', lambda _: extract_chapter(
+                pdf_path, *chapter_args, workers=jobs, use_cache=False),
+            chapter_pages, args.repeat, args.trace_memory)
+
+        # Fresh Chapter per repetition so lazily built text is not reused
+        stages['analyze_chapter'], _ = run_stage(
+            'analyze_chapter', analyze_chapter, chapter_pages, args.repeat,
+            args.trace_memory,
+            setup=lambda: Chapter(chapter.chapter_name, chapter.start_page,
+                                  chapter.end_page, chapter.pages))
+
+    results = {
+        'meta': {
+            'commit': commit,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pdfplumber': pdfplumber.__version__,
+            'pdf': args.pdf or 'synthetic',
+            'pages': page_count,
+            'chapters': args.chapters if not args.pdf else len(boundaries),
+            'seed': None if args.pdf else args.seed,
+            'repeat': args.repeat,
+            'jobs': args.jobs,
+            'extracted_pages': len(pages)
+        },
+        'checks': {
+            'boundaries_match_expected': (boundaries == expected) if expected is not None else None,
+            'fast_boundaries_match': fast_boundaries == boundaries
+        },
+        'stages': stages
+    }
+
+    output_path = Path(args.output or f"output/benchmarks/bench_{commit}.json")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    print(f"\nChecks: {results['checks']}")
+    print(f"Results saved to {output_path}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare_results(results, json.load(f))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Diff two versions of the manual page by page (see utils/revision_diff.py).
+Reports changed, inserted and deleted pages and which chapter boundaries
+moved, and optionally re-extracts just the pages that need updating.
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add utils to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.compact_io import OUTPUT_FORMATS, dump_json, page_list_writer
+from utils.pdf_backends import BACKENDS, DEFAULT_BACKEND
+from utils.revision_diff import diff_versions, extract_changed_pages, pages_to_update
+
+
+def format_ranges(pages) -> str:
+    """Collapse page numbers into 'a-b, c' ranges."""
+    ranges = []
+    for page in sorted(pages):
+        if ranges and page == ranges[-1][1] + 1:
+            ranges[-1][1] = page
+        else:
+            ranges.append([page, page])
+    return ', '.join(str(a) if a == b else f"{a}-{b}" for a, b in ranges) or 'none'
+
+
+def main():
+    """Compare two manual versions and report what changed."""
+    parser = argparse.ArgumentParser(
+        description='Page-level diff between two versions of a manual PDF'
+    )
+    parser.add_argument(
+        'old_pdf',
+        help='Path to the old version'
+    )
+    parser.add_argument(
+        'new_pdf',
+        help='Path to the new version'
+    )
+    parser.add_argument(
+        '--boundaries',
+        type=str,
+        default='output/chapter_boundaries.json',
+        help='Chapter boundaries of the old version '
+             '(default: output/chapter_boundaries.json, detected if missing)'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        default='output/version_diff.json',
+        help='Diff report path (default: output/version_diff.json)'
+    )
+    parser.add_argument(
+        '--pages-output',
+        type=str,
+        help='Re-extract the changed and inserted pages of the new version '
+             'into this page list file'
+    )
+    parser.add_argument(
+        '--format',
+        choices=OUTPUT_FORMATS,
+        default='json',
+        help='Layout of the report and --pages-output (default: json)'
+    )
+    parser.add_argument(
+        '--hash-backend',
+        choices=sorted(BACKENDS),
+        default='pypdfium2',
+        help='Backend used to hash every page (default: pypdfium2)'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=sorted(BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=f'Backend for --pages-output text (default: {DEFAULT_BACKEND})'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Worker processes for page extraction (default: 1)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the on-disk page cache'
+    )
+
+    args = parser.parse_args()
+
+    for pdf in (args.old_pdf, args.new_pdf):
+        if not Path(pdf).exists():
+            print(f"Error: PDF file not found: {pdf}", file=sys.stderr)
+            return 1
+
+    boundaries = None
+    boundaries_path = Path(args.boundaries)
+    if boundaries_path.exists():
+        with open(boundaries_path, 'r', encoding='utf-8') as f:
+            boundaries = json.load(f)
+    else:
+        print(f"{boundaries_path} not found, detecting chapters in {args.old_pdf}")
+
+    print(f"Hashing pages of {args.old_pdf} and {args.new_pdf}...")
+    report = diff_versions(args.old_pdf, args.new_pdf, boundaries, workers=args.jobs,
+                           use_cache=not args.no_cache, backend=args.hash_backend)
+
+    print(f"\nPages: {report['old_page_count']} -> {report['new_page_count']} "
+          f"({report['unchanged_pages']} unchanged)")
+    print(f"  Changed (new pages):  "
+          f"{format_ranges(new for _, new in report['changed_pages'])}")
+    print(f"  Inserted (new pages): {format_ranges(report['inserted_pages'])}")
+    print(f"  Deleted (old pages):  {format_ranges(report['deleted_pages'])}")
+
+    print("\nChapters:")
+    for chapter in report['chapters']:
+        if chapter['status'] == 'unchanged':
+            continue
+        old_end = chapter['old_end_page'] if chapter['old_end_page'] is not None else 'end'
+        new_end = chapter['new_end_page'] if chapter['new_end_page'] is not None else 'end'
+        new_start = chapter['new_page_number'] if chapter['new_page_number'] is not None else '-'
+        print(f"  {chapter['status']:<16} {chapter['chapter_marker']}: "
+              f"{chapter['old_page_number']}-{old_end} -> {new_start}-{new_end}")
+    for chapter in report['added_chapters']:
+        print(f"  {'added':<16} {chapter['chapter_marker']}: page {chapter['page_number']}")
+    unchanged = sum(1 for chapter in report['chapters'] if chapter['status'] == 'unchanged')
+    print(f"  ({unchanged} of {len(report['chapters'])} chapters unchanged)")
+
+    dump_json(report, args.output, args.format)
+    print(f"\nReport saved to: {args.output}")
+
+    if args.pages_output:
+        count = 0
+        with page_list_writer(args.pages_output, args.format) as writer:
+            for page in extract_changed_pages(args.new_pdf, report, workers=args.jobs,
+                                              use_cache=not args.no_cache,
+                                              backend=args.backend):
+                writer.write_page(page)
+                count += 1
+        print(f"Re-extracted {count} of {len(pages_to_update(report))} pages "
+              f"to: {args.pages_output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,14 +3,74 @@
 Batch extract all chapters from the PDF using chapter boundaries.
 """
 
-import json
-import subprocess
 import sys
+import json
+import time
+import argparse
 from pathlib import Path
 
+# Add utils to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.build_manifest import MANIFEST_FILENAME, BuildManifest, extractor_version
+from utils.chapter_scheduler import plan_chapter_tasks, run_chapter_tasks
+from utils.page_cache import file_hash
+from utils.page_store import build_page_store, page_store_is_current
+from utils.page_template import load_or_learn_template
+from utils.pdf_backends import BACKENDS, DEFAULT_BACKEND
+
 
 def main():
     """Extract all chapters based on chapter_boundaries.json"""
+    parser = argparse.ArgumentParser(
+        description='Extract all chapters listed in chapter_boundaries.json'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Worker processes for page extraction in the single pass over the '
+             'PDF (default: 1)'
+    )
+    parser.add_argument(
+        '--chapter-jobs',
+        type=int,
+        default=1,
+        help='Extract this many chapters concurrently, each reading its own pages '
+             'in a separate process, instead of one pass over the PDF (default: 1)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the on-disk page cache'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=sorted(BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=f'Text extraction backend (default: {DEFAULT_BACKEND})'
+    )
+    parser.add_argument(
+        '--page-store',
+        type=str,
+        metavar='PATH',
+        help='Also pack every page into a memory-mapped page store at PATH '
+             '(see page_store.py); stripped like the chapters with '
+             '--strip-headers, and only rebuilt when its inputs changed'
+    )
+    parser.add_argument(
+        '--strip-headers',
+        action='store_true',
+        help='Remove running header and footer lines learned across the whole '
+             'PDF (cached per PDF hash)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-extract every chapter, even if the build manifest says it is current'
+    )
+
+    args = parser.parse_args()
 
     # Load chapter boundaries
     boundaries_path = Path('output/chapter_boundaries.json')
@@ -31,54 +91,102 @@ def main():
     print(f"Extracting {len(chapters)} chapters from {pdf_path}...")
     print()
 
-    # Track Chapter 5 parts
-    chapter_5_count = 0
+    # Inputs that decide whether a chapter's output is still current
+    manifest = BuildManifest(output_dir / MANIFEST_FILENAME)
+    pdf_hash = file_hash(pdf_path)
+    extractor = extractor_version(args.backend)
+
+    template = None
+    if args.strip_headers:
+        template = load_or_learn_template(pdf_path, workers=args.jobs,
+                                          use_cache=not args.no_cache,
+                                          backend=args.backend)
+        # A different template changes every chapter's text
+        extractor = f"{extractor}+template-{template.digest}"
+        print(f"Stripping {sum(len(keys) for keys in template.lines.values())} "
+              f"running header/footer lines")
+        print()
 
-    for chapter in chapters:
-        chapter_num = chapter['chapter_number']
-        chapter_marker = chapter['chapter_marker']
-        start_page = chapter['page_number']
-        end_page = chapter['end_page']
+    chapter_inputs = []
+    tasks = []
 
-        # Handle duplicate Chapter 5
-        if chapter_num == '5':
-            chapter_5_count += 1
-            safe_filename = f"chapter_{chapter_num}_part{chapter_5_count}.md"
-            display_name = f"Chapter {chapter_num} Part {chapter_5_count}"
-        else:
-            safe_filename = f"chapter_{chapter_num}.md"
-            display_name = f"Chapter {chapter_num}"
+    for (task, display_name), chapter in zip(plan_chapter_tasks(chapters, output_dir),
+                                             chapters):
+        output_path = Path(task.output_path)
+        inputs = manifest.inputs(pdf_hash, chapter, extractor)
+        chapter_inputs.append(inputs)
 
-        output_path = output_dir / safe_filename
+        if not args.force and manifest.is_current(output_path, inputs):
+            print(f"Skipping {display_name}: {chapter['chapter_marker']} (unchanged)")
+            continue
 
-        print(f"Extracting {display_name}: {chapter_marker}")
-        print(f"  Pages: {start_page} to {end_page or 'end'}")
+        tasks.append(task)
+        print(f"Extracting {display_name}: {chapter['chapter_marker']}")
+        print(f"  Pages: {task.start_page} to {task.end_page or 'end'}")
         print(f"  Output: {output_path}")
+        print()
 
-        # Build command
-        cmd = [
-            '.venv/bin/python',
-            'scripts/reformat_manual/extract_pdf.py',
-            pdf_path,
-            '--chapter', chapter_marker,
-            '--start-page', str(start_page),
-            '--output-text', str(output_path)
-        ]
+    if args.page_store:
+        if not args.force and page_store_is_current(args.page_store, pdf_path, chapters,
+                                                    args.backend, template):
+            print(f"Page store {args.page_store} is up to date")
+        else:
+            print(f"Building page store {args.page_store}...")
+            build_page_store(pdf_path, args.page_store, chapters, workers=args.jobs,
+                             use_cache=not args.no_cache, backend=args.backend,
+                             template=template)
+        print()
 
-        if end_page:
-            cmd.extend(['--end-page', str(end_page)])
+    if not tasks:
+        print("\nAll chapters are up to date")
+        return 0
 
-        # Run extraction
-        result = subprocess.run(cmd, capture_output=True, text=True)
+    def report(result):
+        if result.error:
+            print(f"  ✗ {result.task.name}: failed after {result.seconds:.1f}s",
+                  file=sys.stderr)
+        else:
+            print(f"  ✓ {result.task.name}: {result.page_count} pages "
+                  f"in {result.seconds:.1f}s")
+
+    # One pass over the PDF, or chapters largest first with --chapter-jobs;
+    # failures are collected, not fatal
+    started = time.perf_counter()
+    results = run_chapter_tasks(pdf_path, tasks, jobs=args.jobs,
+                                use_cache=not args.no_cache, backend=args.backend,
+                                on_result=report, template=template,
+                                chapter_jobs=args.chapter_jobs)
+    elapsed = time.perf_counter() - started
+
+    failures = [result for result in results if result.error]
+    for result in results:
+        if not result.error:
+            manifest.record(Path(result.task.output_path),
+                            chapter_inputs[result.task.index], result.page_count,
+                            result.page_lines)
+
+    print("\n=== SUMMARY ===")
+    for result in sorted(results, key=lambda result: result.seconds, reverse=True):
+        status = 'FAILED' if result.error else f"{result.page_count} pages"
+        print(f"  {result.task.name}: {result.seconds:.2f}s ({status})")
+    print(f"Wall time: {elapsed:.2f}s with {args.jobs} page job(s), "
+          f"{args.chapter_jobs} chapter job(s)")
+    print()
 
-        if result.returncode != 0:
-            print(f"  ERROR: {result.stderr}", file=sys.stderr)
-            return 1
+    manifest.prune(Path(task.output_path).name
+                   for task, _ in plan_chapter_tasks(chapters, output_dir))
+    manifest.save()
 
-        print(f"  ✓ Extracted successfully")
-        print()
+    skipped = len(chapters) - len(tasks)
+    print(f"Extracted {len(tasks) - len(failures)} chapter(s), skipped {skipped} "
+          f"unchanged, to {output_dir}/")
+
+    if failures:
+        print(f"\n{len(failures)} chapter(s) failed:", file=sys.stderr)
+        for result in failures:
+            print(f"\n--- {result.task.name} ---\n{result.error}", file=sys.stderr)
+        return 1
 
-    print(f"All chapters extracted to {output_dir}/")
     return 0
 
 
@@ -5,19 +5,36 @@ Extracts chapters from the EL Caregiver Manual PDF.
 """
 
 import sys
-import json
 import argparse
+from contextlib import ExitStack
 from pathlib import Path
 
 # Add utils to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from utils.compact_io import (
+    OUTPUT_FORMATS,
+    chapter_writer,
+    dump_json,
+    output_path_for,
+    page_list_writer
+)
+from utils.layout_headings import load_document_layout
+from utils.page_template import load_or_learn_template, strip_page_template
+from utils.pdf_backends import BACKENDS, DEFAULT_BACKEND
 from utils.pdf_utils import (
-    extract_chapter,
-    extract_text_by_page,
+    compare_backends,
+    detect_headings,
     find_chapter_boundaries,
-    preserve_unicode
+    iter_pages
+)
+from utils.profiling import (
+    PROFILE_MODES,
+    enable_profiling,
+    profile_path_for,
+    resolve_profile_mode
 )
+from utils.stream_writers import TextPageWriter
 
 
 def main():
@@ -49,16 +66,77 @@ def main():
         action='store_true',
         help='Automatically detect chapter boundaries'
     )
+    parser.add_argument(
+        '--fast-scan',
+        action='store_true',
+        help='With --find-chapters, pre-screen pages with pypdfium2 and fully extract only candidates'
+    )
     parser.add_argument(
         '--output',
         type=str,
         help='Output file path (JSON format)'
     )
+    parser.add_argument(
+        '--format',
+        choices=OUTPUT_FORMATS,
+        default='json',
+        help='JSON output layout: indented "json" (default), "compact" '
+             '(chapter text stored once) or "jsonl" (one page per line)'
+    )
+    parser.add_argument(
+        '--gzip',
+        action='store_true',
+        help='gzip the JSON output (adds .gz to --output)'
+    )
     parser.add_argument(
         '--output-text',
         type=str,
         help='Output file path (plain text format)'
     )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of worker processes for page extraction (default: 1)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the on-disk page cache'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=sorted(BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=f'Text extraction backend (default: {DEFAULT_BACKEND})'
+    )
+    parser.add_argument(
+        '--headings',
+        choices=('text', 'layout'),
+        default='text',
+        help='With --chapter, heading detection from text patterns (default) '
+             'or from font size and weight ("layout", adds heading levels)'
+    )
+    parser.add_argument(
+        '--strip-headers',
+        action='store_true',
+        help='Remove running header and footer lines learned across the whole '
+             'PDF (cached per PDF hash)'
+    )
+    parser.add_argument(
+        '--compare-backends',
+        action='store_true',
+        help='Compare pdfplumber and pypdfium2 text over the page range and '
+             'write a report (JSON) to --output'
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='basic',
+        choices=PROFILE_MODES,
+        help='Record stage and per-page timings next to the output '
+             '("cprofile" also dumps cProfile stats); or set EL_PROFILE'
+    )
 
     args = parser.parse_args()
 
@@ -68,11 +146,47 @@ def main():
         print(f"Error: PDF file not found: {pdf_path}", file=sys.stderr)
         return 1
 
+    if args.output:
+        args.output = str(output_path_for(args.output, args.gzip))
+
+    profiler = enable_profiling(resolve_profile_mode(args.profile))
+    profiler.start()
+
     try:
+        # Backend comparison mode
+        if args.compare_backends:
+            candidate = args.backend if args.backend != DEFAULT_BACKEND else 'pypdfium2'
+            print(f"Comparing {DEFAULT_BACKEND} and {candidate} on {pdf_path}...")
+            with profiler.stage('compare_backends'):
+                report = compare_backends(str(pdf_path), args.start_page, args.end_page,
+                                          candidate=candidate,
+                                          use_cache=not args.no_cache)
+
+            summary = report['summary']
+            counts = summary['status_counts']
+            print(f"\nCompared {summary['pages_compared']} pages "
+                  f"(pages {report['start_page']}-{report['end_page']}):")
+            print(f"  Identical: {counts['identical']}")
+            print(f"  Whitespace only: {counts['whitespace']}")
+            print(f"  Different: {counts['different']}")
+            for name, seconds in report['seconds'].items():
+                print(f"  {name}: {seconds:.2f}s")
+            print(f"  Chapter boundaries match: {summary['boundaries_match']}")
+
+            if args.output:
+                dump_json(report, args.output, args.format, args.gzip)
+                print(f"\nComparison report saved to {args.output}")
+
+            return 0
+
         # Find chapters mode
         if args.find_chapters:
             print(f"Detecting chapter boundaries in {pdf_path}...")
-            chapters = find_chapter_boundaries(str(pdf_path))
+            with profiler.stage('find_chapter_boundaries'):
+                chapters = find_chapter_boundaries(str(pdf_path), workers=args.jobs,
+                                                   use_cache=not args.no_cache,
+                                                   fast=args.fast_scan,
+                                                   backend=args.backend)
 
             print(f"\nFound {len(chapters)} chapter markers:")
             for i, chapter in enumerate(chapters, 1):
@@ -80,43 +194,82 @@ def main():
                 print(f"  {i}. {chapter['chapter_marker']} (page {chapter['page_number']} {end})")
 
             if args.output:
-                output_path = Path(args.output)
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(chapters, f, indent=2, ensure_ascii=False)
-                print(f"\nChapter boundaries saved to {output_path}")
+                with profiler.stage('json_output'):
+                    dump_json(chapters, args.output, args.format, args.gzip)
+                print(f"\nChapter boundaries saved to {args.output}")
 
             return 0
 
+        template = None
+        if args.strip_headers and (args.chapter or args.start_page is not None
+                                   or args.end_page is not None):
+            with profiler.stage('page_template'):
+                template = load_or_learn_template(str(pdf_path), workers=args.jobs,
+                                                  use_cache=not args.no_cache,
+                                                  backend=args.backend)
+            print(f"Stripping {sum(len(keys) for keys in template.lines.values())} "
+                  f"running header/footer lines")
+
         # Extract chapter mode
         if args.chapter:
             print(f"Extracting chapter '{args.chapter}' from {pdf_path}...")
 
-            chapter_data = extract_chapter(
-                str(pdf_path),
-                args.chapter,
-                args.start_page,
-                args.end_page
-            )
+            page_count = 0
+            heading_count = 0
 
-            print(f"Extracted {chapter_data['page_count']} pages")
-            print(f"Found {len(chapter_data['headings'])} potential headings")
+            # Stream pages straight to the requested outputs
+            with ExitStack() as stack:
+                json_writer = None
+                text_writer = None
+                if args.output:
+                    json_writer = stack.enter_context(chapter_writer(
+                        args.output, args.chapter, args.start_page, args.end_page,
+                        args.format, args.gzip
+                    ))
+                if args.output_text:
+                    text_writer = stack.enter_context(TextPageWriter(args.output_text))
 
-            # Save as JSON
-            if args.output:
-                output_path = Path(args.output)
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(chapter_data, f, indent=2, ensure_ascii=False)
-                print(f"Chapter data saved to {output_path}")
+                layout = None
+                if args.headings == 'layout':
+                    # Document-wide font statistics, cached per PDF hash
+                    with profiler.stage('page_layout'):
+                        layout = load_document_layout(
+                            str(pdf_path), args.start_page, args.end_page,
+                            workers=args.jobs, use_cache=not args.no_cache
+                        )
+
+                pages = iter_pages(str(pdf_path), args.start_page, args.end_page,
+                                   workers=args.jobs, use_cache=not args.no_cache,
+                                   backend=args.backend)
+                if template:
+                    pages = strip_page_template(pages, template)
+
+                for page in profiler.timed_iter('page_extraction', pages):
+                    with profiler.stage('heading_detection'):
+                        if layout is not None:
+                            headings = layout.headings(page)
+                        else:
+                            headings = detect_headings(page['text'], page['page_number'])
+                    page_count += 1
+                    heading_count += len(headings)
+
+                    if json_writer:
+                        with profiler.stage('json_output'):
+                            json_writer.write_page(page, headings)
+                    if text_writer:
+                        with profiler.stage('text_output'):
+                            text_writer.write_page(page)
+
+                with profiler.stage('finalize_outputs'):
+                    stack.close()
+
+            print(f"Extracted {page_count} pages")
+            print(f"Found {heading_count} potential headings")
 
-            # Save as text
+            if args.output:
+                print(f"Chapter data saved to {args.output}")
             if args.output_text:
-                output_path = Path(args.output_text)
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(chapter_data['full_text'])
-                print(f"Chapter text saved to {output_path}")
+                print(f"Chapter text saved to {args.output_text}")
 
             return 0
 
@@ -124,34 +277,47 @@ def main():
         if args.start_page is not None or args.end_page is not None:
             print(f"Extracting pages {args.start_page or 0} to {args.end_page or 'end'}...")
 
-            pages = extract_text_by_page(str(pdf_path), args.start_page, args.end_page)
+            page_count = 0
 
-            print(f"Extracted {len(pages)} pages")
+            # Stream pages straight to the requested outputs
+            with ExitStack() as stack:
+                writers = []
+                if args.output_text:
+                    writers.append(stack.enter_context(
+                        TextPageWriter(args.output_text, trailing=False)
+                    ))
+                if args.output:
+                    writers.append(stack.enter_context(
+                        page_list_writer(args.output, args.format, args.gzip)
+                    ))
 
-            # Combine pages into full text
-            full_text = "\n\n".join(page['text'] for page in pages)
-            full_text = preserve_unicode(full_text)
+                pages = iter_pages(str(pdf_path), args.start_page, args.end_page,
+                                   workers=args.jobs, use_cache=not args.no_cache,
+                                   backend=args.backend)
+                if template:
+                    pages = strip_page_template(pages, template)
 
-            # Save as text
-            if args.output_text:
-                output_path = Path(args.output_text)
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(full_text)
-                print(f"Text saved to {output_path}")
+                for page in profiler.timed_iter('page_extraction', pages):
+                    page_count += 1
+                    with profiler.stage('output'):
+                        for writer in writers:
+                            writer.write_page(page)
+
+                with profiler.stage('finalize_outputs'):
+                    stack.close()
 
-            # Save as JSON
+            print(f"Extracted {page_count} pages")
+
+            if args.output_text:
+                print(f"Text saved to {args.output_text}")
             if args.output:
-                output_path = Path(args.output)
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(pages, f, indent=2, ensure_ascii=False)
-                print(f"Page data saved to {output_path}")
+                print(f"Page data saved to {args.output}")
 
             return 0
 
         # No action specified
-        print("Error: Please specify --chapter, --start-page/--end-page, or --find-chapters", file=sys.stderr)
+        print("Error: Please specify --chapter, --start-page/--end-page, --find-chapters "
+              "or --compare-backends", file=sys.stderr)
         parser.print_help()
         return 1
 
@@ -161,6 +327,15 @@ def main():
         traceback.print_exc()
         return 1
 
+    finally:
+        if profiler.enabled:
+            profiler.stop()
+            profile_path = profiler.write(profile_path_for(
+                args.output or args.output_text, 'output/extract_pdf.profile.json'
+            ))
+            profiler.print_summary()
+            print(f"Profile saved to {profile_path}")
+
 
 if __name__ == '__main__':
     sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Build and query the packed page store (see utils/page_store.py).
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add utils to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.pdf_backends import BACKENDS, DEFAULT_BACKEND
+from utils.page_store import PageStore, build_page_store
+from utils.page_template import load_or_learn_template
+
+
+def main():
+    """Build a page store from a PDF, or print text from one."""
+    parser = argparse.ArgumentParser(
+        description='Build or query a memory-mapped page text store'
+    )
+    parser.add_argument(
+        'store',
+        help='Path to the page store file'
+    )
+    parser.add_argument(
+        '--build',
+        type=str,
+        metavar='PDF',
+        help='Extract every page of PDF into the store (overwrites it)'
+    )
+    parser.add_argument(
+        '--boundaries',
+        type=str,
+        default='output/chapter_boundaries.json',
+        help='With --build, chapter boundaries to record '
+             '(default: output/chapter_boundaries.json, skipped if missing)'
+    )
+    parser.add_argument(
+        '--page',
+        type=int,
+        help='Print one page (0-indexed PDF page number)'
+    )
+    parser.add_argument(
+        '--pages',
+        type=int,
+        nargs=2,
+        metavar=('START', 'END'),
+        help='Print pages START to END (inclusive)'
+    )
+    parser.add_argument(
+        '--chapter',
+        type=str,
+        help='Print a chapter by chapter number (e.g. "4"), marker text, or '
+             'part name (e.g. "5_part2") for a number that occurs twice'
+    )
+    parser.add_argument(
+        '--lines',
+        type=int,
+        nargs=2,
+        metavar=('START', 'END'),
+        help='Print lines START to END (exclusive), counted from the start '
+             'of --chapter if given'
+    )
+    parser.add_argument(
+        '--info',
+        action='store_true',
+        help='Print store metadata and page count'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='With --build, worker processes for page extraction (default: 1)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='With --build, bypass the on-disk page cache'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=sorted(BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=f'With --build, text extraction backend (default: {DEFAULT_BACKEND})'
+    )
+    parser.add_argument(
+        '--strip-headers',
+        action='store_true',
+        help='With --build, remove running header and footer lines, as '
+             'extract_all_chapters.py --strip-headers does'
+    )
+
+    args = parser.parse_args()
+
+    if args.build:
+        pdf_path = Path(args.build)
+        if not pdf_path.exists():
+            print(f"Error: PDF file not found: {pdf_path}", file=sys.stderr)
+            return 1
+
+        chapters = []
+        boundaries_path = Path(args.boundaries)
+        if boundaries_path.exists():
+            with open(boundaries_path, 'r', encoding='utf-8') as f:
+                chapters = json.load(f)
+
+        template = None
+        if args.strip_headers:
+            template = load_or_learn_template(str(pdf_path), workers=args.jobs,
+                                              use_cache=not args.no_cache,
+                                              backend=args.backend)
+
+        print(f"Building page store from {pdf_path}...")
+        build_page_store(str(pdf_path), args.store, chapters, workers=args.jobs,
+                         use_cache=not args.no_cache, backend=args.backend,
+                         template=template)
+
+    store_path = Path(args.store)
+    if not store_path.exists():
+        print(f"Error: page store not found: {store_path}", file=sys.stderr)
+        return 1
+
+    try:
+        with PageStore(str(store_path)) as store:
+            if args.build or args.info:
+                print(f"{store_path}: {len(store)} pages, {store.line_count} lines, "
+                      f"{len(store.chapters)} chapters")
+                meta = {key: value for key, value in store.metadata.items()
+                        if key != 'chapters'}
+                for key, value in meta.items():
+                    print(f"  {key}: {value}")
+                for i, chapter in enumerate(store.chapters):
+                    end = chapter['end_page'] if chapter['end_page'] is not None else 'end'
+                    print(f"  [{i}] {chapter['chapter_marker']} "
+                          f"(pages {chapter['page_number']}-{end})")
+                return 0
+
+            if args.lines:
+                text = '\n'.join(store.lines(args.lines[0], args.lines[1], args.chapter))
+            elif args.chapter:
+                text = store.chapter_text(args.chapter)
+            elif args.page is not None:
+                if args.page not in store:
+                    print(f"Error: page {args.page} is not in the store", file=sys.stderr)
+                    return 1
+                text = store.page_text(args.page)
+            elif args.pages:
+                text = store.range_text(args.pages[0], args.pages[1])
+            else:
+                print("Error: Please specify --page, --pages, --chapter, --lines, "
+                      "--info or --build", file=sys.stderr)
+                parser.print_help()
+                return 1
+    except KeyError as e:
+        print(f"Error: chapter not found: {e}", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    sys.stdout.write(text)
+    if text and not text.endswith('\n'):
+        sys.stdout.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Re-flow raw chapter extractions (00_raw) so paragraphs and list items that
+wrap or run over a page break become single lines (00_reflow).
+
+Chapters are streamed line by line (see utils/reflow.py). PDF page numbers
+come from the build manifest next to the inputs, when there is one, and are
+written to page_map.json so re-flowed text still traces back to its pages.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add utils to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.build_manifest import MANIFEST_FILENAME, BuildManifest
+from utils.reflow import (
+    ReflowWriter,
+    iter_chapter_lines,
+    reflow,
+    skip_page_markers,
+    update_page_map
+)
+
+
+def main():
+    """Re-flow chapter files."""
+    parser = argparse.ArgumentParser(
+        description='Join wrapped and page-split paragraphs and list items in raw chapters'
+    )
+    parser.add_argument(
+        'inputs',
+        nargs='*',
+        default=['output/chapters/00_raw'],
+        help='Chapter files or directories of chapter_*.md files '
+             '(default: output/chapters/00_raw)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        default='output/chapters/00_reflow',
+        help='Directory for the re-flowed chapters and page_map.json '
+             '(default: output/chapters/00_reflow)'
+    )
+    parser.add_argument(
+        '--keep-page-markers',
+        action='store_true',
+        help='Keep "Page X of XX" lines and manual footers (they split units)'
+    )
+
+    args = parser.parse_args()
+
+    paths = []
+    for item in args.inputs:
+        path = Path(item)
+        if path.is_dir():
+            paths.extend(sorted(path.glob('chapter_*.md')))
+        elif path.is_file():
+            paths.append(path)
+        else:
+            print(f"Error: input not found: {path}", file=sys.stderr)
+            return 1
+
+    if not paths:
+        print("Error: no chapter files to re-flow", file=sys.stderr)
+        return 1
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    page_map = {}
+    manifests = {}
+    skip = None if args.keep_page_markers else skip_page_markers
+    start = time.perf_counter()
+
+    for path in paths:
+        output_path = output_dir / path.name
+        if output_path.resolve() == path.resolve():
+            print(f"Error: refusing to overwrite input {path}", file=sys.stderr)
+            return 1
+
+        if path.parent not in manifests:
+            manifests[path.parent] = BuildManifest(path.parent / MANIFEST_FILENAME)
+        entry = manifests[path.parent].get(path.name) or {}
+
+        file_start = time.perf_counter()
+        with open(path, 'r', encoding='utf-8') as src, \
+                open(output_path, 'w', encoding='utf-8') as out:
+            writer = ReflowWriter(out)
+            cross_page = 0
+            for unit in reflow(iter_chapter_lines(src, entry.get('page_lines', [])), skip):
+                writer.write_unit(unit)
+                cross_page += bool(unit.page_breaks)
+        seconds = time.perf_counter() - file_start
+
+        page_map[path.name] = writer.page_map()
+
+        pages = f", {len(writer.page_offsets)} pages" if writer.page_offsets else ''
+        print(f"{path.name}: {writer.unit_count} units, {cross_page} across pages{pages} "
+              f"({path.stat().st_size / 1024:.0f} KB, {seconds:.3f}s)")
+
+    update_page_map(output_dir, page_map)
+
+    seconds = time.perf_counter() - start
+    print(f"\nRe-flowed {len(paths)} chapters in {seconds:.2f}s to {output_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Render re-flowed chapters (00_reflow, see reflow_chapters.py) as formatted
+markdown (01_basicreformat). Raw extractions (00_raw) can be rendered too.
+Each chapter is converted in one streaming pass (see utils/markdown_renderer.py).
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add utils to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.markdown_renderer import render_markdown
+
+
+def main():
+    """Convert chapter files to markdown."""
+    parser = argparse.ArgumentParser(
+        description='Render chapter text as formatted markdown'
+    )
+    parser.add_argument(
+        'inputs',
+        nargs='*',
+        default=['output/chapters/00_reflow'],
+        help='Chapter files or directories of chapter_*.md files '
+             '(default: output/chapters/00_reflow; run reflow_chapters.py first)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        default='output/chapters/01_basicreformat',
+        help='Directory for the rendered chapters '
+             '(default: output/chapters/01_basicreformat)'
+    )
+    parser.add_argument(
+        '--keep-page-markers',
+        action='store_true',
+        help='Keep "Page X of XX" lines and manual footers'
+    )
+    parser.add_argument(
+        '--escape',
+        action='store_true',
+        help='Backslash-escape characters that would be read as markdown '
+             'syntax where they stand (e.g. a leading "#" or an inline "*")'
+    )
+
+    args = parser.parse_args()
+
+    paths = []
+    for item in args.inputs:
+        path = Path(item)
+        if path.is_dir():
+            paths.extend(sorted(path.glob('chapter_*.md')))
+        elif path.is_file():
+            paths.append(path)
+        else:
+            print(f"Error: input not found: {path}", file=sys.stderr)
+            return 1
+
+    if not paths:
+        print("Error: no chapter files to render", file=sys.stderr)
+        return 1
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    total_bytes = 0
+    start = time.perf_counter()
+
+    for path in paths:
+        output_path = output_dir / path.name
+        if output_path.resolve() == path.resolve():
+            print(f"Error: refusing to overwrite input {path}", file=sys.stderr)
+            return 1
+
+        file_start = time.perf_counter()
+        with open(path, 'r', encoding='utf-8') as src, \
+                open(output_path, 'w', encoding='utf-8') as out:
+            renderer = render_markdown(src, out, not args.keep_page_markers, args.escape)
+        seconds = time.perf_counter() - file_start
+
+        size = path.stat().st_size
+        total_bytes += size
+        counts = renderer.block_counts
+        print(f"{path.name}: {renderer.line_count} lines -> {counts['heading']} headings, "
+              f"{counts['bullet'] + counts['numbered']} lists, "
+              f"{counts['paragraph']} paragraphs ({size / 1024:.0f} KB, {seconds:.3f}s)")
+
+    seconds = time.perf_counter() - start
+    print(f"\nRendered {len(paths)} chapters ({total_bytes / 1024:.0f} KB) "
+          f"in {seconds:.2f}s to {output_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Run the whole pipeline in one pass: chapter detection, raw extraction (00_raw),
+heading detection and template analysis, cross-page re-flow (00_reflow) and
+markdown rendering (01_basicreformat). Pages stream from the PDF straight into the later stages
+(see utils/pipeline.py) instead of each stage re-reading the previous one's
+files.
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add utils to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from analyze_template import analyze_with_statistics
+from utils.build_manifest import MANIFEST_FILENAME, BuildManifest, extractor_version
+from utils.chapter_scheduler import plan_chapter_tasks
+from utils.compact_io import dump_json
+from utils.page_cache import file_hash
+from utils.page_template import load_or_learn_template
+from utils.pdf_backends import BACKENDS, DEFAULT_BACKEND
+from utils.pdf_utils import find_chapter_boundaries
+from utils.pipeline import PAGE_QUEUE_SIZE, run_pipeline
+from utils.reflow import update_page_map
+from utils.template_stats import TemplateStatistics
+
+
+def main():
+    """Extract, analyze and render every chapter of the manual."""
+    parser = argparse.ArgumentParser(
+        description='Extract, analyze and render all chapters in one streaming pass'
+    )
+    parser.add_argument(
+        'pdf_path',
+        nargs='?',
+        default='EL_CgManual_CURRENT_v016.pdf',
+        help='Path to the PDF file (default: EL_CgManual_CURRENT_v016.pdf)'
+    )
+    parser.add_argument(
+        '--boundaries',
+        type=str,
+        default='output/chapter_boundaries.json',
+        help='Chapter boundaries (default: output/chapter_boundaries.json; '
+             'detected with a fast scan and saved there if missing)'
+    )
+    parser.add_argument(
+        '--chapters-dir',
+        type=str,
+        default='output/chapters',
+        help='Root of the chapter outputs; raw chapters go to 00_raw/, '
+             're-flowed chapters to 00_reflow/ and markdown to '
+             '01_basicreformat/ (default: output/chapters)'
+    )
+    parser.add_argument(
+        '--analysis-output',
+        type=str,
+        default='output/template_analysis.json',
+        help='Per-chapter analysis and summary, as written by analyze_template.py '
+             '(default: output/template_analysis.json)'
+    )
+    parser.add_argument(
+        '--no-analysis',
+        action='store_true',
+        help='Skip the template analysis stage'
+    )
+    parser.add_argument(
+        '--no-reflow',
+        action='store_true',
+        help='Skip the re-flow stage and render the raw chapters directly'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Worker processes for page extraction and for chapter processing '
+             '(default: 1)'
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=PAGE_QUEUE_SIZE,
+        help=f'Pages buffered between extraction and the later stages '
+             f'(default: {PAGE_QUEUE_SIZE})'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the on-disk page cache'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=sorted(BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=f'Text extraction backend (default: {DEFAULT_BACKEND})'
+    )
+    parser.add_argument(
+        '--strip-headers',
+        action='store_true',
+        help='Remove running header and footer lines learned across the whole '
+             'PDF (cached per PDF hash)'
+    )
+
+    args = parser.parse_args()
+
+    pdf_path = Path(args.pdf_path)
+    if not pdf_path.exists():
+        print(f"Error: PDF file not found: {pdf_path}", file=sys.stderr)
+        return 1
+
+    use_cache = not args.no_cache
+    started = time.perf_counter()
+
+    boundaries_path = Path(args.boundaries)
+    if boundaries_path.exists():
+        with open(boundaries_path, 'r', encoding='utf-8') as f:
+            chapters = json.load(f)
+        print(f"Loaded {len(chapters)} chapter boundaries from {boundaries_path}")
+    else:
+        print(f"Detecting chapter boundaries in {pdf_path}...")
+        chapters = find_chapter_boundaries(str(pdf_path), workers=args.jobs,
+                                           use_cache=use_cache, fast=True,
+                                           backend=args.backend)
+        dump_json(chapters, str(boundaries_path))
+        print(f"Found {len(chapters)} chapter markers, saved to {boundaries_path}")
+
+    if not chapters:
+        print("Error: no chapters to process", file=sys.stderr)
+        return 1
+
+    raw_dir = Path(args.chapters_dir) / '00_raw'
+    reflow_dir = None if args.no_reflow else Path(args.chapters_dir) / '00_reflow'
+    markdown_dir = Path(args.chapters_dir) / '01_basicreformat'
+    for directory in (raw_dir, reflow_dir, markdown_dir):
+        if directory is not None:
+            directory.mkdir(parents=True, exist_ok=True)
+
+    # Same manifest inputs as extract_all_chapters.py, so either can skip
+    # chapters the other built
+    manifest = BuildManifest(raw_dir / MANIFEST_FILENAME)
+    pdf_hash = file_hash(str(pdf_path))
+    extractor = extractor_version(args.backend)
+
+    template = None
+    if args.strip_headers:
+        template = load_or_learn_template(str(pdf_path), workers=args.jobs,
+                                          use_cache=use_cache, backend=args.backend)
+        extractor = f"{extractor}+template-{template.digest}"
+        print(f"Stripping {sum(len(keys) for keys in template.lines.values())} "
+              f"running header/footer lines")
+
+    print(f"\nProcessing {len(chapters)} chapters with {args.jobs} job(s)...")
+
+    def report(result):
+        if result.error:
+            print(f"  ✗ {result.task.name}: failed at {result.seconds:.1f}s",
+                  file=sys.stderr)
+        else:
+            print(f"  ✓ {result.task.name}: {result.page_count} pages, "
+                  f"{result.heading_count} headings, ready at {result.seconds:.1f}s")
+
+    try:
+        results = run_pipeline(str(pdf_path), chapters, raw_dir, markdown_dir,
+                               jobs=args.jobs, use_cache=use_cache,
+                               backend=args.backend, template=template,
+                               analyze=None if args.no_analysis else analyze_with_statistics,
+                               on_result=report, queue_size=args.queue_size,
+                               reflow_dir=reflow_dir)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - started
+
+    failures = [result for result in results if result.error]
+    for result in results:
+        if not result.error:
+            manifest.record(Path(result.task.output_path),
+                            manifest.inputs(pdf_hash, chapters[result.task.index],
+                                            extractor),
+                            result.page_count, result.page_lines)
+    manifest.prune(Path(task.output_path).name
+                   for task, _ in plan_chapter_tasks(chapters, raw_dir))
+    manifest.save()
+
+    if reflow_dir is not None:
+        update_page_map(reflow_dir, {Path(result.task.output_path).name: result.reflow_page_map
+                                     for result in results if not result.error})
+
+    if not args.no_analysis:
+        # Same layout as analyze_template.py
+        summary = TemplateStatistics()
+        chapter_analyses = {}
+        for result in results:
+            if not result.error:
+                analysis, statistics = result.analysis
+                chapter_analyses[result.task.name] = analysis
+                summary.merge(statistics)
+        dump_json({'chapters': chapter_analyses, 'summary': summary.to_dict()},
+                  args.analysis_output)
+        print(f"\nAnalysis saved to {args.analysis_output}")
+
+    first_ready = min((result.seconds for result in results if not result.error),
+                      default=None)
+    print("\n=== SUMMARY ===")
+    if first_ready is not None:
+        print(f"First chapter ready at {first_ready:.2f}s")
+    print(f"Wall time: {elapsed:.2f}s with {args.jobs} job(s)")
+    if reflow_dir is not None:
+        print(f"Raw chapters in {raw_dir}/, re-flowed in {reflow_dir}/, "
+              f"markdown in {markdown_dir}/")
+    else:
+        print(f"Raw chapters in {raw_dir}/, markdown in {markdown_dir}/")
+
+    if failures:
+        print(f"\n{len(failures)} chapter(s) failed:", file=sys.stderr)
+        for result in failures:
+            print(f"\n--- {result.task.name} ---\n{result.error}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
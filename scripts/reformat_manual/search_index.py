@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Search the extracted chapters through an incrementally updated inverted index.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add utils to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.search_index import SearchIndex
+
+
+def main():
+    """Update the index and print matching lines."""
+    parser = argparse.ArgumentParser(
+        description='Full-text search over extracted chapters (words and bracketed phrases)'
+    )
+    parser.add_argument(
+        'query',
+        nargs='*',
+        help='Words and/or bracketed phrases such as 〔Note〕; "word*" matches by prefix'
+    )
+    parser.add_argument(
+        '--chapters-dir',
+        type=str,
+        default='output/chapters/00_raw',
+        help='Directory of extracted chapter files (default: output/chapters/00_raw)'
+    )
+    parser.add_argument(
+        '--index-dir',
+        type=str,
+        default='output/search_index',
+        help='Index directory (default: output/search_index)'
+    )
+    parser.add_argument(
+        '--any',
+        action='store_true',
+        help='Match lines containing any query term (default: all terms)'
+    )
+    parser.add_argument(
+        '--rebuild',
+        action='store_true',
+        help='Re-index every chapter'
+    )
+    parser.add_argument(
+        '--no-update',
+        action='store_true',
+        help='Query the index as is, without checking for re-extracted chapters'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=50,
+        help='Maximum hits to print (default: 50, 0 for all)'
+    )
+
+    args = parser.parse_args()
+
+    chapters_dir = Path(args.chapters_dir)
+    if not chapters_dir.exists():
+        print(f"Error: {chapters_dir} not found", file=sys.stderr)
+        print("Run extract_all_chapters.py first", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    index = SearchIndex(args.index_dir)
+
+    if not args.no_update or args.rebuild:
+        updated, removed = index.update(str(chapters_dir), force=args.rebuild)
+        if updated or removed:
+            print(f"Indexed {len(updated)} chapter(s), removed {len(removed)} "
+                  f"({(time.perf_counter() - started) * 1000:.0f} ms)", file=sys.stderr)
+
+    if not args.query:
+        print(f"{len(index.shards)} chapter(s) indexed in {args.index_dir}")
+        return 0
+
+    query_started = time.perf_counter()
+    hits = index.search(' '.join(args.query), any_term=args.any)
+    query_ms = (time.perf_counter() - query_started) * 1000
+
+    shown = hits if args.limit <= 0 else hits[:args.limit]
+    chapter_lines = {}
+    for hit in shown:
+        if hit['chapter'] not in chapter_lines:
+            path = chapters_dir / hit['chapter']
+            chapter_lines[hit['chapter']] = path.read_text(encoding='utf-8').split('\n')
+        lines = chapter_lines[hit['chapter']]
+        text = lines[hit['line']] if hit['line'] < len(lines) else ''
+        page = hit['page_number'] if hit['page_number'] is not None else '?'
+        print(f"{hit['chapter']}:{hit['line'] + 1} (page {page}): {text.strip()}")
+
+    more = f", showing {len(shown)}" if len(shown) < len(hits) else ''
+    print(f"\n{len(hits)} hit(s){more} in {query_ms:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""Make utils importable the way the scripts import it."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Rebuild the golden corpus for escape_markdown_special_chars.
+
+inputs/ holds excerpts of the raw chapters (00_raw) plus hand-written edge
+cases; expected/full/ and expected/context_aware/ hold the escaped text for
+each mode. tests/test_escape_golden.py compares the function against them.
+
+Regenerate the expected outputs only after an intended escaping change, and
+review the diff:
+
+    python tests/golden/escape/build_corpus.py
+    python tests/golden/escape/build_corpus.py --from-raw output/chapters/00_raw
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+CORPUS_DIR = Path(__file__).parent
+sys.path.insert(0, str(CORPUS_DIR.parents[2]))
+
+from utils.markdown_utils import escape_markdown_special_chars
+
+
+MODES = {
+    'full': {},
+    'context_aware': {'context_aware': True}
+}
+
+# Inputs that are maintained by hand and never re-selected from 00_raw
+HAND_WRITTEN = {'edge_cases.txt'}
+
+# Of the lines only the full mode changes, keep every Nth
+FULL_ONLY_STRIDE = 10
+
+# Of the lines neither mode changes, keep every Nth
+UNCHANGED_STRIDE = 50
+
+
+def select_lines(lines):
+    """
+    Excerpt of a chapter: every line the context-aware mode escapes, plus a
+    sample of lines only the full mode escapes and of untouched lines, in
+    chapter order.
+    """
+    selected = []
+    full_only = unchanged = 0
+    for line in lines:
+        if escape_markdown_special_chars(line, context_aware=True) != line:
+            selected.append(line)
+        elif escape_markdown_special_chars(line) != line:
+            if full_only % FULL_ONLY_STRIDE == 0:
+                selected.append(line)
+            full_only += 1
+        elif line.strip():
+            if unchanged % UNCHANGED_STRIDE == 0:
+                selected.append(line)
+            unchanged += 1
+    return selected
+
+
+def main():
+    """Re-select inputs (optionally) and rewrite the expected outputs."""
+    parser = argparse.ArgumentParser(
+        description='Rebuild the escape_markdown_special_chars golden corpus'
+    )
+    parser.add_argument(
+        '--from-raw',
+        type=str,
+        help='Directory of raw chapter_*.md files to re-select the inputs from'
+    )
+
+    args = parser.parse_args()
+
+    inputs_dir = CORPUS_DIR / 'inputs'
+    if args.from_raw:
+        chapters = sorted(Path(args.from_raw).glob('chapter_*.md'))
+        if not chapters:
+            print(f"Error: no chapter files in {args.from_raw}", file=sys.stderr)
+            return 1
+        for path in inputs_dir.glob('*.txt'):
+            if path.name not in HAND_WRITTEN:
+                path.unlink()
+        for chapter in chapters:
+            lines = select_lines(chapter.read_text(encoding='utf-8').split('\n'))
+            (inputs_dir / f"{chapter.stem}.txt").write_text(
+                '\n'.join(lines) + '\n', encoding='utf-8')
+
+    inputs = sorted(inputs_dir.glob('*.txt'))
+    for mode, options in MODES.items():
+        mode_dir = CORPUS_DIR / 'expected' / mode
+        mode_dir.mkdir(parents=True, exist_ok=True)
+        for stale in mode_dir.glob('*.txt'):
+            if not (inputs_dir / stale.name).exists():
+                stale.unlink()
+        for path in inputs:
+            text = path.read_text(encoding='utf-8')
+            (mode_dir / path.name).write_text(
+                escape_markdown_special_chars(text, **options), encoding='utf-8')
+
+    print(f"Wrote expected outputs for {len(inputs)} inputs in {len(MODES)} modes")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
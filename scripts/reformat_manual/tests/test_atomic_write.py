@@ -0,0 +1,35 @@
+"""Atomic file replacement shared by the cache, manifest, index and store writers."""
+
+import os
+import stat
+
+import pytest
+
+from utils.page_cache import atomic_write
+
+
+def test_replaces_file_with_default_mode(tmp_path):
+    path = tmp_path / 'out.json'
+    path.write_text('old', encoding='utf-8')
+
+    with atomic_write(path) as f:
+        f.write('new')
+
+    umask = os.umask(0)
+    os.umask(umask)
+    assert path.read_text(encoding='utf-8') == 'new'
+    assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~umask
+    assert os.listdir(tmp_path) == ['out.json']
+
+
+def test_failure_keeps_old_file_and_removes_temporary(tmp_path):
+    path = tmp_path / 'out.bin'
+    path.write_bytes(b'old')
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(path, binary=True) as f:
+            f.write(b'partial')
+            raise RuntimeError('interrupted')
+
+    assert path.read_bytes() == b'old'
+    assert os.listdir(tmp_path) == ['out.bin']
@@ -0,0 +1,64 @@
+"""Round trips through compact_io's writers and readers."""
+
+import pytest
+
+from utils.compact_io import (
+    OUTPUT_FORMATS,
+    chapter_writer,
+    dump_json,
+    iter_records,
+    load_chapter,
+    load_json,
+    page_list_writer,
+    read_page
+)
+
+
+PAGES = [
+    {'page_number': 4, 'text': 'CHAPTER 1. INTRODUCTION\n\nFirst page', 'char_count': 36},
+    {'page_number': 5, 'text': 'Second page', 'char_count': 11},
+]
+
+
+@pytest.mark.parametrize('output_format', OUTPUT_FORMATS)
+@pytest.mark.parametrize('compress', [False, True])
+@pytest.mark.parametrize('page_count', [1, 2])
+def test_page_list_round_trip(tmp_path, output_format, compress, page_count):
+    path = tmp_path / 'pages.out'
+    pages = PAGES[:page_count]
+    with page_list_writer(str(path), output_format, compress) as writer:
+        for page in pages:
+            writer.write_page(page)
+
+    assert load_json(str(path)) == pages
+    assert list(iter_records(str(path))) == pages
+    assert read_page(str(path), 4) == pages[0]
+    assert read_page(str(path), 6) is None
+
+
+@pytest.mark.parametrize('output_format', OUTPUT_FORMATS)
+@pytest.mark.parametrize('page_count', [0, 1, 2])
+def test_chapter_round_trip(tmp_path, output_format, page_count):
+    path = tmp_path / 'chapter.out'
+    pages = PAGES[:page_count]
+    with chapter_writer(str(path), 'CHAPTER 1', 4, 5, output_format) as writer:
+        for page in pages:
+            writer.write_page(page)
+
+    chapter = load_chapter(str(path))
+    assert chapter['chapter_name'] == 'CHAPTER 1'
+    assert chapter['pages'] == pages
+    if pages:
+        assert read_page(str(path), 4) == pages[0]
+
+
+def test_one_record_jsonl_list_stays_a_list(tmp_path):
+    path = tmp_path / 'records.jsonl'
+    dump_json([{'page_number': 4}], str(path), 'jsonl')
+    assert load_json(str(path)) == [{'page_number': 4}]
+
+
+def test_jsonl_object_loads_as_object(tmp_path):
+    path = tmp_path / 'report.jsonl'
+    dump_json({'pages': 3}, str(path), 'jsonl')
+    assert load_json(str(path)) == {'pages': 3}
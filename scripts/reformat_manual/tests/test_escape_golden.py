@@ -0,0 +1,32 @@
+"""Golden outputs of escape_markdown_special_chars (see tests/golden/escape)."""
+
+from pathlib import Path
+
+import pytest
+
+from utils.markdown_utils import escape_markdown_special_chars
+
+
+CORPUS_DIR = Path(__file__).parent / 'golden' / 'escape'
+
+MODES = {
+    'full': {},
+    'context_aware': {'context_aware': True}
+}
+
+INPUTS = sorted((CORPUS_DIR / 'inputs').glob('*.txt'))
+
+
+@pytest.mark.parametrize('mode', sorted(MODES))
+@pytest.mark.parametrize('path', INPUTS, ids=[path.stem for path in INPUTS])
+def test_matches_golden_output(path, mode):
+    text = path.read_text(encoding='utf-8')
+    expected = (CORPUS_DIR / 'expected' / mode / path.name).read_text(encoding='utf-8')
+
+    assert escape_markdown_special_chars(text, **MODES[mode]) == expected
+
+
+def test_corpus_covers_raw_chapters_and_edge_cases():
+    names = {path.stem for path in INPUTS}
+    assert 'edge_cases' in names
+    assert any(name.startswith('chapter_') for name in names)
@@ -0,0 +1,54 @@
+"""Font size clustering and line matching for layout headings."""
+
+from utils.layout_headings import (
+    MAX_SIZE_LEVELS,
+    FontStatistics,
+    LayoutLine,
+    match_line_numbers
+)
+
+
+def line(text, size, bold=False, char_count=10, page_number=0):
+    return LayoutLine(page_number, None, text, size, bold, char_count)
+
+
+def statistics(sizes):
+    stats = FontStatistics()
+    stats.add_lines([line('body', 10.0, char_count=10000)])
+    stats.add_lines([line('heading', size) for size in sizes])
+    return stats
+
+
+def test_close_sizes_share_a_level():
+    stats = statistics([18.0, 14.0, 13.5, 13.0])
+    assert stats.heading_levels == [[18.0], [14.0, 13.5, 13.0]]
+    assert stats.level_for(line('x', 13.5)) == 2
+    assert stats.level_for(line('x', 10.0, bold=True)) == 3
+    assert stats.level_for(line('x', 10.0)) is None
+
+
+def test_levels_are_bounded():
+    stats = statistics([30.0, 26.0, 22.0, 18.0, 15.0, 12.0])
+    levels = stats.heading_levels
+    assert len(levels) == MAX_SIZE_LEVELS
+    assert [size for level in levels for size in level] == [30.0, 26.0, 22.0, 18.0, 15.0, 12.0]
+    assert stats.level_for(line('x', 10.0, bold=True)) == MAX_SIZE_LEVELS + 1
+
+
+def test_statistics_round_trip():
+    stats = statistics([18.0, 14.0])
+    restored = FontStatistics.from_dict(stats.to_dict())
+    assert restored.heading_levels == stats.heading_levels
+    assert restored.body_size == stats.body_size
+
+
+def test_match_line_numbers_skips_stripped_lines():
+    lines = [line('1. MANUAL Page 2 of XX', 10.0, bold=True),
+             line('Body', 10.0), line('Body', 10.0),
+             line('Run-in heading', 10.0, bold=True), line('Body', 10.0)]
+    # Running header and one repeated body line stripped; spacing differs
+    text = 'Body\n\nRun-in  heading\nBody'
+    matched = match_line_numbers(lines, text)
+    assert [(match.text, match.line_number) for match in matched] == [
+        ('Body', 0), ('Run-in heading', 2), ('Body', 3)
+    ]
@@ -0,0 +1,52 @@
+"""Markdown rendering from classified lines."""
+
+import io
+
+from utils.line_classifier import classify_line
+from utils.markdown_renderer import render_markdown
+
+
+def render(text):
+    out = io.StringIO()
+    render_markdown(text.split('\n'), out)
+    return out.getvalue()
+
+
+def test_classify_line_list_items():
+    bullet = classify_line('  ○ Nested item')
+    assert bullet.bullet == '○'
+    assert bullet.stripped[bullet.item_start:] == 'Nested item'
+
+    numbered = classify_line('12) Twelfth item')
+    assert numbered.numbered_list and numbered.bullet is None
+    assert numbered.list_number == '12'
+    assert numbered.stripped[numbered.item_start:] == 'Twelfth item'
+
+    assert classify_line('2.1 Overview').heading_level == 2
+    assert classify_line('2. CHILD CARE').heading_level == 1
+    assert classify_line('2. Not a heading').heading_level is None
+
+
+def test_nested_bullets_and_numbered_items():
+    text = '\n'.join([
+        '2.1 Overview',
+        '● Top level',
+        '○ Nested',
+        '■ Nested twice',
+        'continued here',
+        '',
+        '1. First',
+        '2) Second',
+    ])
+    assert render(text) == '\n'.join([
+        '## 2.1 Overview',
+        '',
+        '- Top level',
+        '  - Nested',
+        '    - Nested twice',
+        'continued here',
+        '',
+        '1. First',
+        '2. Second',
+        '',
+    ])
@@ -0,0 +1,79 @@
+"""PageStore slices against the Chapter.full_text layout."""
+
+import pytest
+
+from utils.page_cache import file_hash
+from utils.page_store import PageStore, page_store_is_current, write_page_store
+from utils.page_template import PageTemplate
+from utils.pdf_utils import PAGE_SEPARATOR
+
+
+PAGES = [
+    {'page_number': 2, 'text': 'CHAPTER 1. ONE\n\nFirst line\nSecond line'},
+    {'page_number': 3, 'text': 'Third line'},
+    {'page_number': 4, 'text': 'CHAPTER 5. FIVE\nPart one'},
+    {'page_number': 5, 'text': 'CHAPTER 5. FIVE\nPart two'},
+]
+
+CHAPTERS = [
+    {'chapter_number': '1', 'chapter_marker': 'CHAPTER 1. ONE', 'page_number': 2, 'end_page': 3},
+    {'chapter_number': '5', 'chapter_marker': 'CHAPTER 5. FIVE', 'page_number': 4, 'end_page': 4},
+    {'chapter_number': '5', 'chapter_marker': 'CHAPTER 5. FIVE', 'page_number': 5, 'end_page': None},
+]
+
+
+def full_text(pages):
+    return ''.join(page['text'] + PAGE_SEPARATOR for page in pages)
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = write_page_store(PAGES, str(tmp_path / 'pages.elps'), {'chapters': CHAPTERS})
+    with PageStore(str(path)) as store:
+        yield store
+
+
+def test_lines_match_full_text_split(store):
+    expected = full_text(PAGES).split('\n')
+    assert store.line_count == len(expected)
+    assert store.lines(0, len(expected) + 5) == expected
+    for start in range(len(expected) + 1):
+        for end in range(start, len(expected) + 2):
+            assert store.lines(start, end) == expected[start:end]
+
+
+def test_chapter_lines_match_full_text_split(store):
+    expected = full_text(PAGES[:2]).split('\n')
+    assert store.chapter_text('1') == full_text(PAGES[:2])
+    assert store.lines(0, 100, '1') == expected
+    assert store.lines(len(expected) - 1, 100, '1') == ['']
+
+
+def test_find_chapter_parts(store):
+    assert store.find_chapter('5_part1') is store.chapters[1]
+    assert store.find_chapter('chapter_5_part2') is store.chapters[2]
+    assert store.chapter_text('5_part2') == full_text(PAGES[3:])
+    with pytest.raises(ValueError):
+        store.find_chapter('5')
+    with pytest.raises(ValueError):
+        store.find_chapter('CHAPTER 5. FIVE')
+    with pytest.raises(KeyError):
+        store.find_chapter('7')
+
+
+def test_store_is_current_only_for_the_same_inputs(tmp_path):
+    pdf = tmp_path / 'manual.pdf'
+    pdf.write_bytes(b'%PDF-1.4 stand-in')
+    template = PageTemplate.learn(
+        [{'page_number': i, 'text': f'Running header\nBody {i}\nPage {i} of XX'}
+         for i in range(6)])
+    path = str(tmp_path / 'pages.elps')
+    metadata = {'pdf_hash': file_hash(str(pdf)), 'backend': 'pdfplumber',
+                'template': template.digest, 'chapters': CHAPTERS}
+    write_page_store(PAGES, path, metadata)
+
+    assert page_store_is_current(path, str(pdf), CHAPTERS, 'pdfplumber', template)
+    assert not page_store_is_current(path, str(pdf), CHAPTERS, 'pdfplumber')
+    assert not page_store_is_current(path, str(pdf), CHAPTERS, 'pypdfium2', template)
+    assert not page_store_is_current(path, str(pdf), CHAPTERS[:1], 'pdfplumber', template)
+    assert not page_store_is_current(str(tmp_path / 'missing.elps'), str(pdf))
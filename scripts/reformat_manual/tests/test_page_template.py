@@ -0,0 +1,83 @@
+"""Running header/footer learning and stripping."""
+
+from utils.page_template import TEMPLATE_FORMAT, PageTemplate
+
+
+TITLES = ['2. CHILD CARE', '3. SAFETY AND HYGIENE', '4. CHILD INTERACTION']
+FOOTER = 'EL_CgManual_CURRENT_v016 November 5, 2025'
+
+
+def body_lines(number):
+    """Six body lines no other page has (digits would be folded, so letters)."""
+    page = 'abcdefghijklm'[number]
+    return [f'Body line {line} of page {page}.' for line in 'uvwxyz']
+
+
+def manual_pages(body=body_lines):
+    """Twelve pages: three chapters of four, each with a counting header."""
+    pages = []
+    for number in range(12):
+        title = TITLES[number // 4]
+        header = f'{title} Page {number % 4 + 1} of XX'
+        lines = [header] + body(number) + [FOOTER]
+        pages.append({'page_number': number, 'text': '\n'.join(lines)})
+    return pages
+
+
+def test_counting_header_and_footer_are_learned():
+    pages = manual_pages()
+    template = PageTemplate.learn(pages)
+
+    # Each header variant is on 4 of 12 pages, under the 6-page threshold,
+    # but its page counter changes on every page
+    assert sorted(template.examples['top0']) == [f'{title} Page 1 of XX' for title in TITLES]
+    assert template.examples['bottom0'] == [FOOTER]
+    for page in pages:
+        assert template.strip(page['text']) == '\n'.join(body_lines(page['page_number']))
+
+
+def test_line_below_threshold_is_kept():
+    def body(number):
+        lines = body_lines(number)
+        if number % 3 == 0:
+            lines.append('Wash your hands.')
+        return lines
+
+    pages = manual_pages(body)
+    template = PageTemplate.learn(pages)
+
+    # Last body line on 4 of 12 pages, without a counter: under max(3, 0.5 * 12)
+    assert template.strip(pages[0]['text']).endswith('\nWash your hands.')
+    assert template.strip(pages[1]['text']) == '\n'.join(body_lines(1))
+
+
+def test_chapter_title_lines_are_never_stripped():
+    pages = [{'page_number': number,
+              'text': '\n'.join(['CHAPTER 2 : CHILD CARE'] + body_lines(number) + [FOOTER])}
+             for number in range(6)]
+    template = PageTemplate.learn(pages)
+
+    assert 'top0' not in template.lines
+    assert template.strip(pages[0]['text']) == \
+        '\n'.join(['CHAPTER 2 : CHILD CARE'] + body_lines(0))
+
+
+def test_short_page_keeps_body_line():
+    pages = manual_pages()
+    pages.append({'page_number': 12, 'text': f'Only line\n{FOOTER}'})
+    template = PageTemplate.learn(pages)
+
+    # "Only line" is both the first and a bottom line of the page
+    assert template.strip(pages[-1]['text']) == 'Only line'
+
+
+def test_round_trip_and_format_check():
+    template = PageTemplate.learn(manual_pages())
+    data = template.to_dict()
+
+    restored = PageTemplate.from_dict(data)
+    assert restored.digest == template.digest
+
+    assert PageTemplate.from_dict({**data, 'format': TEMPLATE_FORMAT + 1}) is None
+    assert PageTemplate.from_dict({key: value for key, value in data.items()
+                                   if key != 'format'}) is None
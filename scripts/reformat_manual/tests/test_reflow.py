@@ -0,0 +1,81 @@
+"""Cross-page re-flow of raw chapter lines."""
+
+import io
+import json
+
+from utils.reflow import ReflowWriter, iter_page_lines, reflow, update_page_map
+
+
+WIDE = 'x' * 70
+
+
+def units(lines, page=None):
+    return list(reflow((page, line) for line in lines))
+
+
+def test_hyphen_joins_without_space():
+    [unit] = units(['Wash hands after each diaper-', 'changing and before meals.'])
+    assert unit.kind == 'paragraph'
+    assert unit.text == 'Wash hands after each diaper-changing and before meals.'
+
+
+def test_list_item_continues_across_page_break():
+    pages = [
+        {'page_number': 7, 'text': '● Keep the first aid kit stocked with bandages,\n'
+                                   '2. CHILD CARE Page 3 of XX'},
+        {'page_number': 8, 'text': 'gloves and a cold pack.\n● Check it weekly.'},
+    ]
+    first, second = reflow(iter_page_lines(pages))
+
+    assert first.kind == 'bullet'
+    assert first.text == ('● Keep the first aid kit stocked with bandages, '
+                          'gloves and a cold pack.')
+    assert first.page_number == 7
+    offset = len('● Keep the first aid kit stocked with bandages, ')
+    assert first.page_breaks == ((offset, 8),)
+    assert first.text[offset:].startswith('gloves')
+    assert (second.kind, second.page_number, second.page_breaks) == ('bullet', 8, ())
+
+
+def test_full_width_line_joins_unless_the_sentence_ended():
+    [joined] = units([WIDE + ' wraps', 'Onto the next line.'])
+    assert joined.text == WIDE + ' wraps Onto the next line.'
+
+    ended, new = units([WIDE + ' ends here.', 'A new sentence starts.'])
+    assert ended.text == WIDE + ' ends here.'
+    assert new.text == 'A new sentence starts.'
+
+
+def test_lettered_items_are_not_merged():
+    result = units(['Steps to follow,', 'a. Blanket Pull', 'b. Carry the child out'])
+    assert [(unit.kind, unit.text) for unit in result] == [
+        ('paragraph', 'Steps to follow,'),
+        ('numbered', 'a. Blanket Pull'),
+        ('numbered', 'b. Carry the child out'),
+    ]
+
+
+def test_writer_page_maps():
+    out = io.StringIO()
+    writer = ReflowWriter(out)
+    for unit in reflow([(3, 'First paragraph ends,'), (4, 'on the next page.'),
+                        (4, 'Second paragraph.')]):
+        writer.write_unit(unit)
+
+    assert out.getvalue() == 'First paragraph ends, on the next page.\n\nSecond paragraph.\n'
+    assert writer.page_lines == [(3, 0), (4, 2)]
+    assert writer.page_offsets == [(3, 0), (4, len('First paragraph ends, '))]
+    assert writer.page_for_offset(len(out.getvalue()) - 1) == 4
+
+
+def test_update_page_map_keeps_other_chapters(tmp_path):
+    first = {'page_lines': [[2, 0]], 'page_offsets': [[2, 0]]}
+    update_page_map(tmp_path, {'chapter_0.md': first})
+    update_page_map(tmp_path, {'chapter_2.md': {'page_lines': [], 'page_offsets': []}})
+    update_page_map(tmp_path, {'chapter_2.md': {'page_lines': [[9, 0]], 'page_offsets': [[9, 0]]}})
+
+    page_map = json.loads((tmp_path / 'page_map.json').read_text(encoding='utf-8'))
+    assert page_map == {
+        'chapter_0.md': first,
+        'chapter_2.md': {'page_lines': [[9, 0]], 'page_offsets': [[9, 0]]},
+    }
@@ -0,0 +1,91 @@
+"""Page alignment across an inserted page with running page counters."""
+
+import re
+
+from utils.page_template import PageTemplate
+from utils.revision_diff import added_chapters, align_pages, hash_page_text, shift_boundaries
+from utils.synthetic_pdf import generate_manual_pages
+
+
+HEADER_PATTERN = re.compile(r'^(\d+\. .* Page )(\d+)( of XX)$')
+
+
+def insert_page(pages, index):
+    """Copy of pages with a new page at index and the header counters renumbered."""
+    inserted = list(pages[index - 1])
+    inserted[4] = 'A sentence that only the new version has.'
+    pages = [list(page) for page in pages[:index]] + [inserted] + \
+        [list(page) for page in pages[index:]]
+
+    counter = 0
+    for page in pages:
+        match = HEADER_PATTERN.match(page[0])
+        if match:
+            counter = 1 if page[2].startswith('CHAPTER') else counter + 1
+            page[0] = f"{match.group(1)}{counter}{match.group(3)}"
+    return pages
+
+
+def hashes(pages, strip_template):
+    records = [{'page_number': i, 'text': '\n'.join(lines)} for i, lines in enumerate(pages)]
+    template = PageTemplate.learn(records) if strip_template else None
+    return [{'page_number': record['page_number'],
+             'hash': hash_page_text(record['text'], template)} for record in records]
+
+
+def test_inserted_page_leaves_later_pages_unchanged():
+    old = generate_manual_pages(60, 4)
+    new = insert_page(old, 19)
+
+    alignment = align_pages(hashes(old, True), hashes(new, True))
+    assert alignment['inserted'] == [19]
+    assert alignment['changed'] == []
+    assert alignment['unchanged_pages'] == len(old)
+
+
+def test_page_counters_change_hashes_without_template():
+    old = generate_manual_pages(60, 4)
+    new = insert_page(old, 19)
+
+    alignment = align_pages(hashes(old, False), hashes(new, False))
+    assert alignment['changed']
+
+
+BOUNDARIES = [
+    {'chapter_marker': 'CHAPTER 4. CHILD INTERACTION STRATEGIES', 'page_number': 2, 'end_page': 9},
+    {'chapter_marker': 'CHAPTER 5. STRUCTURED ENRICHMENT', 'page_number': 10, 'end_page': 19},
+    {'chapter_marker': 'CHAPTER 5. STRUCTURED ENRICHMENT', 'page_number': 20, 'end_page': 29},
+    {'chapter_marker': 'CHAPTER 1. CHILD ADMISSION', 'page_number': 30, 'end_page': None},
+]
+
+
+def identity_alignment(page_count):
+    return {'page_map': {page: page for page in range(page_count)},
+            'changed': [], 'inserted': [], 'deleted': []}
+
+
+def test_repeated_marker_matches_by_occurrence():
+    report = shift_boundaries(BOUNDARIES, identity_alignment(40), 40, BOUNDARIES)
+
+    assert [entry['status'] for entry in report] == ['unchanged'] * 4
+    assert [(entry['new_page_number'], entry['new_end_page']) for entry in report] == \
+        [(2, 9), (10, 19), (20, 29), (30, None)]
+
+
+def test_markers_compare_without_whitespace():
+    detected = [dict(entry, chapter_marker=entry['chapter_marker'].replace(' ', '  '))
+                for entry in BOUNDARIES]
+    detected[2] = dict(detected[2], page_number=21)
+
+    report = shift_boundaries(BOUNDARIES, identity_alignment(40), 40, detected)
+
+    assert [entry['status'] for entry in report] == \
+        ['unchanged', 'shifted', 'shifted', 'unchanged']
+    assert report[2]['new_page_number'] == 21
+
+
+def test_added_chapters_counts_occurrences():
+    assert added_chapters(BOUNDARIES, BOUNDARIES) == []
+
+    detected = BOUNDARIES + [dict(BOUNDARIES[1], page_number=40, end_page=None)]
+    assert added_chapters(BOUNDARIES[:2] + BOUNDARIES[3:], detected) == [BOUNDARIES[2], detected[-1]]
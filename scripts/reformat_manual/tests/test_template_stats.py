@@ -0,0 +1,28 @@
+"""Mergeable template statistics over classified lines."""
+
+from utils.line_classifier import classify_lines
+from utils.template_stats import TemplateStatistics
+
+
+def test_nested_bullet_markers_are_counted():
+    text = '\n'.join([
+        '● Top level',
+        '○ Nested',
+        '■ Nested twice',
+        '- Dash',
+        '1. Numbered',
+        'Paragraph text',
+    ])
+    stats = TemplateStatistics.for_chapter(classify_lines(text))
+
+    assert stats.bullet_markers == {'●': 1, '○': 1, '■': 1, '-': 1}
+    assert stats.numbered_list_items == 1
+
+
+def test_merge_adds_counts():
+    first = TemplateStatistics.for_chapter(classify_lines('○ One\n○ Two'), page_count=1)
+    second = TemplateStatistics.for_chapter(classify_lines('■ Three'), page_count=2)
+    first.merge(second)
+
+    assert first.chapters == 2 and first.pages == 3
+    assert first.to_dict()['bullet_markers'] == {'○': 2, '■': 1}
@@ -0,0 +1,122 @@
+"""
+Build manifest for incremental chapter extraction.
+Records, per output file, the inputs it was built from (PDF hash, boundary
+entry, extractor version) and the hash of what was written, so unchanged
+chapters can be skipped on the next run.
+"""
+
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from .pdf_backends import get_backend
+from .page_cache import atomic_write
+
+
+# Bump when the chapter output or the record layout changes so every
+# chapter is rebuilt
+MANIFEST_FORMAT = 2
+
+MANIFEST_FILENAME = '.build_manifest.json'
+
+
+def output_hash(path: Path) -> Optional[str]:
+    """Return the SHA-256 of an output file, or None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def extractor_version(backend: str) -> str:
+    """Return the version string recorded for outputs built with a backend."""
+    extractor = get_backend(backend)
+    return f"{extractor.name}-{extractor.cache_key}-format{MANIFEST_FORMAT}"
+
+
+class BuildManifest:
+    """
+    Per-output build records stored as JSON next to the outputs.
+
+    Args:
+        path: Manifest file path
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, any]] = {}
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+
+        if data.get('format') == MANIFEST_FORMAT:
+            self.entries = data.get('outputs', {})
+
+    def inputs(self, pdf_hash: str, boundary: Dict[str, any],
+               extractor: str) -> Dict[str, any]:
+        """Build the input record compared between runs."""
+        return {
+            'pdf_hash': pdf_hash,
+            'boundary': boundary,
+            'extractor': extractor
+        }
+
+    def is_current(self, output_path: Path, inputs: Dict[str, any]) -> bool:
+        """
+        Check whether an output was built from these inputs and is untouched.
+
+        Args:
+            output_path: Output file
+            inputs: Record from inputs()
+
+        Returns:
+            True if the output can be reused as is
+        """
+        entry = self.entries.get(output_path.name)
+        if not entry or entry.get('inputs') != inputs:
+            return False
+        return entry.get('output_hash') == output_hash(output_path)
+
+    def record(self, output_path: Path, inputs: Dict[str, any],
+               page_count: int, page_lines: Sequence[Sequence[int]] = ()) -> None:
+        """
+        Record a freshly written output.
+
+        Args:
+            output_path: Output file
+            inputs: Record from inputs()
+            page_count: Number of pages written
+            page_lines: (PDF page number, first line) for each page written
+        """
+        self.entries[output_path.name] = {
+            'inputs': inputs,
+            'output_hash': output_hash(output_path),
+            'page_count': page_count,
+            'page_lines': [list(pair) for pair in page_lines]
+        }
+
+    def get(self, output_name: str) -> Optional[Dict[str, any]]:
+        """Return the build record for an output file name, or None."""
+        return self.entries.get(output_name)
+
+    def prune(self, keep) -> None:
+        """Drop entries for outputs not in keep (names of current outputs)."""
+        keep = set(keep)
+        self.entries = {name: entry for name, entry in self.entries.items()
+                        if name in keep}
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'format': MANIFEST_FORMAT, 'outputs': self.entries}
+
+        with atomic_write(self.path) as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,267 @@
+"""
+Run chapter extractions in one pass over the PDF or concurrently on a process pool.
+By default every chapter is written during a single streaming pass, so each
+page is read once however many chapters there are. With chapter_jobs > 1,
+chapters are submitted largest page range first so the long chapters start
+immediately and short ones fill in the gaps; a failing chapter is reported
+without stopping the others.
+"""
+
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .page_template import PageTemplate, strip_page_template
+from .pdf_backends import DEFAULT_BACKEND
+from .pdf_utils import get_page_count, iter_chapter_pages, iter_pages
+from .stream_writers import TextPageWriter
+
+
+class ChapterTask(NamedTuple):
+    """One chapter to extract to a text file."""
+    index: int
+    name: str
+    start_page: int
+    end_page: Optional[int]
+    output_path: str
+
+
+class ChapterResult(NamedTuple):
+    """Outcome of one ChapterTask."""
+    task: ChapterTask
+    page_count: int
+    seconds: float
+    error: Optional[str] = None
+    # (PDF page number, first line in the output file) per page
+    page_lines: Tuple[Tuple[int, int], ...] = ()
+
+
+def plan_chapter_tasks(chapters: List[Dict[str, any]],
+                       output_dir: Path) -> List[Tuple[ChapterTask, str]]:
+    """
+    Name an output file for every chapter boundary.
+
+    Chapters are written to chapter_<number>.md; a chapter number that
+    occurs more than once (Chapter 5 in the current manual) is split into
+    chapter_<number>_part<N>.md files in page order.
+
+    Args:
+        chapters: Chapter boundaries as produced by find_chapter_boundaries
+        output_dir: Directory for the chapter files
+
+    Returns:
+        (task, display name) pairs in boundary order
+    """
+    occurrences = Counter(chapter['chapter_number'] for chapter in chapters)
+    parts = Counter()
+    planned = []
+
+    for index, chapter in enumerate(chapters):
+        chapter_num = chapter['chapter_number']
+
+        if occurrences[chapter_num] > 1:
+            parts[chapter_num] += 1
+            filename = f"chapter_{chapter_num}_part{parts[chapter_num]}.md"
+            display_name = f"Chapter {chapter_num} Part {parts[chapter_num]}"
+        else:
+            filename = f"chapter_{chapter_num}.md"
+            display_name = f"Chapter {chapter_num}"
+
+        output_path = Path(output_dir) / filename
+        task = ChapterTask(index, output_path.stem, chapter['page_number'],
+                           chapter['end_page'], str(output_path))
+        planned.append((task, display_name))
+
+    return planned
+
+
+def extract_chapter_to_text(pdf_path: str, task: ChapterTask,
+                            use_cache: bool = True,
+                            backend: str = DEFAULT_BACKEND,
+                            template: Optional[PageTemplate] = None) -> ChapterResult:
+    """
+    Extract one chapter's pages to its text file.
+
+    Exceptions are caught and returned in the result so one bad chapter
+    does not abort the rest of the run.
+
+    Args:
+        pdf_path: Path to the PDF file
+        task: Chapter to extract
+        use_cache: Read through the on-disk page cache
+        backend: Extraction backend name (see pdf_backends.BACKENDS)
+        template: Running header/footer lines to strip (see page_template)
+
+    Returns:
+        ChapterResult with the page count and wall time
+    """
+    started = time.perf_counter()
+    page_count = 0
+    try:
+        with TextPageWriter(task.output_path) as writer:
+            pages = iter_pages(pdf_path, task.start_page, task.end_page,
+                               use_cache=use_cache, backend=backend)
+            if template:
+                pages = strip_page_template(pages, template)
+            for page in pages:
+                writer.write_page(page)
+            page_count = writer.page_count
+    except Exception as e:
+        return ChapterResult(task, page_count, time.perf_counter() - started,
+                             f"{type(e).__name__}: {e}\n{traceback.format_exc()}")
+
+    return ChapterResult(task, page_count, time.perf_counter() - started,
+                         page_lines=tuple(writer.page_lines))
+
+
+def extract_chapters_to_text(pdf_path: str, tasks: List[ChapterTask], workers: int = 1,
+                             use_cache: bool = True, backend: str = DEFAULT_BACKEND,
+                             template: Optional[PageTemplate] = None,
+                             on_result: Optional[Callable[[ChapterResult], None]] = None
+                             ) -> List[ChapterResult]:
+    """
+    Extract several chapters to their text files in one pass over the PDF.
+
+    Pages are read once (see iter_chapter_pages) and streamed to every
+    chapter containing them; a chapter is closed and reported as soon as
+    the pass moves beyond its last page. If reading the PDF fails, every
+    chapter not yet finished is reported with the error.
+
+    Args:
+        pdf_path: Path to the PDF file
+        tasks: Chapters to extract
+        workers: Worker processes for page extraction (see iter_pages)
+        use_cache: Read through the on-disk page cache
+        backend: Extraction backend name (see pdf_backends.BACKENDS)
+        template: Running header/footer lines to strip (see page_template)
+        on_result: Called with each result as soon as its chapter finishes
+
+    Returns:
+        Results in task order
+    """
+    if not tasks:
+        return []
+
+    total_pages = get_page_count(pdf_path, use_cache, backend)
+    last_pages = [min(task.end_page if task.end_page is not None else total_pages - 1,
+                      total_pages - 1)
+                  for task in tasks]
+    boundaries = [{'page_number': task.start_page, 'end_page': task.end_page}
+                  for task in tasks]
+
+    writers: Dict[int, TextPageWriter] = {}
+    started: Dict[int, float] = {}
+    results: Dict[int, ChapterResult] = {}
+
+    def finish(index: int, error: Optional[str] = None) -> None:
+        task = tasks[index]
+        writer = writers.pop(index, None)
+        if writer is None and error is None:
+            # Chapter without any text still gets its (empty) file
+            writer = TextPageWriter(task.output_path)
+        if writer is not None:
+            writer.close()
+        now = time.perf_counter()
+        seconds = now - started.get(index, now)
+        if error is None:
+            result = ChapterResult(task, writer.page_count, seconds,
+                                   page_lines=tuple(writer.page_lines))
+        else:
+            result = ChapterResult(task, writer.page_count if writer else 0,
+                                   seconds, error)
+        results[index] = result
+        if on_result:
+            on_result(result)
+
+    try:
+        for index, page in iter_chapter_pages(pdf_path, boundaries, workers,
+                                              use_cache, backend):
+            if template:
+                stripped = list(strip_page_template([page], template))
+                if not stripped:
+                    continue
+                page = stripped[0]
+
+            if index not in writers:
+                started[index] = time.perf_counter()
+                writers[index] = TextPageWriter(tasks[index].output_path)
+            writers[index].write_page(page)
+
+            # Pages arrive in page order, so earlier chapters are complete
+            for open_index in [i for i in writers if last_pages[i] < page['page_number']]:
+                finish(open_index)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+        for index in range(len(tasks)):
+            if index not in results:
+                finish(index, error)
+
+    for index in range(len(tasks)):
+        if index not in results:
+            finish(index)
+
+    return [results[index] for index in range(len(tasks))]
+
+
+def schedule_largest_first(tasks: List[ChapterTask],
+                           total_pages: int) -> List[ChapterTask]:
+    """Order tasks by descending page range (open-ended ranges run to the last page)."""
+    def span(task: ChapterTask) -> int:
+        end = task.end_page if task.end_page is not None else total_pages - 1
+        return end - (task.start_page or 0) + 1
+
+    return sorted(tasks, key=span, reverse=True)
+
+
+def run_chapter_tasks(pdf_path: str, tasks: List[ChapterTask], jobs: int = 1,
+                      use_cache: bool = True, backend: str = DEFAULT_BACKEND,
+                      on_result: Optional[Callable[[ChapterResult], None]] = None,
+                      template: Optional[PageTemplate] = None,
+                      chapter_jobs: int = 1) -> List[ChapterResult]:
+    """
+    Extract chapters in one pass over the PDF, or concurrently when chapter_jobs > 1.
+
+    Args:
+        pdf_path: Path to the PDF file
+        tasks: Chapters to extract
+        jobs: Worker processes for page extraction in the single pass
+        use_cache: Read through the on-disk page cache
+        backend: Extraction backend name (see pdf_backends.BACKENDS)
+        on_result: Called with each result as soon as its chapter finishes
+        template: Running header/footer lines to strip (see page_template)
+        chapter_jobs: Chapters extracted concurrently, each reading its own
+            pages in a separate process (1 reads every page once, in order)
+
+    Returns:
+        Results in task order
+    """
+    if not tasks:
+        return []
+
+    if chapter_jobs <= 1 or len(tasks) < 2:
+        return extract_chapters_to_text(pdf_path, tasks, jobs, use_cache, backend,
+                                        template, on_result)
+
+    total_pages = get_page_count(pdf_path, use_cache, backend)
+    ordered = schedule_largest_first(tasks, total_pages)
+    results: Dict[int, ChapterResult] = {}
+
+    with ProcessPoolExecutor(max_workers=min(chapter_jobs, len(tasks))) as executor:
+        futures = {executor.submit(extract_chapter_to_text, pdf_path, task,
+                                   use_cache, backend, template): task
+                   for task in ordered}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # Worker died (e.g. killed or out of memory)
+                result = ChapterResult(futures[future], 0, 0.0,
+                                       f"{type(e).__name__}: {e}")
+            results[result.task.index] = result
+            if on_result:
+                on_result(result)
+
+    return [results[task.index] for task in tasks]
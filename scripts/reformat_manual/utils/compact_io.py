@@ -0,0 +1,413 @@
+"""
+Compact and line-framed JSON output, optionally gzipped, plus readers.
+
+Formats for --output:
+- json: the original indented layout
+- compact: no indentation; chapters store their text once, in full_text,
+  with each page's character offset and length
+- jsonl: one record per line after a header line naming the format;
+  chapters get a header with their metadata and then one line per page
+  (with that page's headings), so a page can be read without parsing the
+  rest of the file
+
+Any of them can be gzip-compressed; the readers detect gzip from the magic
+bytes and JSON Lines from the header line, so a file with a single record
+is still read as JSON Lines.
+"""
+
+import gzip
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO
+
+from .pdf_utils import PAGE_SEPARATOR, Chapter, detect_headings, preserve_unicode
+from .stream_writers import ChapterJSONWriter, PageListJSONWriter, open_output
+
+
+OUTPUT_FORMATS = ('json', 'compact', 'jsonl')
+
+CHAPTER_COMPACT_FORMAT = 'el-chapter/compact-1'
+CHAPTER_JSONL_FORMAT = 'el-chapter/jsonl-1'
+RECORDS_JSONL_FORMAT = 'el-records/jsonl-1'
+
+# Header line formats that mark a file as JSON Lines
+JSONL_FORMATS = (CHAPTER_JSONL_FORMAT, RECORDS_JSONL_FORMAT)
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _compact(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def _jsonl_header() -> str:
+    return _compact({'format': RECORDS_JSONL_FORMAT})
+
+
+def output_path_for(path: str, compress: bool) -> Path:
+    """Return the output path, adding a .gz suffix when compressing."""
+    output_path = Path(path)
+    if compress and output_path.suffix != '.gz':
+        output_path = output_path.with_name(output_path.name + '.gz')
+    return output_path
+
+
+def open_input(path: str) -> TextIO:
+    """Open a UTF-8 text file for reading, transparently un-gzipping it."""
+    with open(path, 'rb') as f:
+        compressed = f.read(2) == _GZIP_MAGIC
+    if compressed:
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def dump_json(obj, path: str, output_format: str = 'json',
+              compress: bool = False) -> None:
+    """
+    Write a JSON-serializable object in one of OUTPUT_FORMATS.
+
+    Args:
+        obj: Object to write; with 'jsonl', a list is written one item per
+            line after a format header, anything else as a single line
+        path: Output file path
+        output_format: 'json', 'compact' or 'jsonl'
+        compress: gzip the output
+    """
+    with open_output(path, compress) as f:
+        if output_format == 'json':
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+        elif output_format == 'jsonl' and isinstance(obj, list):
+            f.write(_jsonl_header() + '\n')
+            for item in obj:
+                f.write(_compact(item) + '\n')
+        else:
+            f.write(_compact(obj))
+            if output_format == 'jsonl':
+                f.write('\n')
+
+
+class PageRecordWriter:
+    """
+    Write page dictionaries as a compact JSON array or as JSON Lines.
+
+    Args:
+        path: Output file path
+        output_format: 'compact' or 'jsonl'
+        compress: gzip the output
+    """
+
+    def __init__(self, path: str, output_format: str = 'compact',
+                 compress: bool = False):
+        self.output_format = output_format
+        self.page_count = 0
+        self._f = open_output(path, compress)
+        if output_format == 'jsonl':
+            self._f.write(_jsonl_header() + '\n')
+
+    def write_page(self, page: Dict[str, any]) -> None:
+        """Append one page record."""
+        if self.output_format == 'jsonl':
+            self._f.write(_compact(page) + '\n')
+        else:
+            self._f.write('[' if self.page_count == 0 else ',')
+            self._f.write(_compact(page))
+        self.page_count += 1
+
+    def close(self) -> None:
+        if self.output_format != 'jsonl':
+            self._f.write(']' if self.page_count else '[]')
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CompactChapterWriter:
+    """
+    Write a chapter in the compact layout, one page at a time.
+
+    Page metadata is written as it arrives; page texts and headings are
+    spooled to temporary files and appended on close, so full_text is the
+    only copy of the text. A page's text is
+    full_text[offset:offset + length].
+    """
+
+    def __init__(self, path: str, chapter_name: str,
+                 start_page: Optional[int] = None,
+                 end_page: Optional[int] = None,
+                 compress: bool = False):
+        self.page_count = 0
+        self.heading_count = 0
+        self._offset = 0
+
+        self._f = open_output(path, compress)
+        self._text = tempfile.TemporaryFile('w+', encoding='utf-8')
+        self._headings = tempfile.TemporaryFile('w+', encoding='utf-8')
+
+        self._f.write('{"format":' + _compact(CHAPTER_COMPACT_FORMAT))
+        self._f.write(',"chapter_name":' + _compact(chapter_name))
+        self._f.write(',"start_page":' + _compact(start_page))
+        self._f.write(',"end_page":' + _compact(end_page))
+        self._f.write(',"pages":[')
+
+    def write_page(self, page: Dict[str, any],
+                   headings: Optional[List[Dict[str, any]]] = None) -> None:
+        """
+        Append one page.
+
+        Args:
+            page: Page dictionary from iter_pages
+            headings: Headings already detected for this page; detected
+                here when omitted
+        """
+        if headings is None:
+            headings = detect_headings(page['text'], page['page_number'])
+
+        text = preserve_unicode(page['text'])
+        record = {key: value for key, value in page.items() if key != 'text'}
+        record['offset'] = self._offset
+        record['length'] = len(text)
+
+        self._f.write((',' if self.page_count else '') + _compact(record))
+        # JSON string escaping is per character, so escaped fragments
+        # concatenate to the escaped whole
+        self._text.write(_compact(text + PAGE_SEPARATOR)[1:-1])
+        for heading in headings:
+            self._headings.write((',' if self.heading_count else '') + _compact(heading))
+            self.heading_count += 1
+
+        self._offset += len(text) + len(PAGE_SEPARATOR)
+        self.page_count += 1
+
+    def close(self) -> None:
+        self._f.write('],"headings":[')
+        self._headings.seek(0)
+        shutil.copyfileobj(self._headings, self._f)
+        self._f.write(f'],"page_count":{self.page_count},"full_text":"')
+        self._text.seek(0)
+        shutil.copyfileobj(self._text, self._f)
+        self._f.write('"}')
+
+        self._text.close()
+        self._headings.close()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ChapterJSONLWriter:
+    """
+    Write a chapter as JSON Lines: a header line, then one line per page.
+
+    Each page line holds the page record plus that page's headings.
+    """
+
+    def __init__(self, path: str, chapter_name: str,
+                 start_page: Optional[int] = None,
+                 end_page: Optional[int] = None,
+                 compress: bool = False):
+        self.page_count = 0
+        self.heading_count = 0
+
+        self._f = open_output(path, compress)
+        self._f.write(_compact({
+            'format': CHAPTER_JSONL_FORMAT,
+            'chapter_name': chapter_name,
+            'start_page': start_page,
+            'end_page': end_page
+        }) + '\n')
+
+    def write_page(self, page: Dict[str, any],
+                   headings: Optional[List[Dict[str, any]]] = None) -> None:
+        """Append one page (see CompactChapterWriter.write_page)."""
+        if headings is None:
+            headings = detect_headings(page['text'], page['page_number'])
+
+        record = dict(page)
+        record['text'] = preserve_unicode(page['text'])
+        record['headings'] = headings
+        self._f.write(_compact(record) + '\n')
+
+        self.page_count += 1
+        self.heading_count += len(headings)
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def chapter_writer(path: str, chapter_name: str, start_page: Optional[int],
+                   end_page: Optional[int], output_format: str = 'json',
+                   compress: bool = False):
+    """Return the chapter writer for an output format."""
+    if output_format == 'jsonl':
+        return ChapterJSONLWriter(path, chapter_name, start_page, end_page, compress)
+    if output_format == 'compact':
+        return CompactChapterWriter(path, chapter_name, start_page, end_page, compress)
+    return ChapterJSONWriter(path, chapter_name, start_page, end_page, compress)
+
+
+def page_list_writer(path: str, output_format: str = 'json', compress: bool = False):
+    """Return the page-list writer for an output format."""
+    if output_format == 'json':
+        return PageListJSONWriter(path, compress)
+    return PageRecordWriter(path, output_format, compress)
+
+
+def _read_json(f: TextIO):
+    """
+    Parse a whole-file JSON document, or read the header of a JSON Lines file.
+
+    A file is JSON Lines exactly when its first line is an object whose
+    'format' is one of JSONL_FORMATS; only that line is read then.
+
+    Returns:
+        (header, None) with f positioned after the header for JSON Lines,
+        else (None, data)
+    """
+    first = f.readline()
+    try:
+        value = json.loads(first)
+    except ValueError:
+        # Indented JSON: the first line is not a complete value
+        return None, json.loads(first + f.read())
+
+    if isinstance(value, dict) and value.get('format') in JSONL_FORMATS:
+        return value, None
+    # Compact JSON is a single line; anything after it is an error
+    return None, json.loads(first + f.read())
+
+
+def _jsonl_records(header: Dict[str, any], f: TextIO) -> Iterator[any]:
+    """Records of a JSON Lines file whose header was read by _read_json."""
+    if header['format'] == CHAPTER_JSONL_FORMAT:
+        # The chapter header holds the chapter metadata
+        yield header
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_records(path: str) -> Iterator[any]:
+    """
+    Yield the records in a file written by this module (or plain JSON).
+
+    JSON Lines files yield one record per line (a chapter's header line
+    first); JSON arrays yield their items; any other JSON value is yielded
+    as is.
+    """
+    with open_input(path) as f:
+        header, data = _read_json(f)
+        if header:
+            yield from _jsonl_records(header, f)
+            return
+
+    if isinstance(data, list):
+        yield from data
+    else:
+        yield data
+
+
+def load_json(path: str):
+    """Load any output of this module as plain Python data (JSONL as a list)."""
+    with open_input(path) as f:
+        header, data = _read_json(f)
+        if header:
+            return list(_jsonl_records(header, f))
+    return data
+
+
+def _chapter_from_data(data: Dict[str, any]) -> Chapter:
+    """Build a Chapter from a parsed json or compact chapter file."""
+    if data.get('format') == CHAPTER_COMPACT_FORMAT:
+        full_text = data['full_text']
+        pages = []
+        for record in data['pages']:
+            page = {key: value for key, value in record.items()
+                    if key not in ('offset', 'length')}
+            page['text'] = full_text[record['offset']:record['offset'] + record['length']]
+            pages.append(page)
+    else:
+        pages = data['pages']
+
+    chapter = Chapter(data['chapter_name'], data['start_page'], data['end_page'], pages)
+    # Stored values stand in for the lazily built ones
+    chapter.__dict__['full_text'] = data['full_text']
+    chapter.__dict__['headings'] = data['headings']
+    return chapter
+
+
+def load_chapter(path: str) -> Chapter:
+    """
+    Load a chapter file in any layout (json, compact or jsonl, gzipped or not).
+
+    Args:
+        path: Chapter file written by extract_pdf.py --chapter
+
+    Returns:
+        Chapter mapping with stored headings
+    """
+    with open_input(path) as f:
+        header, data = _read_json(f)
+        if not header:
+            return _chapter_from_data(data)
+
+        pages = []
+        headings = []
+        for line in f:
+            if line.strip():
+                page = json.loads(line)
+                headings.extend(page.pop('headings', []))
+                pages.append(page)
+
+    chapter = Chapter(header['chapter_name'], header['start_page'],
+                      header['end_page'], pages)
+    chapter.__dict__['headings'] = headings
+    return chapter
+
+
+def read_page(path: str, page_number: int) -> Optional[Dict[str, any]]:
+    """
+    Read one page record from a chapter or page-list file.
+
+    JSON Lines files are scanned line by line and only the matching line
+    is parsed; other layouts are loaded whole.
+
+    Args:
+        path: Output of extract_pdf.py (chapter or page range)
+        page_number: PDF page number (0-indexed)
+
+    Returns:
+        Page dictionary, or None if the page is not in the file
+    """
+    prefix = '{"page_number":' + str(page_number) + ','
+
+    with open_input(path) as f:
+        header, data = _read_json(f)
+        if header:
+            for line in f:
+                if line.startswith(prefix):
+                    page = json.loads(line)
+                    page.pop('headings', None)
+                    return page
+            return None
+
+    pages = _chapter_from_data(data).pages if isinstance(data, dict) else data
+    for page in pages:
+        if page['page_number'] == page_number:
+            return page
+    return None
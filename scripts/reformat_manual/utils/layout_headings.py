@@ -0,0 +1,372 @@
+"""
+Layout-aware heading detection from pdfplumber character metadata.
+
+Each page is laid out once (extract_text_lines) and reduced to one record
+per text line (dominant font size, bold share). Font sizes are histogrammed
+over the whole document: the most used size is body text, larger sizes are
+clustered into a bounded number of heading levels and bold body-size lines
+form the level below them. Levels are 1-based, ready for
+markdown_utils.apply_heading_format.
+
+The per-page line records and the document histogram are cached per PDF
+hash next to the page cache entries, so later runs, whatever their page
+range, backend or header stripping, reuse them without laying pages out
+again. Headings are matched to the text actually emitted, so line numbers
+refer to that text.
+"""
+
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import pdfplumber
+
+from .page_cache import file_hash, get_default_cache
+from .pdf_backends import get_backend
+from .pdf_utils import PARALLEL_CHUNK_PAGES, get_page_count
+
+
+# Bump when line records or statistics change so cached layouts are rebuilt
+LAYOUT_FORMAT = 1
+
+LAYOUT_STATISTICS_RECORD = 'layout_statistics'
+
+# Font sizes are rounded to this step before clustering (points)
+FONT_SIZE_STEP = 0.5
+
+# Heading sizes closer than this share a level (points)
+SIZE_CLUSTER_GAP = 1.0
+
+# Levels assigned from font size; bold body-size lines take the next one
+MAX_SIZE_LEVELS = 3
+
+# Fonts whose name marks them as bold
+BOLD_FONT_PATTERN = re.compile(r'bold|black|heavy|semibold|demi', re.IGNORECASE)
+
+# Longest line still considered a heading
+MAX_HEADING_LENGTH = 120
+
+_CHAR_STYLE = itemgetter('size', 'fontname')
+
+
+class LayoutLine(NamedTuple):
+    """Style summary of one text line on a page."""
+    page_number: int                # 0-indexed PDF page
+    line_number: Optional[int]      # Line index in the page's emitted text, once matched
+    text: str                       # Line text
+    size: float                     # Dominant font size, rounded to FONT_SIZE_STEP
+    bold: bool                      # At least half the characters are bold
+    char_count: int                 # Characters on the line
+
+
+def _round_size(size: float) -> float:
+    return round(size / FONT_SIZE_STEP) * FONT_SIZE_STEP
+
+
+@lru_cache(maxsize=None)
+def _is_bold(fontname: str) -> bool:
+    return bool(BOLD_FONT_PATTERN.search(fontname))
+
+
+def page_layout_lines(page) -> List[LayoutLine]:
+    """
+    Summarize the font style of every text line on a pdfplumber page.
+
+    Characters are counted per (size, font) with Counter in one C-level
+    pass, so only the few distinct styles of a line are looked at in Python.
+
+    Args:
+        page: pdfplumber page
+
+    Returns:
+        One LayoutLine per non-empty line, in reading order (the order of
+        extract_text's non-empty lines), without line numbers
+    """
+    layout_lines = []
+    for line in page.extract_text_lines(return_chars=True, strip=True):
+        styles = Counter(map(_CHAR_STYLE, line['chars']))
+        if not styles:
+            continue
+
+        sizes = Counter()
+        bold = 0
+        for (size, fontname), count in styles.items():
+            sizes[size] += count
+            if _is_bold(fontname):
+                bold += count
+
+        char_count = len(line['chars'])
+        layout_lines.append(LayoutLine(
+            page_number=page.page_number - 1,
+            line_number=None,
+            text=line['text'],
+            size=_round_size(sizes.most_common(1)[0][0]),
+            bold=bold * 2 >= char_count,
+            char_count=char_count
+        ))
+
+    return layout_lines
+
+
+class FontStatistics:
+    """
+    Character counts per (font size, bold) over a set of lines.
+
+    Statistics from separate page ranges can be merged, so a whole
+    document's body size and heading levels can be built up piecewise.
+    """
+
+    def __init__(self):
+        self.size_counts: Counter = Counter()
+        self.bold_counts: Counter = Counter()
+
+    def add_lines(self, lines: Iterable[LayoutLine]) -> None:
+        """Count the characters of each line under its size."""
+        for line in lines:
+            self.size_counts[line.size] += line.char_count
+            if line.bold:
+                self.bold_counts[line.size] += line.char_count
+
+    def merge(self, other: 'FontStatistics') -> None:
+        """Add another set of counts into this one."""
+        self.size_counts.update(other.size_counts)
+        self.bold_counts.update(other.bold_counts)
+
+    @property
+    def body_size(self) -> Optional[float]:
+        """Font size covering the most characters."""
+        if not self.size_counts:
+            return None
+        return self.size_counts.most_common(1)[0][0]
+
+    @property
+    def heading_levels(self) -> List[List[float]]:
+        """
+        Sizes larger than the body size, clustered into levels, largest first.
+
+        Sizes within SIZE_CLUSTER_GAP of their neighbour share a level; while
+        there are more than MAX_SIZE_LEVELS levels, the two closest adjacent
+        levels are merged.
+        """
+        body = self.body_size
+        if body is None:
+            return []
+
+        levels: List[List[float]] = []
+        for size in sorted((size for size in self.size_counts if size > body), reverse=True):
+            if levels and levels[-1][-1] - size <= SIZE_CLUSTER_GAP:
+                levels[-1].append(size)
+            else:
+                levels.append([size])
+
+        while len(levels) > MAX_SIZE_LEVELS:
+            gaps = [levels[i][-1] - levels[i + 1][0] for i in range(len(levels) - 1)]
+            i = gaps.index(min(gaps))
+            levels[i:i + 2] = [levels[i] + levels[i + 1]]
+
+        return levels
+
+    def level_for(self, line: LayoutLine) -> Optional[int]:
+        """
+        Heading level of a line, or None for body text.
+
+        Larger-than-body size levels rank 1, 2, ...; bold lines at body size
+        take the next level.
+        """
+        levels = self.heading_levels
+        for level, sizes in enumerate(levels, 1):
+            if line.size in sizes:
+                return level
+        if line.bold and line.size == self.body_size:
+            return len(levels) + 1
+        return None
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            'body_size': self.body_size,
+            'heading_levels': self.heading_levels,
+            'size_counts': {str(size): count for size, count in sorted(self.size_counts.items())},
+            'bold_counts': {str(size): count for size, count in sorted(self.bold_counts.items())}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, any]) -> 'FontStatistics':
+        stats = cls()
+        stats.size_counts.update({float(size): count
+                                  for size, count in data['size_counts'].items()})
+        stats.bold_counts.update({float(size): count
+                                  for size, count in data['bold_counts'].items()})
+        return stats
+
+
+def match_line_numbers(lines: Sequence[LayoutLine], text: str) -> List[LayoutLine]:
+    """
+    Give layout lines their line numbers in a page's emitted text.
+
+    The two line sequences are aligned with difflib, comparing lines
+    without whitespace since backends space words differently; a line
+    missing from the text (e.g. a running header stripped from it) is
+    dropped.
+    """
+    keys = [''.join(line.text.split()) for line in lines]
+    text_keys = [''.join(line.split()) for line in text.split('\n')]
+    matcher = SequenceMatcher(None, keys, text_keys, autojunk=False)
+
+    matched = []
+    for i, j, size in matcher.get_matching_blocks():
+        for offset in range(size):
+            matched.append(lines[i + offset]._replace(line_number=j + offset))
+    return matched
+
+
+def classify_layout_lines(lines: Iterable[LayoutLine],
+                          stats: FontStatistics) -> List[Dict[str, any]]:
+    """
+    Turn styled lines into heading records.
+
+    Args:
+        lines: Lines from page_layout_lines, with line numbers matched
+        stats: Font statistics for the document the lines belong to
+
+    Returns:
+        Headings in the detect_headings format, with 'level', 'font_size'
+        and 'bold' added
+    """
+    headings = []
+    for line in lines:
+        if len(line.text) > MAX_HEADING_LENGTH:
+            continue
+        level = stats.level_for(line)
+        if level is None:
+            continue
+        headings.append({
+            'text': line.text,
+            'line_number': line.line_number,
+            'page_number': line.page_number,
+            'type': 'layout',
+            # Size is a stronger signal than weight alone
+            'confidence': 0.9 if line.size != stats.body_size else 0.7,
+            'level': level,
+            'font_size': line.size,
+            'bold': line.bold
+        })
+    return headings
+
+
+class DocumentLayout:
+    """
+    Document-wide font statistics plus the styled lines of some pages.
+
+    Args:
+        statistics: Font statistics over every page of the document
+        pages: Page number -> layout lines, for the pages headings are needed on
+    """
+
+    def __init__(self, statistics: FontStatistics, pages: Dict[int, List[LayoutLine]]):
+        self.statistics = statistics
+        self.pages = pages
+
+    def headings(self, page: Dict[str, any]) -> List[Dict[str, any]]:
+        """Headings on a page record (as from iter_pages, possibly template-stripped)."""
+        lines = self.pages.get(page['page_number'], [])
+        return classify_layout_lines(match_line_numbers(lines, page['text']),
+                                     self.statistics)
+
+
+def _line_record(line: LayoutLine) -> List[any]:
+    return [line.text, line.size, line.bold, line.char_count]
+
+
+def _layout_page_list(pdf_path: str, page_nums: List[int]) -> List[List[LayoutLine]]:
+    """Worker entry point: lay out a chunk of pages with a private handle."""
+    pages = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_num in page_nums:
+            page = pdf.pages[page_num]
+            pages.append(page_layout_lines(page))
+            # Drop cached layout objects so memory stays flat across the pass
+            page.close()
+    return pages
+
+
+def _layout_pages(pdf_path: str, page_nums: List[int],
+                  workers: int = 1) -> Iterable[List[LayoutLine]]:
+    """Layout lines of each page in page_nums, serially or on a process pool."""
+    if workers <= 1 or len(page_nums) < 2:
+        return _layout_page_list(pdf_path, page_nums)
+
+    chunk_size = max(1, min(PARALLEL_CHUNK_PAGES, len(page_nums) // (workers * 4)))
+    chunks = [page_nums[i:i + chunk_size] for i in range(0, len(page_nums), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [lines for chunk in executor.map(_layout_page_list,
+                                                [pdf_path] * len(chunks), chunks)
+                for lines in chunk]
+
+
+def load_document_layout(pdf_path: str, start_page: Optional[int] = None,
+                         end_page: Optional[int] = None, workers: int = 1,
+                         use_cache: bool = True) -> DocumentLayout:
+    """
+    Return the document font statistics and the styled lines of a page range.
+
+    With a warm cache only the range's line records and the statistics
+    record are read. Otherwise every page is laid out once (the statistics
+    cover the whole document) and the results are cached.
+
+    Args:
+        pdf_path: Path to the PDF file
+        start_page: Starting page number (0-indexed, inclusive), None for first
+        end_page: Ending page number (0-indexed, inclusive), None for last
+        workers: Number of worker processes for the layout pass
+        use_cache: Read and store layout records in the page cache
+
+    Returns:
+        DocumentLayout holding the range's pages
+    """
+    # Font metadata always comes from pdfplumber, whatever the text backend
+    cache_key = get_backend('pdfplumber').cache_key
+    cache = get_default_cache(cache_key) if use_cache else None
+    pdf_hash = file_hash(pdf_path) if cache else None
+
+    total_pages = get_page_count(pdf_path, use_cache, 'pdfplumber')
+    start = start_page if start_page is not None else 0
+    end = min(end_page if end_page is not None else total_pages - 1, total_pages - 1)
+    wanted = range(start, end + 1)
+
+    statistics = None
+    if cache:
+        record = cache.get_record(pdf_hash, LAYOUT_STATISTICS_RECORD)
+        if record and record.get('format') == LAYOUT_FORMAT:
+            statistics = FontStatistics.from_dict(record)
+
+    # The statistics need every page; with them cached, just the range
+    needed = range(total_pages) if statistics is None else wanted
+    pages: Dict[int, List[LayoutLine]] = {}
+    if cache:
+        for page_num in needed:
+            record = cache.get_record(pdf_hash, f"layout-{page_num}")
+            if record and record.get('format') == LAYOUT_FORMAT:
+                pages[page_num] = [LayoutLine(page_num, None, *line) for line in record['lines']]
+
+    missing = [page_num for page_num in needed if page_num not in pages]
+    for page_num, lines in zip(missing, _layout_pages(pdf_path, missing, workers)):
+        pages[page_num] = lines
+        if cache:
+            cache.put_record(pdf_hash, f"layout-{page_num}",
+                             {'format': LAYOUT_FORMAT,
+                              'lines': [_line_record(line) for line in lines]})
+
+    if statistics is None:
+        statistics = FontStatistics()
+        for lines in pages.values():
+            statistics.add_lines(lines)
+        if cache:
+            cache.put_record(pdf_hash, LAYOUT_STATISTICS_RECORD,
+                             {'format': LAYOUT_FORMAT, **statistics.to_dict()})
+
+    return DocumentLayout(statistics, {page_num: pages[page_num] for page_num in wanted
+                                       if page_num in pages})
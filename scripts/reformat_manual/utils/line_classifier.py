@@ -0,0 +1,142 @@
+"""
+Single-pass line classifier shared by heading detection, template analysis
+and markdown rendering. Every line is tagged once with precompiled patterns
+so callers can consume the tags instead of re-splitting and re-matching the
+text themselves.
+"""
+
+import re
+from typing import List, NamedTuple, Optional
+
+
+# Numbered section heading, e.g. "1. Introduction", "1.1. Overview"
+NUMBERED_PATTERN = re.compile(r'^(\d+\.)+\s+(.+)$')
+
+# Looser numbered heading used by template analysis, e.g. "1.2 Title"
+NUMBERED_HEADING_PATTERN = re.compile(r'^(\d+\.)+\d*\s+')
+
+# Bracketed heading, e.g. "[1.2 Title"
+BRACKETED_PATTERN = re.compile(r'^\[.*\d+\.')
+
+# Bullet markers: filled bullets are top level, hollow ones are nested and
+# squares sit a level below those
+BULLET_MARKERS = '●○■•-*'
+
+# Bullet list item, e.g. "● Item" (stripped line)
+BULLET_PATTERN = re.compile(r'^([' + re.escape(BULLET_MARKERS) + r'])\s+')
+
+# Numbered list item, e.g. "1. Item", "2) Item" (stripped line)
+NUMBERED_LIST_PATTERN = re.compile(r'^(\d+)[\.\)]\s+')
+
+# Chapter title line, e.g. "CHAPTER 2 : CHILD CARE"
+CHAPTER_HEADING_PATTERN = re.compile(r'^(CHAPTER|Chapter)\s+(\d+|[IVXLCDM]+)\b')
+
+# Multi-level section number, e.g. "2.1 Title", "2.4.2.3. Title"
+SECTION_HEADING_PATTERN = re.compile(r'^(\d+(?:\.\d+)+)\.?\s+(\S.*)$')
+
+# Single-number chapter heading in caps, e.g. "2. CHILD CARE"
+CHAPTER_NUMBER_PATTERN = re.compile(r'^(\d+)\.\s+(\S.*)$')
+
+
+class ClassifiedLine(NamedTuple):
+    """Tags computed for one line of text."""
+    index: int                      # Line index within the classified text
+    text: str                       # Original line
+    stripped: str                   # Line with surrounding whitespace removed
+    blank: bool                     # Line is empty or whitespace only
+    all_caps: bool                  # Upper case and longer than 2 characters
+    number: Optional[str]           # NUMBERED_PATTERN's last number group, if matched
+    numbered_heading: bool          # Matches NUMBERED_HEADING_PATTERN
+    bracketed: bool                 # Matches BRACKETED_PATTERN
+    followed_by_blank: bool         # Next line exists and is blank
+    bullet: Optional[str]           # Bullet marker, if a bullet item
+    numbered_list: bool             # Matches NUMBERED_LIST_PATTERN
+    indent: int                     # Leading whitespace width
+    heading_level: Optional[int]    # Markdown heading level (see heading_level)
+    list_number: Optional[str]      # Number of a numbered list item
+    item_start: int                 # Offset of a list item's text in stripped, else 0
+
+
+def heading_level(line: str) -> Optional[int]:
+    """
+    Heading level of a stripped line, or None if it is not a heading.
+
+    Section numbers set the level by depth ("2.1" is H2, "2.1.1" is H3);
+    chapter titles and single-number titles in caps ("2. CHILD CARE") are H1.
+    """
+    if not line or not (line[0].isdigit() or line[0] == 'C'):
+        return None
+    section = SECTION_HEADING_PATTERN.match(line)
+    if section:
+        return min(6, section.group(1).count('.') + 1)
+    if CHAPTER_HEADING_PATTERN.match(line):
+        return 1
+    number = CHAPTER_NUMBER_PATTERN.match(line)
+    if number and number.group(2).isupper():
+        return 1
+    return None
+
+
+def classify_line(line: str, index: int = 0,
+                  followed_by_blank: bool = False) -> ClassifiedLine:
+    """
+    Tag a single line.
+
+    Args:
+        line: Line of text without its newline
+        index: Line index to record
+        followed_by_blank: Whether the next line is blank (needs lookahead,
+            so only classify_lines can work it out)
+
+    Returns:
+        The line's ClassifiedLine
+    """
+    stripped = line.strip()
+    indent = len(line) - len(line.lstrip())
+
+    if not stripped:
+        return ClassifiedLine(
+            index, line, '', True, False, None, False, False,
+            followed_by_blank, None, False, indent, None, None, 0
+        )
+
+    numbered = NUMBERED_PATTERN.match(stripped)
+    bullet = BULLET_PATTERN.match(stripped)
+    numbered_item = None if bullet else NUMBERED_LIST_PATTERN.match(stripped)
+    item = bullet or numbered_item
+
+    return ClassifiedLine(
+        index,
+        line,
+        stripped,
+        False,
+        stripped.isupper() and len(stripped) > 2,
+        numbered.group(1) if numbered else None,
+        NUMBERED_HEADING_PATTERN.match(stripped) is not None,
+        BRACKETED_PATTERN.match(stripped) is not None,
+        followed_by_blank,
+        bullet.group(1) if bullet else None,
+        numbered_item is not None,
+        indent,
+        heading_level(stripped),
+        numbered_item.group(1) if numbered_item else None,
+        item.end() if item else 0
+    )
+
+
+def classify_lines(text: str) -> List[ClassifiedLine]:
+    """
+    Split text into lines and tag each line in one pass.
+
+    Args:
+        text: Text to classify
+
+    Returns:
+        One ClassifiedLine per line of text.split('\\n')
+    """
+    lines = text.split('\n')
+    blanks = [not line.strip() for line in lines]
+    last = len(lines) - 1
+
+    return [classify_line(line, i, i < last and blanks[i + 1])
+            for i, line in enumerate(lines)]
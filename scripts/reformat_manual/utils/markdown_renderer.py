@@ -0,0 +1,149 @@
+"""
+Streaming conversion of raw chapter text (00_raw) to formatted markdown.
+
+Lines are read once, classified one at a time (see line_classifier.py) and
+written straight to the output as markdown blocks (headings, bullet and numbered lists,
+paragraphs). Spacing rules from the formatting guide are applied as blocks
+are emitted, so no second full-text pass is needed.
+"""
+
+import re
+from typing import Iterable, Optional, TextIO
+
+from .line_classifier import classify_line
+from .markdown_utils import apply_heading_format, escape_markdown_special_chars
+
+
+# "2. CHILD CARE Page 3 of XX" page markers (formatting guide 4.3)
+PAGE_MARKER_PATTERN = re.compile(r'\bPage\s+\d+\s+of\s+\S+\s*$')
+
+# "EL_CgManual_CURRENT_v016 November 5, 2025" footers (formatting guide 4.4)
+FOOTER_PATTERN = re.compile(r'^EL_CgManual_\w+\s+\w+\s+\d{1,2},\s+\d{4}\s*$')
+
+# Markdown indent per nested bullet marker (see line_classifier.BULLET_MARKERS)
+BULLET_INDENTS = {'○': '  ', '■': '    '}
+
+
+class MarkdownRenderer:
+    """
+    Incremental raw-text to markdown converter.
+
+    Feed lines with write_line() (or write_lines()), then call close().
+    Output goes to a single text stream as each block is recognized.
+
+    Args:
+        out: Text stream receiving the markdown
+        strip_page_markers: Drop "Page X of XX" lines and manual footers
+        escape: Escape text that would otherwise be read as markdown syntax
+            (context-aware, see escape_markdown_special_chars)
+    """
+
+    def __init__(self, out: TextIO, strip_page_markers: bool = True,
+                 escape: bool = False):
+        self.out = out
+        self.strip_page_markers = strip_page_markers
+        self.escape = escape
+        self.block: Optional[str] = None    # Kind of the block being written
+        self.wrote_any = False
+        self.pending_blank = False          # A blank line is owed before the next block
+        self.line_count = 0
+        self.block_counts = {'heading': 0, 'bullet': 0, 'numbered': 0, 'paragraph': 0}
+
+    def _start_block(self, kind: str) -> None:
+        if self.wrote_any and (self.pending_blank or kind != self.block
+                               or kind == 'heading'):
+            self.out.write('\n')
+        self.block = kind
+        self.pending_blank = False
+        self.block_counts[kind] += 1
+
+    def _text(self, text: str) -> str:
+        if self.escape:
+            return escape_markdown_special_chars(text, context_aware=True)
+        return text
+
+    def _emit(self, text: str) -> None:
+        self.out.write(text)
+        self.out.write('\n')
+        self.wrote_any = True
+
+    def write_line(self, line: str) -> None:
+        """Classify one raw line and write it as markdown."""
+        self.line_count += 1
+        classified = classify_line(line)
+        stripped = classified.stripped
+
+        # A blank line ends the current block
+        if classified.blank:
+            if self.block is not None:
+                self.pending_blank = True
+                self.block = None
+            return
+
+        if self.strip_page_markers and (PAGE_MARKER_PATTERN.search(stripped)
+                                        or FOOTER_PATTERN.match(stripped)):
+            return
+
+        if classified.heading_level is not None:
+            self._start_block('heading')
+            self._emit(apply_heading_format(self._text(stripped),
+                                            classified.heading_level).rstrip('\n'))
+            # Headings always stand alone
+            self.block = None
+            self.pending_blank = True
+            return
+
+        item_text = stripped[classified.item_start:]
+
+        if classified.bullet:
+            indent = BULLET_INDENTS.get(classified.bullet, '')
+            if self.block != 'bullet':
+                self._start_block('bullet')
+            self._emit(f"{indent}- {self._text(item_text)}")
+            return
+
+        if classified.numbered_list:
+            if self.block != 'numbered':
+                self._start_block('numbered')
+            self._emit(f"{classified.list_number}. {self._text(item_text)}")
+            return
+
+        # Continuation lines stay with the list item or paragraph above
+        if self.block is None:
+            self._start_block('paragraph')
+        self._emit(self._text(stripped))
+
+    def write_lines(self, lines: Iterable[str]) -> None:
+        """Feed lines (with or without trailing newlines)."""
+        for line in lines:
+            self.write_line(line.rstrip('\n'))
+
+    def close(self) -> None:
+        """Finish the output; nothing is written after the last block."""
+        self.block = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def render_markdown(lines: Iterable[str], out: TextIO,
+                    strip_page_markers: bool = True,
+                    escape: bool = False) -> MarkdownRenderer:
+    """
+    Convert a stream of raw lines to markdown.
+
+    Args:
+        lines: Raw chapter lines (e.g. an open 00_raw file)
+        out: Text stream receiving the markdown
+        strip_page_markers: Drop "Page X of XX" lines and manual footers
+        escape: Escape text that would otherwise be read as markdown syntax
+
+    Returns:
+        The renderer, for its line and block counts
+    """
+    with MarkdownRenderer(out, strip_page_markers, escape) as renderer:
+        renderer.write_lines(lines)
+    return renderer
@@ -6,6 +6,15 @@ Produces vanilla markdown output without extended features.
 import re
 from typing import List, Dict, Optional
 
+from .line_classifier import BULLET_MARKERS, BULLET_PATTERN, NUMBERED_LIST_PATTERN
+
+
+# Bullet markers that are not markdown list markers themselves
+UNICODE_BULLET_PATTERN = re.compile(
+    r'^(\s*)[' + re.escape(BULLET_MARKERS.replace('-', '').replace('*', '')) + r']\s+',
+    re.MULTILINE
+)
+
 
 def apply_heading_format(text: str, level: int = 1) -> str:
     """
@@ -160,13 +169,74 @@ def clean_text(text: str) -> str:
     return text
 
 
-def escape_markdown_special_chars(text: str, preserve_formatting: bool = False) -> str:
+_ASCII_PUNCTUATION = frozenset('!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~')
+
+# Inline characters that may open markup anywhere in a line
+_INLINE_CANDIDATE_PATTERN = re.compile(r'[\\`*\[\]_]')
+
+# Block markers at the start of a line (after up to 3 spaces of indent);
+# the named group is the character to escape
+_LINE_START_PATTERN = re.compile(
+    r'^ {0,3}(?:'
+    r'(?P<heading>#{1,6})(?=[ \t]|$)'             # ATX heading
+    r'|(?P<quote>>)'                               # Block quote
+    r'|(?P<bullet>[-+])(?=[ \t]|$)'                # Bullet list item
+    r'|\d{1,9}(?P<ordered>[.)])(?=[ \t]|$)'        # Ordered list item
+    r'|(?P<underline>[=-])(?=[=-]*[ \t]*$)'        # Setext underline, thematic break
+    r'|(?P<fence>~)(?=~~)'                         # Tilde code fence
+    r')',
+    re.MULTILINE
+)
+
+# GFM table delimiter row, e.g. "| --- | :-: |"
+_TABLE_DELIMITER_PATTERN = re.compile(
+    r'^[ \t]*\|?[ \t]*:?-+:?[ \t]*(?:\|[ \t]*:?-+:?[ \t]*)*\|?[ \t]*$',
+    re.MULTILINE
+)
+
+
+def _escape_inline(match: re.Match) -> str:
+    """Escape an inline candidate only if it can start markup where it stands."""
+    char = match.group(0)
+    text = match.string
+    position = match.start()
+
+    if char == '\\':
+        # A backslash only escapes ASCII punctuation
+        following = text[position + 1:position + 2]
+        return '\\\\' if following and following in _ASCII_PUNCTUATION else char
+
+    if char == '_':
+        # Intraword underscores never emphasize
+        before = text[position - 1] if position else ' '
+        after = text[position + 1:position + 2] or ' '
+        return char if before.isalnum() and after.isalnum() else '\\_'
+
+    return '\\' + char
+
+
+def _escape_line_start(match: re.Match) -> str:
+    marker = match.start(match.lastgroup) - match.start()
+    prefix = match.group(0)
+    return prefix[:marker] + '\\' + prefix[marker:]
+
+
+def _escape_table_delimiter(match: re.Match) -> str:
+    return match.group(0).replace('|', '\\|')
+
+
+def escape_markdown_special_chars(text: str, preserve_formatting: bool = False,
+                                  context_aware: bool = False) -> str:
     """
     Escape markdown special characters that should be treated as literal.
 
     Args:
         text: Text that may contain special characters
         preserve_formatting: If True, preserve intentional markdown formatting
+        context_aware: If True, escape only characters that would start
+            markdown syntax where they stand (line-start markers such as
+            "#", "-", "1." or ">", inline "*", "`", "[", "]", and "_" outside
+            words); otherwise escape every special character
 
     Returns:
         Text with special characters escaped
@@ -176,6 +246,13 @@ def escape_markdown_special_chars(text: str, preserve_formatting: bool = False)
         # This is conservative to avoid breaking actual formatting
         return text
 
+    if context_aware:
+        text = _INLINE_CANDIDATE_PATTERN.sub(_escape_inline, text)
+        text = _LINE_START_PATTERN.sub(_escape_line_start, text)
+        if '|' in text:
+            text = _TABLE_DELIMITER_PATTERN.sub(_escape_table_delimiter, text)
+        return text
+
     # Characters that need escaping: \ ` * _ { } [ ] ( ) # + - . ! |
     special_chars = ['\\', '`', '*', '_', '{', '}', '[', ']', '(', ')', '#', '+', '-', '.', '!', '|']
 
@@ -228,11 +305,11 @@ def detect_list_type(text: str) -> Optional[str]:
     text = text.strip()
 
     # Check for bullet list markers (including unicode bullets from PDF)
-    if re.match(r'^[●○•\-\*]\s+', text):
+    if BULLET_PATTERN.match(text):
         return 'bullet'
 
     # Check for numbered list markers
-    if re.match(r'^\d+[\.\)]\s+', text):
+    if NUMBERED_LIST_PATTERN.match(text):
         return 'numbered'
 
     return None
@@ -248,7 +325,7 @@ def convert_bullet_to_markdown(text: str) -> str:
     Returns:
         Text with standard markdown bullets
     """
-    # Replace common unicode bullets with markdown hyphen
-    text = re.sub(r'^(\s*)[●○•]\s+', r'\1- ', text, flags=re.MULTILINE)
+    # Replace unicode bullets with markdown hyphen
+    text = UNICODE_BULLET_PATTERN.sub(r'\1- ', text)
 
     return text
@@ -0,0 +1,245 @@
+"""
+Persistent on-disk cache of per-page PDF extraction results.
+Entries are keyed by the PDF's content hash, the page number and the
+extraction backend version, so an edited PDF or an upgraded extractor never
+serves stale text.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Dict, Iterator, Optional, Tuple, Union
+
+import pdfplumber
+
+
+# Default location and size cap; both can be overridden from the environment
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'el_documents' / 'pages'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+CACHE_DIR_ENV = 'EL_PAGE_CACHE_DIR'
+CACHE_MAX_BYTES_ENV = 'EL_PAGE_CACHE_MAX_BYTES'
+CACHE_DISABLE_ENV = 'EL_PAGE_CACHE_DISABLE'
+
+_hash_memo: Dict[Tuple[str, int, int], str] = {}
+
+_default_mode: Optional[int] = None
+
+
+def set_default_mode(fd: int) -> None:
+    """
+    Give a mkstemp file the mode a plain open() would have (0666 & ~umask).
+
+    mkstemp creates files as 0600; call this before os.replace so atomically
+    written outputs are readable like any other file.
+    """
+    global _default_mode
+    if _default_mode is None:
+        umask = os.umask(0)
+        os.umask(umask)
+        _default_mode = 0o666 & ~umask
+    os.fchmod(fd, _default_mode)
+
+
+@contextmanager
+def atomic_write(path: Union[str, Path], binary: bool = False) -> Iterator[IO]:
+    """
+    Open a temporary file next to path and move it over path on success.
+
+    Readers never see a partial file: the file is written under a hidden
+    temporary name in the same directory, given the default mode (see
+    set_default_mode) and renamed over path when the block exits cleanly.
+    On any exception the temporary file is removed and path is untouched.
+
+    Args:
+        path: File to write
+        binary: Open in binary mode instead of UTF-8 text
+
+    Yields:
+        The open temporary file
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        set_default_mode(fd)
+        with (os.fdopen(fd, 'wb') if binary else
+              os.fdopen(fd, 'w', encoding='utf-8')) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def file_hash(path: str) -> str:
+    """
+    Compute the SHA-256 hash of a file's contents.
+
+    Results are memoized per process by path, size and modification time.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex digest of the file contents
+    """
+    resolved = str(Path(path).resolve())
+    stat = os.stat(resolved)
+    memo_key = (resolved, stat.st_size, stat.st_mtime_ns)
+
+    if memo_key not in _hash_memo:
+        digest = hashlib.sha256()
+        with open(resolved, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        _hash_memo[memo_key] = digest.hexdigest()
+
+    return _hash_memo[memo_key]
+
+
+class PageCache:
+    """
+    Directory of JSON page records with a size cap and LRU eviction.
+
+    Layout: <cache_dir>/<pdf_hash>-<version>/<page>.json plus a meta.json
+    holding the document page count and <name>.json per-document records.
+    The version defaults to the pdfplumber version; other extraction
+    backends pass their own cache key. Reads bump the file's modification
+    time, and eviction removes the least recently used files once the total
+    size exceeds the cap.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None,
+                 max_bytes: Optional[int] = None,
+                 version: Optional[str] = None):
+        if cache_dir is None:
+            cache_dir = os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+        if max_bytes is None:
+            max_bytes = int(os.environ.get(CACHE_MAX_BYTES_ENV, DEFAULT_MAX_BYTES))
+
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.version = version or pdfplumber.__version__
+        self._total_bytes = None
+
+    def _doc_dir(self, pdf_hash: str) -> Path:
+        return self.cache_dir / f"{pdf_hash}-{self.version}"
+
+    def _read(self, path: Path) -> Optional[dict]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Mark as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return record
+
+    def _write(self, path: Path, record: dict) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(record, ensure_ascii=False).encode('utf-8')
+
+        # Write atomically so concurrent runs never see partial files
+        try:
+            old_size = path.stat().st_size if path.exists() else 0
+            with atomic_write(path, binary=True) as f:
+                f.write(data)
+        except OSError:
+            return
+
+        if self._total_bytes is not None:
+            self._total_bytes += len(data) - old_size
+        self._evict_if_needed()
+
+    def get_page(self, pdf_hash: str, page_num: int) -> Optional[dict]:
+        """Return the cached record for a page, or None on a miss."""
+        return self._read(self._doc_dir(pdf_hash) / f"{page_num}.json")
+
+    def put_page(self, pdf_hash: str, page_num: int, record: dict) -> None:
+        """Store the extraction record for a page."""
+        self._write(self._doc_dir(pdf_hash) / f"{page_num}.json", record)
+
+    def get_page_count(self, pdf_hash: str) -> Optional[int]:
+        """Return the cached page count for a document, or None."""
+        meta = self._read(self._doc_dir(pdf_hash) / 'meta.json')
+        return meta.get('page_count') if meta else None
+
+    def put_page_count(self, pdf_hash: str, page_count: int) -> None:
+        """Store the page count for a document."""
+        self._write(self._doc_dir(pdf_hash) / 'meta.json',
+                    {'page_count': page_count})
+
+    def get_record(self, pdf_hash: str, name: str) -> Optional[dict]:
+        """Return a named per-document record (e.g. a page template), or None."""
+        return self._read(self._doc_dir(pdf_hash) / f"{name}.json")
+
+    def put_record(self, pdf_hash: str, name: str, record: dict) -> None:
+        """Store a named per-document record alongside the page entries."""
+        self._write(self._doc_dir(pdf_hash) / f"{name}.json", record)
+
+    def _scan(self):
+        entries = []
+        if self.cache_dir.exists():
+            for doc_dir in self.cache_dir.iterdir():
+                if not doc_dir.is_dir():
+                    continue
+                for entry in os.scandir(doc_dir):
+                    if entry.is_file():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def _evict_if_needed(self) -> None:
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._scan())
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        # Evict oldest entries down to 90% of the cap to avoid thrashing
+        target = int(self.max_bytes * 0.9)
+        entries = sorted(self._scan())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+
+        self._total_bytes = total
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for _, _, path in self._scan():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self._total_bytes = 0
+
+
+def get_default_cache(version: Optional[str] = None) -> Optional[PageCache]:
+    """
+    Return the shared page cache, or None when caching is disabled.
+
+    Set EL_PAGE_CACHE_DISABLE=1 to turn caching off.
+
+    Args:
+        version: Cache namespace (default: the pdfplumber version)
+    """
+    if os.environ.get(CACHE_DISABLE_ENV, '') not in ('', '0'):
+        return None
+    return PageCache(version=version)
@@ -0,0 +1,386 @@
+"""
+Packed, memory-mapped page text store.
+
+One file holds a small header, a JSON metadata block (source PDF and
+chapter boundaries), a fixed-width page index and the text blob. The blob
+is every page's UTF-8 text followed by PAGE_SEPARATOR, the same layout as
+extract_chapter's full_text, so a page, a page range or a whole chapter is
+a single contiguous slice of the mapped file and is returned without
+copying.
+"""
+
+import json
+import mmap
+import shutil
+import struct
+import tempfile
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .page_cache import atomic_write, file_hash
+from .chapter_scheduler import plan_chapter_tasks
+from .page_template import PageTemplate, strip_page_template
+from .pdf_backends import DEFAULT_BACKEND
+from .pdf_utils import PAGE_SEPARATOR, iter_pages, preserve_unicode
+
+
+STORE_MAGIC = b'ELPAGES1'
+
+# magic, page count, metadata length
+_HEADER = struct.Struct('<8sII')
+# page number, blob offset, byte length, first line, width, height
+_ENTRY = struct.Struct('<IQQIdd')
+
+_SEPARATOR_BYTES = PAGE_SEPARATOR.encode('utf-8')
+_SEPARATOR_LINES = PAGE_SEPARATOR.count('\n')
+
+
+def write_page_store(pages: Iterable[Dict[str, any]], output_path: str,
+                     metadata: Optional[Dict[str, any]] = None) -> Path:
+    """
+    Pack page records into a store file.
+
+    Args:
+        pages: Page dictionaries in page order (e.g. from iter_pages)
+        output_path: Store file path
+        metadata: Extra JSON metadata (e.g. 'chapters' boundaries)
+
+    Returns:
+        Path of the written store
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    entries = []
+    offset = 0
+    line = 0
+
+    # The blob is spooled first because the index precedes it in the file
+    with tempfile.TemporaryFile() as blob:
+        for page in pages:
+            text = preserve_unicode(page['text'])
+            data = text.encode('utf-8')
+            blob.write(data)
+            blob.write(_SEPARATOR_BYTES)
+
+            entries.append(_ENTRY.pack(page['page_number'], offset, len(data), line,
+                                       float(page.get('width') or 0),
+                                       float(page.get('height') or 0)))
+            offset += len(data) + len(_SEPARATOR_BYTES)
+            line += text.count('\n') + _SEPARATOR_LINES
+
+        meta = json.dumps(metadata or {}, ensure_ascii=False).encode('utf-8')
+
+        with atomic_write(output_path, binary=True) as f:
+            f.write(_HEADER.pack(STORE_MAGIC, len(entries), len(meta)))
+            f.write(meta)
+            for entry in entries:
+                f.write(entry)
+            blob.seek(0)
+            shutil.copyfileobj(blob, f)
+
+    return output_path
+
+
+def build_page_store(pdf_path: str, output_path: str,
+                     chapters: Optional[List[Dict[str, any]]] = None,
+                     workers: int = 1, use_cache: bool = True,
+                     backend: str = DEFAULT_BACKEND,
+                     template: Optional[PageTemplate] = None) -> Path:
+    """
+    Extract every page of a PDF into a page store.
+
+    Args:
+        pdf_path: Path to the PDF file
+        output_path: Store file path
+        chapters: Chapter boundaries to record for chapter queries
+        workers: Number of worker processes (see extract_text_by_page)
+        use_cache: Read through the on-disk page cache
+        backend: Extraction backend name (see pdf_backends.BACKENDS)
+        template: Running header/footer lines to strip, as for the raw
+            chapters (see page_template); its digest is recorded
+
+    Returns:
+        Path of the written store
+    """
+    metadata = {
+        'pdf_path': str(pdf_path),
+        'pdf_hash': file_hash(pdf_path),
+        'backend': backend,
+        'template': template.digest if template else None,
+        'chapters': chapters or []
+    }
+    pages = iter_pages(pdf_path, workers=workers, use_cache=use_cache, backend=backend)
+    if template:
+        pages = strip_page_template(pages, template)
+    return write_page_store(pages, output_path, metadata)
+
+
+def page_store_is_current(path: str, pdf_path: str,
+                          chapters: Optional[List[Dict[str, any]]] = None,
+                          backend: str = DEFAULT_BACKEND,
+                          template: Optional[PageTemplate] = None) -> bool:
+    """
+    Whether build_page_store would write the same store that is at path.
+
+    The store's recorded PDF hash, backend, template digest and chapter
+    boundaries are compared; a missing or unreadable store is not current.
+    """
+    try:
+        with PageStore(path) as store:
+            metadata = store.metadata
+    except (OSError, ValueError, struct.error):
+        return False
+
+    return (metadata.get('pdf_hash') == file_hash(pdf_path)
+            and metadata.get('backend') == backend
+            and metadata.get('template') == (template.digest if template else None)
+            and metadata.get('chapters') == (chapters or []))
+
+
+class PageStore:
+    """
+    Read-only, memory-mapped view of a page store file.
+
+    Byte-returning methods give memoryview slices of the mapping (no copy);
+    the text methods decode just the requested slice.
+
+    Args:
+        path: Store file written by write_page_store
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        magic, page_count, meta_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != STORE_MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a page store")
+
+        position = _HEADER.size
+        self.metadata = json.loads(self._view[position:position + meta_length].tobytes())
+        position += meta_length
+
+        self.page_numbers = []
+        self._offsets = []
+        self._lengths = []
+        self._line_starts = []
+        self._sizes = []
+        for page_number, offset, length, line, width, height in _ENTRY.iter_unpack(
+                self._view[position:position + page_count * _ENTRY.size]):
+            self.page_numbers.append(page_number)
+            self._offsets.append(offset)
+            self._lengths.append(length)
+            self._line_starts.append(line)
+            self._sizes.append((width, height))
+        self._index = {number: i for i, number in enumerate(self.page_numbers)}
+
+        self._blob_start = position + page_count * _ENTRY.size
+        self._blob_end = len(self._mmap)
+
+    @property
+    def chapters(self) -> List[Dict[str, any]]:
+        """Chapter boundaries recorded when the store was built."""
+        return self.metadata.get('chapters', [])
+
+    @property
+    def line_count(self) -> int:
+        """
+        Number of lines in the blob, counting the separator lines.
+
+        Like full_text.split('\\n'), this includes the empty line after the
+        final separator.
+        """
+        if not self.page_numbers:
+            return 0
+        last = len(self.page_numbers) - 1
+        return self._line_starts[last] + self._page_text_lines(last) + _SEPARATOR_LINES + 1
+
+    def __len__(self) -> int:
+        return len(self.page_numbers)
+
+    def __contains__(self, page_number: int) -> bool:
+        return page_number in self._index
+
+    def _page_text_lines(self, index: int) -> int:
+        start = self._blob_start + self._offsets[index]
+        return self._mmap[start:start + self._lengths[index]].count(b'\n')
+
+    def page_bytes(self, page_number: int) -> memoryview:
+        """UTF-8 text of one page, as a zero-copy view."""
+        index = self._index[page_number]
+        start = self._blob_start + self._offsets[index]
+        return self._view[start:start + self._lengths[index]]
+
+    def page_text(self, page_number: int) -> str:
+        """Text of one page."""
+        return str(self.page_bytes(page_number), 'utf-8')
+
+    def page_size(self, page_number: int) -> Tuple[float, float]:
+        """(width, height) of one page."""
+        return self._sizes[self._index[page_number]]
+
+    def _index_range(self, start_page: Optional[int],
+                     end_page: Optional[int]) -> Tuple[int, int]:
+        """Index positions [first, stop) of stored pages within a page range."""
+        first = 0 if start_page is None else bisect_right(self.page_numbers, start_page - 1)
+        stop = (len(self.page_numbers) if end_page is None
+                else bisect_right(self.page_numbers, end_page))
+        return first, stop
+
+    def range_bytes(self, start_page: Optional[int] = None,
+                    end_page: Optional[int] = None) -> memoryview:
+        """
+        Pages start_page..end_page (inclusive) with their separators.
+
+        The decoded result equals extract_chapter(...)['full_text'] for the
+        same range.
+        """
+        first, stop = self._index_range(start_page, end_page)
+        if first >= stop:
+            return self._view[0:0]
+        start = self._blob_start + self._offsets[first]
+        end = (self._blob_start + self._offsets[stop - 1] + self._lengths[stop - 1]
+               + len(_SEPARATOR_BYTES))
+        return self._view[start:end]
+
+    def range_text(self, start_page: Optional[int] = None,
+                   end_page: Optional[int] = None) -> str:
+        """Decoded range_bytes()."""
+        return str(self.range_bytes(start_page, end_page), 'utf-8')
+
+    def find_chapter(self, chapter: Union[int, str]) -> Dict[str, any]:
+        """
+        Look up a chapter boundary by list position, chapter number, marker or part name.
+
+        Args:
+            chapter: Position in the boundary list (int), a chapter number
+                such as '4', the chapter marker text, or the name of its
+                chapter file ('chapter_5_part2' or '5_part2', see
+                plan_chapter_tasks) for a chapter number that occurs twice
+
+        Raises:
+            KeyError: If no chapter matches
+            ValueError: If a number or marker matches several chapters
+        """
+        if isinstance(chapter, int):
+            if 0 <= chapter < len(self.chapters):
+                return self.chapters[chapter]
+            raise KeyError(chapter)
+
+        names = [task.name for task, _ in plan_chapter_tasks(self.chapters, Path())]
+        for name, boundary in zip(names, self.chapters):
+            if chapter in (name, name[len('chapter_'):]):
+                return boundary
+
+        matches = [(name, boundary) for name, boundary in zip(names, self.chapters)
+                   if chapter in (boundary['chapter_number'], boundary['chapter_marker'])]
+        if len(matches) > 1:
+            parts = ', '.join(name for name, _ in matches)
+            raise ValueError(f"chapter {chapter!r} is ambiguous ({parts}); "
+                             f"use a part name")
+        if not matches:
+            raise KeyError(chapter)
+        return matches[0][1]
+
+    def chapter_bytes(self, chapter: Union[int, str]) -> memoryview:
+        """A chapter's full_text as a zero-copy view."""
+        boundary = self.find_chapter(chapter)
+        return self.range_bytes(boundary['page_number'], boundary['end_page'])
+
+    def chapter_text(self, chapter: Union[int, str]) -> str:
+        """A chapter's full_text."""
+        return str(self.chapter_bytes(chapter), 'utf-8')
+
+    def _line_position(self, line: int) -> int:
+        """Absolute mapping offset where a blob line starts."""
+        index = max(0, bisect_right(self._line_starts, line) - 1)
+        position = self._blob_start + self._offsets[index]
+        for _ in range(line - self._line_starts[index]):
+            position = self._mmap.find(b'\n', position, self._blob_end)
+            if position < 0:
+                return self._blob_end
+            position += 1
+        return position
+
+    def _line_span(self, start_line: int, end_line: int,
+                   chapter: Union[int, str, None]) -> Optional[Tuple[int, int]]:
+        """Mapping offsets of a line range, or None if it selects no lines."""
+        if not self.page_numbers:
+            return None
+
+        first, stop = 0, len(self.page_numbers)
+        if chapter is not None:
+            boundary = self.find_chapter(chapter)
+            first, stop = self._index_range(boundary['page_number'], boundary['end_page'])
+            if first >= stop:
+                return None
+
+        # Lines of the selected pages, separator lines included, plus the
+        # empty line after the final separator (as in full_text.split('\n'))
+        base = self._line_starts[first]
+        limit = (self._line_starts[stop] if stop < len(self.page_numbers)
+                 else self.line_count - 1) + 1
+        start_line = base + max(0, start_line)
+        end_line = min(base + end_line, limit)
+        if start_line >= end_line:
+            return None
+
+        start = self._line_position(start_line)
+        if end_line == limit:
+            # The last line is the empty one at the end of the range
+            end = self._line_position(limit - 1)
+        else:
+            # Stop before the newline that terminates the last requested line
+            end = self._line_position(end_line) - 1
+        return start, end
+
+    def lines_bytes(self, start_line: int, end_line: int,
+                    chapter: Union[int, str, None] = None) -> memoryview:
+        """
+        Lines start_line..end_line (exclusive) as a zero-copy view.
+
+        Line numbers count from the start of the chapter (as in
+        Chapter.lines) when a chapter is given, otherwise from the first
+        stored page. Ranges are clipped to the chapter (or store).
+        """
+        span = self._line_span(start_line, end_line, chapter)
+        if span is None:
+            return self._view[0:0]
+        return self._view[span[0]:span[1]]
+
+    def lines(self, start_line: int, end_line: int,
+              chapter: Union[int, str, None] = None) -> List[str]:
+        """Lines start_line..end_line (exclusive), see lines_bytes()."""
+        span = self._line_span(start_line, end_line, chapter)
+        if span is None:
+            return []
+        return str(self._view[span[0]:span[1]], 'utf-8').split('\n')
+
+    def close(self) -> None:
+        """
+        Release the mapping and the file.
+
+        Views handed out earlier keep the mapping alive until they are
+        released; it is then unmapped when garbage collected.
+        """
+        try:
+            if getattr(self, '_view', None) is not None:
+                self._view.release()
+            if getattr(self, '_mmap', None) is not None:
+                self._mmap.close()
+        except BufferError:
+            pass
+        self._view = None
+        self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
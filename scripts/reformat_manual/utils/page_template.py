@@ -0,0 +1,206 @@
+"""
+Running header and footer detection and stripping.
+
+The first and last few non-empty lines of every page are normalized (digits
+folded to '#', so "Page 3 of XX" and "Page 4 of XX" agree), hashed and
+counted per position. Lines that repeat at the same position on enough
+pages form the document's page template, which is then stripped from page
+text as it streams past. Templates are cached per PDF hash next to the page
+cache entries, so later runs skip the learning pass.
+"""
+
+import re
+import hashlib
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .page_cache import file_hash, get_default_cache
+from .pdf_backends import DEFAULT_BACKEND, get_backend
+from .pdf_utils import CHAPTER_PATTERN, get_page_count, iter_page_records
+
+
+# Bump when learning or matching changes so cached templates are relearned
+TEMPLATE_FORMAT = 1
+
+TEMPLATE_RECORD = 'page_template'
+
+# Lines examined at the top and at the bottom of each page
+EDGE_LINES = 3
+
+# A line must repeat on at least this many pages...
+MIN_PAGES = 3
+
+# ...and on this share of all pages, unless it carries a page counter
+MIN_FRACTION = 0.5
+
+_DIGITS = re.compile(r'\d+')
+
+
+def line_key(line: str) -> str:
+    """Hash of a line with surrounding whitespace removed and digits folded."""
+    normalized = _DIGITS.sub('#', line.strip())
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+def _edge_positions(lines: List[str], edge_lines: int) -> List[Tuple[str, int]]:
+    """(position, line index) for the first and last edge_lines non-empty lines."""
+    content = [i for i, line in enumerate(lines) if line.strip()]
+    positions = [(f"top{n}", i) for n, i in enumerate(content[:edge_lines])]
+    positions += [(f"bottom{n}", i) for n, i in enumerate(reversed(content[-edge_lines:]))]
+    return positions
+
+
+class PageTemplate:
+    """
+    Repeating lines by page position ('top0' is the first non-empty line,
+    'bottom0' the last).
+
+    Args:
+        lines: Position -> line keys (see line_key) that are stripped there
+        edge_lines: Lines examined at each edge of a page
+        examples: Position -> sample text of each template line, for reports
+    """
+
+    def __init__(self, lines: Dict[str, List[str]], edge_lines: int = EDGE_LINES,
+                 examples: Optional[Dict[str, List[str]]] = None):
+        self.lines = {position: set(keys) for position, keys in lines.items()}
+        self.edge_lines = edge_lines
+        self.examples = examples or {}
+
+    def __bool__(self) -> bool:
+        return any(self.lines.values())
+
+    @property
+    def digest(self) -> str:
+        """Short hash identifying the template (for build manifests)."""
+        canonical = repr(sorted((position, sorted(keys))
+                                for position, keys in self.lines.items()))
+        return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:12]
+
+    @classmethod
+    def learn(cls, pages: Iterable[Dict[str, any]], edge_lines: int = EDGE_LINES,
+              min_pages: int = MIN_PAGES, min_fraction: float = MIN_FRACTION) -> 'PageTemplate':
+        """
+        Learn the template from page records in one pass.
+
+        A line belongs to the template if it repeats at the same position on
+        at least max(min_pages, min_fraction of all pages) pages, or on at
+        least min_pages pages with a number that changes on nearly every
+        page (a running header with a page counter, whose chapter title
+        changes from chapter to chapter).
+
+        Args:
+            pages: Page records (only edge lines are kept in memory)
+            edge_lines: Lines examined at each edge of a page
+            min_pages: Minimum number of pages a line must repeat on
+            min_fraction: Minimum share of pages for lines without a counter
+        """
+        counts: Counter = Counter()
+        variants: Dict[Tuple[str, str], set] = {}
+        examples: Dict[Tuple[str, str], str] = {}
+        page_count = 0
+
+        for page in pages:
+            page_count += 1
+            lines = page['text'].split('\n')
+            for position, index in _edge_positions(lines, edge_lines):
+                line = lines[index].strip()
+                if CHAPTER_PATTERN.search(line):
+                    continue
+                key = (position, line_key(line))
+                counts[key] += 1
+                if _DIGITS.search(line):
+                    variants.setdefault(key, set()).add(line)
+                examples.setdefault(key, line)
+
+        threshold = max(min_pages, min_fraction * page_count)
+        template: Dict[str, List[str]] = {}
+        samples: Dict[str, List[str]] = {}
+        for (position, key), count in counts.items():
+            counter = len(variants.get((position, key), ())) >= 0.8 * count
+            if count >= threshold or (count >= min_pages and counter):
+                template.setdefault(position, []).append(key)
+                samples.setdefault(position, []).append(examples[(position, key)])
+
+        return cls(template, edge_lines, samples)
+
+    def strip(self, text: str) -> str:
+        """Remove template lines from a page's text."""
+        if not self:
+            return text
+
+        lines = text.split('\n')
+        drop = {index for position, index in _edge_positions(lines, self.edge_lines)
+                if line_key(lines[index]) in self.lines.get(position, ())}
+        if not drop:
+            return text
+
+        return '\n'.join(line for i, line in enumerate(lines) if i not in drop).strip('\n')
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            'format': TEMPLATE_FORMAT,
+            'edge_lines': self.edge_lines,
+            'lines': {position: sorted(keys) for position, keys in sorted(self.lines.items())},
+            'examples': self.examples
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, any]) -> Optional['PageTemplate']:
+        """Rebuild a template, or return None if it was written by another format."""
+        if data.get('format') != TEMPLATE_FORMAT:
+            return None
+        return cls(data['lines'], data['edge_lines'], data.get('examples'))
+
+
+def load_or_learn_template(pdf_path: str, workers: int = 1, use_cache: bool = True,
+                           backend: str = DEFAULT_BACKEND,
+                           edge_lines: int = EDGE_LINES) -> PageTemplate:
+    """
+    Return the page template for a PDF, learning it over all pages on a miss.
+
+    Args:
+        pdf_path: Path to the PDF file
+        workers: Number of worker processes for the learning pass
+        use_cache: Read and store the template in the page cache
+        backend: Extraction backend name (see pdf_backends.BACKENDS)
+        edge_lines: Lines examined at each edge of a page
+
+    Returns:
+        The document's PageTemplate (possibly empty)
+    """
+    cache = get_default_cache(get_backend(backend).cache_key) if use_cache else None
+    pdf_hash = file_hash(pdf_path) if cache else None
+
+    if cache:
+        record = cache.get_record(pdf_hash, TEMPLATE_RECORD)
+        template = PageTemplate.from_dict(record) if record else None
+        if template is not None and template.edge_lines == edge_lines:
+            return template
+
+    page_nums = range(get_page_count(pdf_path, use_cache, backend))
+    template = PageTemplate.learn(
+        iter_page_records(pdf_path, page_nums, workers, use_cache, backend),
+        edge_lines
+    )
+
+    if cache:
+        cache.put_record(pdf_hash, TEMPLATE_RECORD, template.to_dict())
+
+    return template
+
+
+def strip_page_template(pages: Iterable[Dict[str, any]],
+                        template: PageTemplate) -> Iterator[Dict[str, any]]:
+    """
+    Yield page records with template lines removed from their text.
+
+    Records are copied, never modified, since they may come from the cache.
+    Pages left without text are skipped, as iter_pages skips empty pages.
+    """
+    for page in pages:
+        text = template.strip(page['text'])
+        if text is page['text']:
+            yield page
+        elif text:
+            yield {**page, 'text': text}
@@ -0,0 +1,169 @@
+"""
+Text extraction backends for pdf_utils.
+pdfplumber is the default and keeps layout-aware spacing; pypdfium2 reads
+text through PDFium's native text API and is much faster for bulk runs.
+"""
+
+import difflib
+import re
+from typing import Dict, List, Optional
+
+import pdfplumber
+import pypdfium2 as pdfium
+
+
+DEFAULT_BACKEND = 'pdfplumber'
+
+
+class PdfplumberBackend:
+    """Layout-aware extraction with pdfplumber (the reference output)."""
+
+    name = 'pdfplumber'
+    # Cache namespace; bare version keeps existing cache entries valid
+    cache_key = pdfplumber.__version__
+
+    def open(self, pdf_path: str):
+        return pdfplumber.open(pdf_path)
+
+    def page_count(self, handle) -> int:
+        return len(handle.pages)
+
+    def read_page(self, handle, page_num: int) -> Dict[str, any]:
+        page = handle.pages[page_num]
+        record = {
+            'page_number': page_num,
+            'text': page.extract_text() or '',
+            'width': page.width,
+            'height': page.height
+        }
+
+        # Drop cached layout objects so memory stays flat across the pass
+        page.close()
+
+        return record
+
+    def close(self, handle) -> None:
+        handle.close()
+
+
+class PdfiumBackend:
+    """
+    Fast extraction with PDFium's text API via pypdfium2.
+
+    Line endings are normalized to '\\n' and trailing spaces on each line
+    are removed so the text lines up with pdfplumber's output.
+    """
+
+    name = 'pypdfium2'
+    cache_key = f"pypdfium2-{pdfium.version.PYPDFIUM_INFO}"
+
+    _TRAILING_SPACE = re.compile(r'[ \t]+$', re.MULTILINE)
+
+    def open(self, pdf_path: str):
+        return pdfium.PdfDocument(pdf_path)
+
+    def page_count(self, handle) -> int:
+        return len(handle)
+
+    def read_page(self, handle, page_num: int) -> Dict[str, any]:
+        page = handle[page_num]
+        textpage = page.get_textpage()
+        try:
+            text = textpage.get_text_range()
+            width, height = page.get_size()
+        finally:
+            textpage.close()
+            page.close()
+
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        text = self._TRAILING_SPACE.sub('', text).strip('\n')
+
+        return {
+            'page_number': page_num,
+            'text': text,
+            'width': width,
+            'height': height
+        }
+
+    def close(self, handle) -> None:
+        handle.close()
+
+
+BACKENDS = {
+    PdfplumberBackend.name: PdfplumberBackend(),
+    PdfiumBackend.name: PdfiumBackend(),
+}
+
+
+def get_backend(name: Optional[str] = None):
+    """
+    Look up an extraction backend by name.
+
+    Args:
+        name: Backend name (see BACKENDS), None for the default
+
+    Returns:
+        Backend instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    name = name or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}' (choose from: {', '.join(BACKENDS)})")
+    return BACKENDS[name]
+
+
+def compare_page_texts(reference: str, candidate: str,
+                       max_diff_lines: int = 40) -> Dict[str, any]:
+    """
+    Compare one page's text from two backends.
+
+    Args:
+        reference: Text from the reference backend
+        candidate: Text from the candidate backend
+        max_diff_lines: Maximum unified diff lines to keep
+
+    Returns:
+        Dictionary with 'status' ('identical', 'whitespace' or 'different'),
+        'similarity' (0-1) and a truncated unified 'diff'
+    """
+    if reference == candidate:
+        return {'status': 'identical', 'similarity': 1.0, 'diff': []}
+
+    if reference.split() == candidate.split():
+        status = 'whitespace'
+    else:
+        status = 'different'
+
+    reference_lines = reference.split('\n')
+    candidate_lines = candidate.split('\n')
+    similarity = difflib.SequenceMatcher(None, reference_lines, candidate_lines,
+                                         autojunk=False).ratio()
+    diff = list(difflib.unified_diff(reference_lines, candidate_lines,
+                                     'reference', 'candidate', lineterm='', n=1))
+
+    return {
+        'status': status,
+        'similarity': similarity,
+        'diff': diff[:max_diff_lines]
+    }
+
+
+def summarize_comparison(pages: List[Dict[str, any]]) -> Dict[str, any]:
+    """Count page statuses and list the least similar pages."""
+    counts = {'identical': 0, 'whitespace': 0, 'different': 0}
+    for page in pages:
+        counts[page['status']] += 1
+
+    worst = sorted((page for page in pages if page['status'] != 'identical'),
+                   key=lambda page: page['similarity'])[:10]
+
+    return {
+        'pages_compared': len(pages),
+        'status_counts': counts,
+        'least_similar_pages': [
+            {'page_number': page['page_number'], 'similarity': page['similarity']}
+            for page in worst
+        ]
+    }
@@ -3,13 +3,36 @@ PDF utilities for extracting text and structure from PDF documents.
 Preserves unicode characters and detects document structure.
 """
 
-import pdfplumber
-from typing import List, Dict, Tuple, Optional
+import pypdfium2 as pdfium
+from bisect import bisect_right
+from collections import deque
+from collections.abc import Mapping
+from functools import cached_property
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator, Sequence
 import re
+import time
+
+from .line_classifier import ClassifiedLine, classify_lines
+from .page_cache import file_hash, get_default_cache
+from .pdf_backends import (
+    DEFAULT_BACKEND,
+    compare_page_texts,
+    get_backend,
+    summarize_comparison
+)
+from .profiling import enable_profiling, get_profiler
+
+
+# Upper bound on pages per task when extracting in parallel
+PARALLEL_CHUNK_PAGES = 8
 
 
 def extract_text_by_page(pdf_path: str, start_page: Optional[int] = None,
-                         end_page: Optional[int] = None) -> List[Dict[str, any]]:
+                         end_page: Optional[int] = None,
+                         workers: int = 1,
+                         use_cache: bool = True,
+                         backend: str = DEFAULT_BACKEND) -> List[Dict[str, any]]:
     """
     Extract text from PDF pages with metadata.
 
@@ -17,30 +40,162 @@ def extract_text_by_page(pdf_path: str, start_page: Optional[int] = None,
         pdf_path: Path to the PDF file
         start_page: Starting page number (0-indexed), None for first page
         end_page: Ending page number (0-indexed), None for last page
+        workers: Number of worker processes; values above 1 split the page
+            range across a process pool (output is identical to serial)
+        use_cache: Read and populate the on-disk page cache (see page_cache)
+        backend: Extraction backend name (see pdf_backends.BACKENDS)
 
     Returns:
         List of dictionaries containing page number and extracted text
     """
-    pages_data = []
+    return list(iter_pages(pdf_path, start_page, end_page, workers, use_cache,
+                           backend))
 
-    with pdfplumber.open(pdf_path) as pdf:
-        total_pages = len(pdf.pages)
-        start = start_page if start_page is not None else 0
-        end = end_page if end_page is not None else total_pages - 1
 
-        for page_num in range(start, min(end + 1, total_pages)):
-            page = pdf.pages[page_num]
-            text = page.extract_text()
+def iter_pages(pdf_path: str, start_page: Optional[int] = None,
+               end_page: Optional[int] = None,
+               workers: int = 1,
+               use_cache: bool = True,
+               backend: str = DEFAULT_BACKEND) -> Iterator[Dict[str, any]]:
+    """
+    Yield page dictionaries one at a time, in page order.
 
-            if text:
-                pages_data.append({
-                    'page_number': page_num,
-                    'text': text,
-                    'width': page.width,
-                    'height': page.height
-                })
+    Streaming counterpart of extract_text_by_page: only a bounded number of
+    pages is held in memory at once, regardless of document length.
+
+    Args:
+        pdf_path: Path to the PDF file
+        start_page: Starting page number (0-indexed), None for first page
+        end_page: Ending page number (0-indexed), None for last page
+        workers: Number of worker processes (see extract_text_by_page)
+        use_cache: Read and populate the on-disk page cache (see page_cache)
+        backend: Extraction backend name (see pdf_backends.BACKENDS)
+
+    Yields:
+        Dictionaries containing page number and extracted text
+    """
+    total_pages = get_page_count(pdf_path, use_cache, backend)
+
+    start = start_page if start_page is not None else 0
+    end = end_page if end_page is not None else total_pages - 1
+    end = min(end, total_pages - 1)
+
+    # Pages without text are cached too, but not returned
+    for record in iter_page_records(pdf_path, range(start, end + 1),
+                                    workers, use_cache, backend):
+        if record['text']:
+            yield record
+
+
+def get_page_count(pdf_path: str, use_cache: bool = True,
+                   backend: str = DEFAULT_BACKEND) -> int:
+    """Return the number of pages in the PDF, using the page cache if enabled."""
+    extractor = get_backend(backend)
+    cache = get_default_cache(extractor.cache_key) if use_cache else None
+    pdf_hash = file_hash(pdf_path) if cache else None
+
+    page_count = cache.get_page_count(pdf_hash) if cache else None
+    if page_count is None:
+        handle = extractor.open(pdf_path)
+        try:
+            page_count = extractor.page_count(handle)
+        finally:
+            extractor.close(handle)
+        if cache:
+            cache.put_page_count(pdf_hash, page_count)
+
+    return page_count
+
+
+def iter_page_records(pdf_path: str, page_nums: Sequence[int], workers: int = 1,
+                      use_cache: bool = True,
+                      backend: str = DEFAULT_BACKEND) -> Iterator[Dict[str, any]]:
+    """
+    Yield extraction records for the given pages, serially or in parallel.
+
+    Unlike iter_pages, the pages need not be contiguous and records of
+    pages without text are yielded too.
+
+    Args:
+        pdf_path: Path to the PDF file
+        page_nums: Page numbers (0-indexed) in the order to yield them
+        workers: Number of worker processes (see extract_text_by_page)
+        use_cache: Read and populate the on-disk page cache (see page_cache)
+        backend: Extraction backend name (see pdf_backends.BACKENDS)
+    """
+    page_nums = list(page_nums)
+
+    if workers <= 1 or len(page_nums) < 2:
+        yield from _page_records(pdf_path, page_nums, use_cache, backend)
+        return
+
+    # Small contiguous chunks, several per worker so uneven pages balance
+    # out; at most two chunks per worker are in flight at any time
+    chunk_size = max(1, min(PARALLEL_CHUNK_PAGES, len(page_nums) // (workers * 4)))
+    chunks = [page_nums[i:i + chunk_size]
+              for i in range(0, len(page_nums), chunk_size)]
+
+    profiler = get_profiler()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_extract_page_list, pdf_path,
+                                           chunk, use_cache, backend,
+                                           profiler.enabled))
+            if len(pending) >= workers * 2:
+                records, page_timings = pending.popleft().result()
+                profiler.merge_pages(page_timings)
+                yield from records
+        while pending:
+            records, page_timings = pending.popleft().result()
+            profiler.merge_pages(page_timings)
+            yield from records
+
+
+def _page_records(pdf_path: str, page_nums: Sequence[int], use_cache: bool = True,
+                  backend: str = DEFAULT_BACKEND) -> Iterator[Dict[str, any]]:
+    """Yield records for pages, extracting cache misses with one shared handle."""
+    extractor = get_backend(backend)
+    cache = get_default_cache(extractor.cache_key) if use_cache else None
+    pdf_hash = file_hash(pdf_path) if cache else None
+    profiler = get_profiler()
+    handle = None
+
+    try:
+        for page_num in page_nums:
+            started = time.perf_counter()
+            record = cache.get_page(pdf_hash, page_num) if cache else None
+            cached = record is not None
+
+            if record is None:
+                # Only open the PDF once a page actually needs extracting
+                if handle is None:
+                    handle = extractor.open(pdf_path)
+                record = extractor.read_page(handle, page_num)
+
+                if cache:
+                    cache.put_page(pdf_hash, page_num, record)
+
+            profiler.record_page(page_num, time.perf_counter() - started, cached)
+            yield record
+    finally:
+        if handle is not None:
+            extractor.close(handle)
+
+
+def _extract_page_list(pdf_path: str, page_nums: List[int], use_cache: bool = True,
+                       backend: str = DEFAULT_BACKEND, profile: bool = False) -> Tuple[List[Dict[str, any]],
+                                                       List[Dict[str, any]]]:
+    """
+    Worker entry point: read a chunk of pages with a private handle.
 
-    return pages_data
+    Returns the records plus the page latencies recorded in this worker
+    (empty unless profile is True), for the parent's profiler.
+    """
+    profiler = enable_profiling('basic' if profile else None)
+    records = list(_page_records(pdf_path, page_nums, use_cache, backend))
+    return records, profiler.pages
 
 
 def detect_headings(text: str, page_num: int = 0) -> List[Dict[str, any]]:
@@ -54,21 +209,40 @@ def detect_headings(text: str, page_num: int = 0) -> List[Dict[str, any]]:
     Returns:
         List of detected headings with metadata
     """
-    headings = []
-    lines = text.split('\n')
+    lines = classify_lines(text)
+    return headings_from_lines(lines, page_num, 0, len(lines))
+
+
+def headings_from_lines(lines: List[ClassifiedLine], page_num: int,
+                        start: int, stop: int) -> List[Dict[str, any]]:
+    """
+    Detect headings in a slice of already classified lines.
 
-    for i, line in enumerate(lines):
-        line_stripped = line.strip()
+    Args:
+        lines: Output of classify_lines
+        page_num: Page number for context
+        start: Index of the first line of the slice
+        stop: Index one past the last line of the slice; the slice is
+            treated as a standalone text, so its last line is never
+            considered followed by a blank line
 
+    Returns:
+        List of detected headings with line numbers relative to start
+    """
+    headings = []
+
+    for line in lines[start:stop]:
         # Skip empty lines
-        if not line_stripped:
+        if line.blank:
             continue
 
+        line_number = line.index - start
+
         # Pattern 1: All caps (potential heading)
-        if line_stripped.isupper() and len(line_stripped) > 2:
+        if line.all_caps:
             headings.append({
-                'text': line_stripped,
-                'line_number': i,
+                'text': line.stripped,
+                'line_number': line_number,
                 'page_number': page_num,
                 'type': 'all_caps',
                 'confidence': 0.8
@@ -76,27 +250,25 @@ def detect_headings(text: str, page_num: int = 0) -> List[Dict[str, any]]:
             continue
 
         # Pattern 2: Numbered sections (e.g., "1. Introduction", "1.1 Overview")
-        numbered_pattern = r'^(\d+\.)+\s+(.+)$'
-        match = re.match(numbered_pattern, line_stripped)
-        if match:
+        if line.number is not None:
             headings.append({
-                'text': line_stripped,
-                'line_number': i,
+                'text': line.stripped,
+                'line_number': line_number,
                 'page_number': page_num,
                 'type': 'numbered',
                 'confidence': 0.9,
-                'number': match.group(1)
+                'number': line.number
             })
             continue
 
         # Pattern 3: Short lines followed by blank line (potential heading)
-        if (len(line_stripped) < 80 and
-            len(line_stripped) > 2 and
-            i + 1 < len(lines) and
-            not lines[i + 1].strip()):
+        if (len(line.stripped) < 80 and
+            len(line.stripped) > 2 and
+            line.followed_by_blank and
+            line.index + 1 < stop):
             headings.append({
-                'text': line_stripped,
-                'line_number': i,
+                'text': line.stripped,
+                'line_number': line_number,
                 'page_number': page_num,
                 'type': 'short_line',
                 'confidence': 0.6
@@ -135,7 +307,10 @@ def preserve_unicode(text: str) -> str:
 
 def extract_chapter(pdf_path: str, chapter_name: str,
                     start_page: Optional[int] = None,
-                    end_page: Optional[int] = None) -> Dict[str, any]:
+                    end_page: Optional[int] = None,
+                    workers: int = 1,
+                    use_cache: bool = True,
+                    backend: str = DEFAULT_BACKEND) -> 'Chapter':
     """
     Extract a specific chapter from the PDF.
 
@@ -144,70 +319,231 @@ def extract_chapter(pdf_path: str, chapter_name: str,
         chapter_name: Name/identifier of the chapter
         start_page: Starting page number (0-indexed)
         end_page: Ending page number (0-indexed)
+        workers: Number of worker processes (see extract_text_by_page)
+        use_cache: Read through the on-disk page cache
+        backend: Extraction backend name (see pdf_backends.BACKENDS)
 
     Returns:
-        Dictionary with chapter metadata and content
+        Chapter mapping with chapter metadata and content
     """
-    pages = extract_text_by_page(pdf_path, start_page, end_page)
+    pages = extract_text_by_page(pdf_path, start_page, end_page,
+                                 workers, use_cache, backend)
 
-    # Combine all page texts with page separators
-    full_text = ""
-    for page in pages:
-        full_text += page['text'] + "\n\n"
+    return Chapter(chapter_name, start_page, end_page, pages)
 
-    # Preserve unicode characters
-    full_text = preserve_unicode(full_text)
 
-    # Detect headings across all pages
-    all_headings = []
-    for page in pages:
-        headings = detect_headings(page['text'], page['page_number'])
-        all_headings.extend(headings)
+def iter_chapter_pages(pdf_path: str, chapters: List[Dict[str, any]],
+                       workers: int = 1,
+                       use_cache: bool = True,
+                       backend: str = DEFAULT_BACKEND) -> Iterator[Tuple[int, Dict[str, any]]]:
+    """
+    Yield pages routed to chapters, in a single streaming pass over the PDF.
+
+    Args:
+        pdf_path: Path to the PDF file
+        chapters: Chapter boundaries as produced by find_chapter_boundaries
+        workers: Number of worker processes (see extract_text_by_page)
+        use_cache: Read through the on-disk page cache
+        backend: Extraction backend name (see pdf_backends.BACKENDS)
+
+    Yields:
+        (chapter index, page dictionary) pairs in page order; a page that
+        falls in several chapter ranges is yielded once per chapter
+    """
+    if not chapters:
+        return
+
+    total_pages = get_page_count(pdf_path, use_cache, backend)
+
+    # Resolve each boundary to an inclusive page range
+    ranges = []
+    for chapter in chapters:
+        start = chapter['page_number'] or 0
+        end = chapter['end_page'] if chapter['end_page'] is not None else total_pages - 1
+        ranges.append((start, min(end, total_pages - 1)))
+
+    # Only pages inside some range are read, so a subset of chapters (e.g.
+    # the stale ones) does not pull in the pages between them
+    page_nums = sorted({page_num for start, end in ranges
+                        for page_num in range(start, end + 1)})
+
+    for page_data in iter_page_records(pdf_path, page_nums, workers,
+                                       use_cache, backend):
+        if not page_data['text']:
+            continue
+        page_num = page_data['page_number']
+        for i, (start, end) in enumerate(ranges):
+            if start <= page_num <= end:
+                yield i, page_data
+
+
+# Separator placed after every page in a chapter's full_text
+PAGE_SEPARATOR = "\n\n"
 
-    return {
-        'chapter_name': chapter_name,
-        'start_page': start_page,
-        'end_page': end_page,
-        'pages': pages,
-        'full_text': full_text,
-        'headings': all_headings,
-        'page_count': len(pages)
-    }
 
+class Chapter(Mapping):
+    """
+    Lazily materialized chapter returned by extract_chapter.
+
+    Reads like the original chapter dictionary (chapter_name, start_page,
+    end_page, pages, full_text, headings, page_count), but full_text and
+    headings are only built on first access. Page boundaries are tracked
+    as character offsets so callers can map positions in full_text back to
+    PDF pages without materializing it.
+    """
 
-def find_chapter_boundaries(pdf_path: str) -> List[Dict[str, any]]:
+    _KEYS = ('chapter_name', 'start_page', 'end_page', 'pages',
+             'full_text', 'headings', 'page_count')
+
+    def __init__(self, chapter_name: str, start_page: Optional[int],
+                 end_page: Optional[int], pages: List[Dict[str, any]]):
+        self.chapter_name = chapter_name
+        self.start_page = start_page
+        self.end_page = end_page
+        self.pages = pages
+
+        # Start offset and start line of each page within full_text
+        self.page_offsets = []
+        self.page_line_starts = []
+        offset = 0
+        line = 0
+        for page in pages:
+            self.page_offsets.append(offset)
+            self.page_line_starts.append(line)
+            offset += len(page['text']) + len(PAGE_SEPARATOR)
+            line += page['text'].count('\n') + PAGE_SEPARATOR.count('\n')
+        self.text_length = offset
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    @cached_property
+    def full_text(self) -> str:
+        # Preserve unicode characters
+        return preserve_unicode(''.join(
+            page['text'] + PAGE_SEPARATOR for page in self.pages
+        ))
+
+    @cached_property
+    def lines(self) -> List[ClassifiedLine]:
+        """full_text classified line by line (see line_classifier)."""
+        return classify_lines(self.full_text)
+
+    @cached_property
+    def headings(self) -> List[Dict[str, any]]:
+        # Detect headings across all pages, reusing the full_text line tags
+        all_headings = []
+        for page, start in zip(self.pages, self.page_line_starts):
+            stop = start + page['text'].count('\n') + 1
+            all_headings.extend(headings_from_lines(self.lines, page['page_number'],
+                                                    start, stop))
+        return all_headings
+
+    def page_for_offset(self, offset: int) -> Optional[int]:
+        """Return the PDF page number containing a full_text character offset."""
+        if not self.pages or not 0 <= offset < self.text_length:
+            return None
+        return self.pages[bisect_right(self.page_offsets, offset) - 1]['page_number']
+
+    def page_for_line(self, line_num: int) -> Optional[int]:
+        """Return the PDF page number containing a full_text line index."""
+        if not self.pages or line_num < 0:
+            return None
+        index = bisect_right(self.page_line_starts, line_num) - 1
+        return self.pages[index]['page_number']
+
+    def page_span(self, page_number: int) -> Optional[Tuple[int, int]]:
+        """Return the (start, end) full_text offsets of a PDF page's text."""
+        for page, offset in zip(self.pages, self.page_offsets):
+            if page['page_number'] == page_number:
+                return offset, offset + len(page['text'])
+        return None
+
+    def to_dict(self) -> Dict[str, any]:
+        """Return a plain dictionary (e.g. for json.dump)."""
+        return {key: self[key] for key in self._KEYS}
+
+    def __getitem__(self, key: str):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+
+# Chapter markers: "Chapter N", "CHAPTER N", "Section N"
+CHAPTER_PATTERN = re.compile(r'^(CHAPTER|Chapter|SECTION|Section)\s+(\d+|[IVXLCDM]+)')
+
+# Looser form used to pre-screen pages; must never miss a page that
+# CHAPTER_PATTERN would match
+_CHAPTER_HINT_PATTERN = re.compile(r'(CHAPTER|Chapter|SECTION|Section)\s*(\d|[IVXLCDM])')
+
+# Fraction of the page height, from the top edge, the pre-screen reads.
+# chapter_boundaries_from_pages only checks a page's first five lines; on
+# the manual those end at most 164pt below the top of a 792pt page, so a
+# third of the page leaves room for several more lines of spacing.
+_CHAPTER_HINT_BAND = 1 / 3
+
+
+def find_chapter_boundaries(pdf_path: str, workers: int = 1,
+                            use_cache: bool = True,
+                            fast: bool = False,
+                            backend: str = DEFAULT_BACKEND) -> List[Dict[str, any]]:
     """
     Attempt to automatically detect chapter boundaries in the PDF.
 
     Args:
         pdf_path: Path to the PDF file
+        workers: Number of worker processes (see extract_text_by_page)
+        use_cache: Read through the on-disk page cache
+        fast: Pre-screen pages with pypdfium2's native text API and run the
+            full extraction only on candidate pages
+        backend: Extraction backend name (see pdf_backends.BACKENDS)
+
+    Returns:
+        List of detected chapters with start/end page numbers
+    """
+    if fast:
+        candidates = _find_chapter_candidates(pdf_path)
+        pages = (record for record in
+                 iter_page_records(pdf_path, candidates, workers, use_cache, backend)
+                 if record['text'])
+    else:
+        pages = iter_pages(pdf_path, workers=workers, use_cache=use_cache,
+                           backend=backend)
+
+    return chapter_boundaries_from_pages(pages)
+
+
+def chapter_boundaries_from_pages(pages: Iterable[Dict[str, any]]) -> List[Dict[str, any]]:
+    """
+    Detect chapter markers in page records (see find_chapter_boundaries).
+
+    Args:
+        pages: Page records in page order
 
     Returns:
         List of detected chapters with start/end page numbers
     """
     chapters = []
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_num, page in enumerate(pdf.pages):
-            text = page.extract_text()
-            if not text:
-                continue
-
-            # Look for chapter markers
-            # Common patterns: "Chapter N", "CHAPTER N", "Section N"
-            chapter_pattern = r'^(CHAPTER|Chapter|SECTION|Section)\s+(\d+|[IVXLCDM]+)'
-
-            lines = text.split('\n')
-            for line in lines[:5]:  # Check first 5 lines of page
-                match = re.search(chapter_pattern, line.strip())
-                if match:
-                    chapters.append({
-                        'chapter_marker': line.strip(),
-                        'page_number': page_num,
-                        'chapter_type': match.group(1),
-                        'chapter_number': match.group(2)
-                    })
-                    break
+    for page in pages:
+        lines = page['text'].split('\n')
+        for line in lines[:5]:  # Check first 5 lines of page
+            match = CHAPTER_PATTERN.search(line.strip())
+            if match:
+                chapters.append({
+                    'chapter_marker': line.strip(),
+                    'page_number': page['page_number'],
+                    'chapter_type': match.group(1),
+                    'chapter_number': match.group(2)
+                })
+                break
 
     # Add end page numbers
     for i, chapter in enumerate(chapters):
@@ -217,3 +553,92 @@ def find_chapter_boundaries(pdf_path: str) -> List[Dict[str, any]]:
             chapter['end_page'] = None  # Last chapter goes to end
 
     return chapters
+
+
+def compare_backends(pdf_path: str, start_page: Optional[int] = None,
+                     end_page: Optional[int] = None,
+                     reference: str = DEFAULT_BACKEND,
+                     candidate: str = 'pypdfium2',
+                     use_cache: bool = True) -> Dict[str, any]:
+    """
+    Compare page text and chapter detection between two backends.
+
+    Args:
+        pdf_path: Path to the PDF file
+        start_page: Starting page number (0-indexed), None for first page
+        end_page: Ending page number (0-indexed, inclusive), None for last page
+        reference: Backend whose output is treated as correct
+        candidate: Backend being evaluated
+        use_cache: Read through the on-disk page cache
+
+    Returns:
+        Report with a summary, per-page comparisons and the chapter
+        boundaries each backend detects in the range
+    """
+    total_pages = get_page_count(pdf_path, use_cache, reference)
+    start = start_page if start_page is not None else 0
+    end = end_page if end_page is not None else total_pages - 1
+    end = min(end, total_pages - 1)
+    page_nums = range(start, end + 1)
+
+    timings = {}
+    records = {}
+    for name in (reference, candidate):
+        started = time.perf_counter()
+        records[name] = list(_page_records(pdf_path, page_nums, use_cache, name))
+        timings[name] = time.perf_counter() - started
+
+    pages = []
+    for ref_page, cand_page in zip(records[reference], records[candidate]):
+        comparison = compare_page_texts(ref_page['text'], cand_page['text'])
+        comparison['page_number'] = ref_page['page_number']
+        pages.append(comparison)
+
+    ref_boundaries = chapter_boundaries_from_pages(records[reference])
+    cand_boundaries = chapter_boundaries_from_pages(records[candidate])
+
+    summary = summarize_comparison(pages)
+    summary['boundaries_match'] = ref_boundaries == cand_boundaries
+
+    return {
+        'pdf_path': str(pdf_path),
+        'reference': reference,
+        'candidate': candidate,
+        'start_page': start,
+        'end_page': end,
+        'seconds': timings,
+        'summary': summary,
+        'boundaries': {reference: ref_boundaries, candidate: cand_boundaries},
+        'pages': pages
+    }
+
+
+def _find_chapter_candidates(pdf_path: str) -> List[int]:
+    """
+    List pages whose text could contain a chapter marker.
+
+    Uses pypdfium2's text API, which skips pdfplumber's layout analysis and
+    is far cheaper per page, and reads only the top band of each page where
+    the first lines checked for a marker sit. Whitespace is matched loosely
+    because the two libraries space words differently.
+    """
+    candidates = []
+
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        for page_num in range(len(pdf)):
+            page = pdf[page_num]
+            textpage = page.get_textpage()
+            try:
+                page_height = page.get_height()
+                band = textpage.get_text_bounded(
+                    top=page_height, bottom=page_height * (1 - _CHAPTER_HINT_BAND))
+                if _CHAPTER_HINT_PATTERN.search(band):
+                    candidates.append(page_num)
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+    return candidates
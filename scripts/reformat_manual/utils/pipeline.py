@@ -0,0 +1,272 @@
+"""
+Streaming extract -> analyze -> re-flow -> format pipeline for a whole manual.
+
+A reader thread pulls pages from the PDF (through the page-extraction
+process pool) into a bounded queue. The calling thread writes each page to
+its raw chapter file as it arrives and, once a chapter's last page is in,
+hands the chapter to a process pool for heading detection, analysis,
+re-flow and markdown rendering. A full queue blocks the reader and a full pool blocks
+the writer, so memory is bounded by the queue plus the chapters in flight,
+and early chapters are finished while later pages are still being parsed.
+"""
+
+import io
+import time
+import queue
+import threading
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .chapter_scheduler import ChapterTask, plan_chapter_tasks
+from .markdown_renderer import render_markdown
+from .page_template import PageTemplate, strip_page_template
+from .pdf_backends import DEFAULT_BACKEND
+from .pdf_utils import Chapter, get_page_count, iter_chapter_pages
+from .reflow import ReflowWriter, iter_page_lines, reflow
+from .stream_writers import TextPageWriter
+
+
+# Pages buffered between the reader thread and the chapter writer
+PAGE_QUEUE_SIZE = 64
+
+# Finished chapters waiting for or running in the process pool, per worker
+CHAPTERS_IN_FLIGHT_PER_JOB = 2
+
+_END = object()
+
+
+class PipelineResult(NamedTuple):
+    """Outcome of one chapter in run_pipeline."""
+    task: ChapterTask
+    page_count: int
+    seconds: float          # From pipeline start until the chapter's outputs were written
+    heading_count: int = 0
+    analysis: Optional[any] = None   # Return value of the analyze callable
+    error: Optional[str] = None
+    # (PDF page number, first line in the raw chapter file) per page
+    page_lines: Tuple[Tuple[int, int], ...] = ()
+    # ReflowWriter.page_map() of the re-flowed chapter, if re-flowed
+    reflow_page_map: Optional[Dict[str, list]] = None
+
+
+def process_chapter(chapter_name: str, task: ChapterTask, pages: List[Dict[str, any]],
+                    markdown_path: str, analyze: Optional[Callable] = None,
+                    analyze_args: Sequence = (),
+                    reflow_path: Optional[str] = None
+                    ) -> Tuple[int, Optional[any], Optional[Dict[str, list]]]:
+    """
+    Worker entry point: detect headings, analyze, re-flow and render one chapter.
+
+    With reflow_path, the re-flowed chapter is written there and rendered,
+    matching reflow_chapters.py followed by render_markdown.py on the raw
+    file. Without it the raw text is rendered directly. Either way the
+    input is identical to the raw file, since Chapter.full_text is exactly
+    what TextPageWriter wrote.
+
+    Args:
+        chapter_name: Chapter marker, recorded in the analysis
+        task: Chapter being processed
+        pages: The chapter's page records
+        markdown_path: Output file for the rendered markdown
+        analyze: Optional analysis callable taking (Chapter, *analyze_args);
+            must be importable by the worker (a module-level function)
+        analyze_args: Extra arguments for analyze
+        reflow_path: Output file for the re-flowed chapter, or None to
+            skip re-flow
+
+    Returns:
+        (number of detected headings, analysis or None, re-flow page map
+        or None)
+    """
+    chapter = Chapter(chapter_name, task.start_page, task.end_page, pages)
+    analysis = analyze(chapter, *analyze_args) if analyze else None
+
+    text = chapter.full_text
+    page_map = None
+    if reflow_path:
+        reflowed = io.StringIO()
+        writer = ReflowWriter(reflowed)
+        for unit in reflow(iter_page_lines(pages)):
+            writer.write_unit(unit)
+        text = reflowed.getvalue()
+        page_map = writer.page_map()
+
+        Path(reflow_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(reflow_path, 'w', encoding='utf-8') as out:
+            out.write(text)
+
+    Path(markdown_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(markdown_path, 'w', encoding='utf-8') as out:
+        render_markdown(text.split('\n'), out)
+
+    return len(chapter.headings), analysis, page_map
+
+
+def _read_pages(pdf_path: str, chapters: List[Dict[str, any]], pages: queue.Queue,
+                stop: threading.Event, workers: int, use_cache: bool, backend: str,
+                template: Optional[PageTemplate]) -> None:
+    """Reader thread: feed (chapter index, page) pairs, then _END, into the queue."""
+    def put(item) -> bool:
+        # Block while the queue is full, but give up once the writer stops
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        for index, page in iter_chapter_pages(pdf_path, chapters, workers,
+                                              use_cache, backend):
+            if template:
+                stripped = list(strip_page_template([page], template))
+                if not stripped:
+                    continue
+                page = stripped[0]
+            if not put((index, page)):
+                return
+    except Exception as e:
+        put(RuntimeError(f"Page extraction failed: {type(e).__name__}: {e}\n"
+                         f"{traceback.format_exc()}"))
+    put(_END)
+
+
+def run_pipeline(pdf_path: str, chapters: List[Dict[str, any]], raw_dir: Path,
+                 markdown_dir: Path, jobs: int = 1, use_cache: bool = True,
+                 backend: str = DEFAULT_BACKEND,
+                 template: Optional[PageTemplate] = None,
+                 analyze: Optional[Callable] = None, analyze_args: Sequence = (),
+                 on_result: Optional[Callable[[PipelineResult], None]] = None,
+                 queue_size: int = PAGE_QUEUE_SIZE,
+                 reflow_dir: Optional[Path] = None) -> List[PipelineResult]:
+    """
+    Extract, analyze, re-flow and render every chapter in one pass over the PDF.
+
+    Raw chapter files are named as by extract_all_chapters.py (see
+    plan_chapter_tasks) and are byte-identical to its output; re-flowed
+    and markdown files get the same names in reflow_dir and markdown_dir.
+    Page maps of the re-flowed chapters are returned in the results, not
+    written to page_map.json. A chapter failing in the
+    process pool is reported in its result; a failure reading the PDF
+    raises RuntimeError.
+
+    Args:
+        pdf_path: Path to the PDF file
+        chapters: Chapter boundaries as produced by find_chapter_boundaries
+        raw_dir: Directory for the raw chapter files (00_raw)
+        markdown_dir: Directory for the markdown chapters (01_basicreformat)
+        jobs: Worker processes for page extraction and for chapter processing
+        use_cache: Read through the on-disk page cache
+        backend: Extraction backend name (see pdf_backends.BACKENDS)
+        template: Running header/footer lines to strip (see page_template)
+        analyze: Optional per-chapter analysis (see process_chapter)
+        analyze_args: Extra arguments for analyze
+        on_result: Called with each result as soon as its chapter finishes
+        queue_size: Pages buffered between the reader and the writer
+        reflow_dir: Directory for the re-flowed chapters (00_reflow), or
+            None to render the raw text directly
+
+    Returns:
+        Results in boundary order
+    """
+    if not chapters:
+        return []
+
+    started = time.perf_counter()
+    tasks = [task for task, _ in plan_chapter_tasks(chapters, raw_dir)]
+    total_pages = get_page_count(pdf_path, use_cache, backend)
+    last_pages = [min(task.end_page if task.end_page is not None else total_pages - 1,
+                      total_pages - 1)
+                  for task in tasks]
+
+    pages: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+    stop = threading.Event()
+    reader = threading.Thread(
+        target=_read_pages,
+        args=(pdf_path, chapters, pages, stop, jobs, use_cache, backend, template),
+        name='pipeline-reader',
+        daemon=True
+    )
+
+    writers: Dict[int, TextPageWriter] = {}
+    chapter_pages: Dict[int, List[Dict[str, any]]] = {}
+    page_lines: Dict[int, Tuple[Tuple[int, int], ...]] = {}
+    futures = {}
+    results: Dict[int, PipelineResult] = {}
+    max_in_flight = max(1, jobs) * CHAPTERS_IN_FLIGHT_PER_JOB
+
+    def collect(done) -> None:
+        for future in done:
+            index = futures.pop(future)
+            task = tasks[index]
+            try:
+                heading_count, analysis, reflow_page_map = future.result()
+                result = PipelineResult(task, len(page_lines[index]),
+                                        time.perf_counter() - started, heading_count,
+                                        analysis, page_lines=page_lines[index],
+                                        reflow_page_map=reflow_page_map)
+            except Exception as e:
+                result = PipelineResult(task, len(page_lines[index]),
+                                        time.perf_counter() - started,
+                                        error=f"{type(e).__name__}: {e}",
+                                        page_lines=page_lines[index])
+            results[index] = result
+            if on_result:
+                on_result(result)
+
+    def finish(index: int) -> None:
+        writer = writers.pop(index, None) or TextPageWriter(tasks[index].output_path)
+        writer.close()
+        page_lines[index] = tuple(writer.page_lines)
+
+        # Backpressure: wait for a worker before queueing more chapters
+        while len(futures) >= max_in_flight:
+            collect(wait(futures, return_when=FIRST_COMPLETED).done)
+
+        task = tasks[index]
+        name = Path(task.output_path).name
+        future = executor.submit(process_chapter, chapters[index]['chapter_marker'],
+                                 task, chapter_pages.pop(index, []),
+                                 str(Path(markdown_dir) / name), analyze, analyze_args,
+                                 str(Path(reflow_dir) / name) if reflow_dir else None)
+        futures[future] = index
+
+    with ProcessPoolExecutor(max_workers=max(1, jobs)) as executor:
+        reader.start()
+        try:
+            while True:
+                item = pages.get()
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+
+                index, page = item
+                if index not in writers:
+                    writers[index] = TextPageWriter(tasks[index].output_path)
+                    chapter_pages[index] = []
+                writers[index].write_page(page)
+                chapter_pages[index].append(page)
+
+                # Pages arrive in page order, so earlier chapters are complete
+                for open_index in [i for i in writers if last_pages[i] < page['page_number']]:
+                    finish(open_index)
+
+                collect([future for future in futures if future.done()])
+
+            # Remaining open chapters, and chapters without any text
+            for index in range(len(tasks)):
+                if index not in page_lines:
+                    finish(index)
+            while futures:
+                collect(wait(futures, return_when=FIRST_COMPLETED).done)
+        finally:
+            stop.set()
+            for writer in writers.values():
+                writer.close()
+            reader.join()
+
+    return [results[index] for index in range(len(tasks))]
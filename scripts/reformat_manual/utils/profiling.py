@@ -0,0 +1,270 @@
+"""
+Lightweight instrumentation for the extraction and analysis scripts.
+Records per-stage wall time and memory, per-page extraction latency and,
+optionally, a cProfile dump. Disabled profilers cost next to nothing, so
+library code can always report to the active profiler.
+"""
+
+import os
+import sys
+import json
+import time
+import cProfile
+import pstats
+import resource
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# Set to "1" (or "basic") for timings, "cprofile" to also dump cProfile stats
+PROFILE_ENV = 'EL_PROFILE'
+
+PROFILE_MODES = ('basic', 'cprofile')
+
+
+def _peak_rss_kb() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports KiB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _current_rss_kb() -> Optional[int]:
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class Profiler:
+    """
+    Collects stage timings and page latencies for one run.
+
+    Args:
+        mode: None (disabled), 'basic' or 'cprofile'
+    """
+
+    def __init__(self, mode: Optional[str] = None):
+        self.mode = mode
+        self.enabled = mode is not None
+        self.stages: Dict[str, Dict[str, any]] = {}
+        self.pages: List[Dict[str, any]] = []
+        self._cprofile = None
+        self._started = None
+        self._total_seconds = None
+
+    def start(self) -> None:
+        """Start the run clock (and cProfile in 'cprofile' mode)."""
+        if not self.enabled:
+            return
+        self._started = time.perf_counter()
+        if self.mode == 'cprofile':
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stop(self) -> None:
+        """Stop the run clock and cProfile."""
+        if not self.enabled or self._started is None:
+            return
+        if self._cprofile:
+            self._cprofile.disable()
+        self._total_seconds = time.perf_counter() - self._started
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time a block as part of a named stage.
+
+        Repeated blocks with the same name accumulate (e.g. per-page
+        heading detection), so the summary shows total time and call count.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        rss_before = _current_rss_kb()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            rss_after = _current_rss_kb()
+
+            stage = self.stages.setdefault(name, {
+                'calls': 0,
+                'seconds': 0.0,
+                'rss_delta_kb': 0
+            })
+            stage['calls'] += 1
+            stage['seconds'] += elapsed
+            if rss_before is not None and rss_after is not None:
+                stage['rss_delta_kb'] += rss_after - rss_before
+            stage['peak_rss_kb'] = _peak_rss_kb()
+
+    def timed_iter(self, name: str, iterable):
+        """Yield from iterable, charging the time spent producing items to a stage."""
+        if not self.enabled:
+            yield from iterable
+            return
+
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def record_page(self, page_number: int, seconds: float, cached: bool) -> None:
+        """Record the latency of reading one page."""
+        if self.enabled:
+            self.pages.append({
+                'page_number': page_number,
+                'seconds': seconds,
+                'cached': cached
+            })
+
+    def merge_pages(self, pages: List[Dict[str, any]]) -> None:
+        """Add page latencies recorded in a worker process."""
+        if self.enabled:
+            self.pages.extend(pages)
+
+    def summary(self, top_n: int = 10) -> Dict[str, any]:
+        """
+        Build the machine-readable run summary.
+
+        Args:
+            top_n: Number of slowest pages (and cProfile functions) to list
+
+        Returns:
+            Dictionary with stages, page latency statistics and the slowest pages
+        """
+        extracted = [page for page in self.pages if not page['cached']]
+        page_seconds = [page['seconds'] for page in self.pages]
+
+        summary = {
+            'mode': self.mode,
+            'total_seconds': self._total_seconds,
+            'peak_rss_kb': _peak_rss_kb(),
+            'stages': dict(sorted(self.stages.items(),
+                                  key=lambda item: item[1]['seconds'],
+                                  reverse=True)),
+            'pages': {
+                'count': len(self.pages),
+                'extracted': len(extracted),
+                'cached': len(self.pages) - len(extracted),
+                'total_seconds': sum(page_seconds),
+                'mean_seconds': sum(page_seconds) / len(page_seconds) if page_seconds else None,
+                'max_seconds': max(page_seconds) if page_seconds else None,
+                'slowest': sorted(self.pages, key=lambda page: page['seconds'],
+                                  reverse=True)[:top_n]
+            },
+            'page_latencies': sorted(self.pages, key=lambda page: page['page_number'])
+        }
+
+        if self._cprofile:
+            stats = pstats.Stats(self._cprofile)
+            ranked = sorted(stats.stats.items(), key=lambda item: item[1][3],
+                            reverse=True)[:top_n]
+            summary['cprofile_top'] = [{
+                'function': f"{func[0]}:{func[1]}({func[2]})",
+                'calls': calls,
+                'total_seconds': total,
+                'cumulative_seconds': cumulative
+            } for func, (_, calls, total, cumulative, _) in ranked]
+
+        return summary
+
+    def write(self, path: str, top_n: int = 10) -> Path:
+        """
+        Write the summary JSON (and a .prof file in 'cprofile' mode).
+
+        Args:
+            path: Summary file path
+            top_n: Number of slowest pages to list
+
+        Returns:
+            Path of the summary file
+        """
+        output_path = Path(path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        summary = self.summary(top_n)
+        if self._cprofile:
+            prof_path = output_path.with_suffix('.prof')
+            self._cprofile.dump_stats(str(prof_path))
+            summary['cprofile_dump'] = str(prof_path)
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+
+        return output_path
+
+    def print_summary(self, top_n: int = 5) -> None:
+        """Print the slowest stages and pages."""
+        summary = self.summary(top_n)
+        print("\n=== PROFILE ===")
+        if summary['total_seconds'] is not None:
+            print(f"Total: {summary['total_seconds']:.3f}s, "
+                  f"peak RSS {summary['peak_rss_kb'] / 1024:.1f} MiB")
+        for name, stage in list(summary['stages'].items())[:top_n]:
+            print(f"  {name}: {stage['seconds']:.3f}s over {stage['calls']} call(s)")
+        pages = summary['pages']
+        if pages['count']:
+            print(f"Pages: {pages['count']} ({pages['cached']} cached), "
+                  f"mean {pages['mean_seconds'] * 1000:.1f} ms")
+            for page in pages['slowest']:
+                print(f"  page {page['page_number']}: {page['seconds'] * 1000:.1f} ms")
+
+
+_active = Profiler()
+
+
+def get_profiler() -> Profiler:
+    """Return the active profiler (a disabled one unless profiling is on)."""
+    return _active
+
+
+def enable_profiling(mode: Optional[str]) -> Profiler:
+    """
+    Install a new active profiler.
+
+    Args:
+        mode: None (disabled), 'basic' or 'cprofile'
+
+    Returns:
+        The new active profiler
+    """
+    global _active
+    _active = Profiler(mode)
+    return _active
+
+
+def resolve_profile_mode(flag: Optional[str]) -> Optional[str]:
+    """
+    Combine the --profile flag with the EL_PROFILE environment variable.
+
+    Args:
+        flag: Value of --profile (None when not given)
+
+    Returns:
+        'basic', 'cprofile' or None
+    """
+    if flag:
+        return flag
+
+    value = os.environ.get(PROFILE_ENV, '').strip().lower()
+    if value in ('', '0', 'false', 'no'):
+        return None
+    return 'cprofile' if value == 'cprofile' else 'basic'
+
+
+def profile_path_for(output: Optional[str], default: str) -> str:
+    """Return the summary path next to an output file (or the default)."""
+    if not output:
+        return default
+    output_path = Path(output)
+    return str(output_path.with_name(output_path.stem + '.profile.json'))
@@ -0,0 +1,236 @@
+"""
+Cross-page re-flow of raw chapter text.
+
+PDF text comes out hard-wrapped, one page at a time, so a paragraph or list
+item that wraps (or runs over a page break) is split over several lines.
+reflow() joins those lines back into one line per heading, list item or
+paragraph. It looks at one line at a time and holds only the unit being
+built, so chapter length does not matter. Each unit keeps the PDF page it
+starts on and the offsets where later pages begin inside it.
+"""
+
+import re
+import json
+from bisect import bisect_right
+from pathlib import Path
+from typing import (Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence,
+                    TextIO, Tuple)
+
+from .line_classifier import BULLET_PATTERN, NUMBERED_LIST_PATTERN, heading_level
+from .markdown_renderer import FOOTER_PATTERN, PAGE_MARKER_PATTERN
+from .page_cache import atomic_write
+
+
+# Lettered items ("a. Blanket Pull"), which would otherwise look like a
+# lower-case continuation
+LETTERED_ITEM_PATTERN = re.compile(r'^[a-z][\.\)]\s+[A-Z]')
+
+# Lines that end a sentence or introduce what follows
+TERMINAL_PUNCTUATION = ('.', '!', '?', ':', ';', '”', '"', ')')
+
+# A wrapped line fills at least this share of the widest line seen so far
+FULL_LINE_RATIO = 0.8
+
+# Wrap width assumed until wider lines have been seen
+MIN_WRAP_WIDTH = 60
+
+# Per-chapter page maps, next to the re-flowed chapters
+PAGE_MAP_FILENAME = 'page_map.json'
+
+
+class ReflowUnit(NamedTuple):
+    """One re-flowed heading, list item or paragraph."""
+    kind: str                                   # 'heading', 'bullet', 'numbered' or 'paragraph'
+    text: str                                   # Joined text, no newlines
+    page_number: Optional[int]                  # PDF page the unit starts on
+    page_breaks: Tuple[Tuple[int, int], ...]    # (offset in text, page) where later pages start
+
+
+def line_kind(line: str) -> str:
+    """Block kind a stripped line starts: heading, bullet, numbered or paragraph."""
+    if heading_level(line) is not None:
+        return 'heading'
+    if BULLET_PATTERN.match(line):
+        return 'bullet'
+    if NUMBERED_LIST_PATTERN.match(line) or LETTERED_ITEM_PATTERN.match(line):
+        return 'numbered'
+    return 'paragraph'
+
+
+def skip_page_markers(line: str) -> bool:
+    """True for 'Page X of XX' markers and manual footers."""
+    return bool(PAGE_MARKER_PATTERN.search(line) or FOOTER_PATTERN.match(line))
+
+
+def reflow(lines: Iterable[Tuple[Optional[int], str]],
+           skip: Optional[Callable[[str], bool]] = skip_page_markers) -> Iterator[ReflowUnit]:
+    """
+    Join wrapped lines into units, across blank lines and page breaks.
+
+    A line continues the current list item or paragraph when it does not
+    start a block (heading, bullet, numbered or lettered item) and either starts in
+    lower case, follows a line ending in a hyphen or comma, or follows a
+    full-width line without closing punctuation. Hyphens are kept
+    ("diaper-\\nchanging" becomes "diaper-changing").
+
+    Args:
+        lines: (PDF page number or None, line) pairs in reading order
+        skip: Predicate for lines to drop before re-flowing (page markers
+            and footers by default, since they would split units); None
+            keeps every line
+
+    Yields:
+        ReflowUnit per heading, list item or paragraph
+    """
+    kind = None
+    parts: List[str] = []
+    length = 0
+    page_number = None
+    current_page = None
+    page_breaks: List[Tuple[int, int]] = []
+    wrap_width = MIN_WRAP_WIDTH
+    previous = ''
+
+    for line_page, line in lines:
+        stripped = line.strip()
+        if not stripped or (skip and skip(stripped)):
+            continue
+
+        new_kind = line_kind(stripped)
+        continues = (
+            kind is not None and kind != 'heading' and new_kind == 'paragraph'
+            and (stripped[0].islower()
+                 or previous.endswith(('-', ','))
+                 or (len(previous) >= FULL_LINE_RATIO * wrap_width
+                     and not previous.endswith(TERMINAL_PUNCTUATION)))
+        )
+        wrap_width = max(wrap_width, len(stripped))
+
+        if continues:
+            joiner = '' if previous.endswith('-') else ' '
+            if line_page is not None and line_page != current_page:
+                page_breaks.append((length + len(joiner), line_page))
+                current_page = line_page
+            parts.append(joiner + stripped)
+            length += len(joiner) + len(stripped)
+        else:
+            if kind is not None:
+                yield ReflowUnit(kind, ''.join(parts), page_number, tuple(page_breaks))
+            kind = new_kind
+            parts = [stripped]
+            length = len(stripped)
+            page_number = current_page = line_page
+            page_breaks = []
+
+        previous = stripped
+
+    if kind is not None:
+        yield ReflowUnit(kind, ''.join(parts), page_number, tuple(page_breaks))
+
+
+def iter_chapter_lines(f: TextIO,
+                       page_lines: Sequence[Sequence[int]] = ()) -> Iterator[Tuple[Optional[int], str]]:
+    """
+    Pair each line of a 00_raw chapter file with its PDF page.
+
+    Args:
+        f: Open chapter file
+        page_lines: (PDF page number, first line) pairs from the build
+            manifest; pages are None without them
+    """
+    starts = [start for _, start in page_lines]
+    for line_num, line in enumerate(f):
+        index = bisect_right(starts, line_num) - 1
+        yield (page_lines[index][0] if index >= 0 else None), line.rstrip('\n')
+
+
+def iter_page_lines(pages: Iterable[dict]) -> Iterator[Tuple[Optional[int], str]]:
+    """Pair each line of streamed page records with its page number."""
+    for page in pages:
+        for line in page['text'].split('\n'):
+            yield page['page_number'], line
+
+
+class ReflowWriter:
+    """
+    Write re-flowed units to a text file, one unit per line.
+
+    Paragraphs are preceded by a blank line so consecutive paragraphs stay
+    apart; list items and headings follow each other directly.
+
+    page_lines records (page, line) for the first unit starting on each
+    page, so every line maps to the page it starts on, and page_offsets records (page, character offset) wherever a page's
+    text begins, including inside units that run over a page break.
+
+    Args:
+        out: Text stream receiving the re-flowed text
+    """
+
+    def __init__(self, out: TextIO):
+        self.out = out
+        self.unit_count = 0
+        self.page_lines: List[Tuple[int, int]] = []
+        self.page_offsets: List[Tuple[int, int]] = []
+        self._line = 0
+        self._offset = 0
+        self._page = None
+
+    def _mark_page(self, page: Optional[int], offset: int) -> None:
+        if page is not None and page != self._page:
+            self.page_offsets.append((page, offset))
+            self._page = page
+
+    def write_unit(self, unit: ReflowUnit) -> None:
+        """Write one unit and extend the page maps."""
+        if self.unit_count and unit.kind == 'paragraph':
+            self.out.write('\n')
+            self._line += 1
+            self._offset += 1
+
+        if unit.page_number is not None and (not self.page_lines
+                                             or self.page_lines[-1][0] != unit.page_number):
+            self.page_lines.append((unit.page_number, self._line))
+        self._mark_page(unit.page_number, self._offset)
+        for offset, page in unit.page_breaks:
+            self._mark_page(page, self._offset + offset)
+
+        self.out.write(unit.text)
+        self.out.write('\n')
+        self._line += 1
+        self._offset += len(unit.text) + 1
+        self.unit_count += 1
+
+    def page_for_offset(self, offset: int) -> Optional[int]:
+        """PDF page of a character offset in the written text."""
+        index = bisect_right([start for _, start in self.page_offsets], offset) - 1
+        return self.page_offsets[index][0] if index >= 0 else None
+
+    def page_map(self) -> Dict[str, list]:
+        """The page maps as stored in page_map.json."""
+        return {
+            'page_lines': [list(pair) for pair in self.page_lines],
+            'page_offsets': [list(pair) for pair in self.page_offsets]
+        }
+
+
+def update_page_map(output_dir: Path, entries: Dict[str, Dict[str, list]]) -> None:
+    """
+    Merge chapter page maps into output_dir/page_map.json.
+
+    Entries for other chapters are kept, so re-flowing some chapters does
+    not drop the rest. The file is replaced atomically.
+
+    Args:
+        output_dir: Directory of the re-flowed chapters
+        entries: Chapter file name -> ReflowWriter.page_map()
+    """
+    path = Path(output_dir) / PAGE_MAP_FILENAME
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            page_map = json.load(f)
+    except (OSError, ValueError):
+        page_map = {}
+    page_map.update(entries)
+
+    with atomic_write(path) as f:
+        json.dump(page_map, f, indent=2, sort_keys=True)
@@ -0,0 +1,307 @@
+"""
+Page-level diff between two versions of a manual.
+Every page's extracted text is hashed, the two hash sequences are aligned
+with difflib, and the result is reported as changed, inserted and deleted
+pages plus an old -> new page map used to shift chapter boundaries.
+Running headers and footers are stripped before hashing: their page
+counters would otherwise change every page after an inserted one.
+"""
+
+import hashlib
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, Iterator, List, Optional
+
+from .page_template import PageTemplate
+from .pdf_backends import DEFAULT_BACKEND
+from .pdf_utils import (
+    chapter_boundaries_from_pages,
+    get_page_count,
+    iter_page_records
+)
+
+
+def hash_page_text(text: str, template: Optional[PageTemplate] = None) -> str:
+    """
+    Hash a page's text, ignoring trailing whitespace on each line.
+
+    Args:
+        text: Page text
+        template: Running header/footer lines to leave out of the hash
+    """
+    if template:
+        text = template.strip(text)
+    normalized = '\n'.join(line.rstrip() for line in text.strip().split('\n'))
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def marker_key(marker: str) -> str:
+    """
+    Chapter marker with all whitespace removed.
+
+    Boundaries may come from another backend than the one used for hashing,
+    and pdfplumber and pypdfium2 space words differently.
+    """
+    return ''.join(marker.split())
+
+
+def page_hashes(pdf_path: str, workers: int = 1, use_cache: bool = True,
+                backend: str = 'pypdfium2',
+                strip_template: bool = True) -> List[Dict[str, any]]:
+    """
+    Hash every page of a PDF (empty pages included).
+
+    Args:
+        pdf_path: Path to the PDF file
+        workers: Number of worker processes (see extract_text_by_page)
+        use_cache: Read through the on-disk page cache
+        backend: Extraction backend used for hashing
+        strip_template: Learn the PDF's running headers and footers from the
+            extracted pages and hash each page without them
+
+    Returns:
+        One {'page_number', 'hash', 'text'} record per page, in page order
+    """
+    page_nums = range(get_page_count(pdf_path, use_cache, backend))
+    records = list(iter_page_records(pdf_path, page_nums, workers, use_cache, backend))
+    template = PageTemplate.learn(records) if strip_template else None
+    return [{
+        'page_number': record['page_number'],
+        'hash': hash_page_text(record['text'], template),
+        'text': record['text']
+    } for record in records]
+
+
+def align_pages(old: List[Dict[str, any]], new: List[Dict[str, any]]) -> Dict[str, any]:
+    """
+    Align two page-hash sequences.
+
+    Args:
+        old: page_hashes() of the old version
+        new: page_hashes() of the new version
+
+    Returns:
+        Dictionary with 'changed' ([old, new] page pairs), 'inserted' and
+        'deleted' page lists, 'page_map' (old page -> new page for
+        unchanged and changed pages) and the raw 'opcodes'
+    """
+    matcher = SequenceMatcher(None, [page['hash'] for page in old],
+                              [page['hash'] for page in new], autojunk=False)
+
+    changed, inserted, deleted = [], [], []
+    page_map: Dict[int, int] = {}
+    opcodes = []
+    unchanged = 0
+
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        opcodes.append({
+            'op': tag,
+            'old_pages': [old[i1]['page_number'], old[i2 - 1]['page_number']] if i2 > i1 else None,
+            'new_pages': [new[j1]['page_number'], new[j2 - 1]['page_number']] if j2 > j1 else None
+        })
+
+        if tag == 'equal':
+            unchanged += i2 - i1
+            for offset in range(i2 - i1):
+                page_map[old[i1 + offset]['page_number']] = new[j1 + offset]['page_number']
+        elif tag == 'delete':
+            deleted.extend(page['page_number'] for page in old[i1:i2])
+        elif tag == 'insert':
+            inserted.extend(page['page_number'] for page in new[j1:j2])
+        else:
+            # Pair pages up in order; any surplus is an insert or delete
+            pairs = min(i2 - i1, j2 - j1)
+            for offset in range(pairs):
+                old_page = old[i1 + offset]['page_number']
+                new_page = new[j1 + offset]['page_number']
+                changed.append([old_page, new_page])
+                page_map[old_page] = new_page
+            deleted.extend(page['page_number'] for page in old[i1 + pairs:i2])
+            inserted.extend(page['page_number'] for page in new[j1 + pairs:j2])
+
+    return {
+        'changed': changed,
+        'inserted': inserted,
+        'deleted': deleted,
+        'page_map': page_map,
+        'opcodes': opcodes,
+        'unchanged_pages': unchanged
+    }
+
+
+def _map_page(page: int, page_map: Dict[int, int], old_count: int) -> Optional[int]:
+    """Map an old page to the new version, moving forward past deleted pages."""
+    for candidate in range(page, old_count):
+        if candidate in page_map:
+            return page_map[candidate]
+    return None
+
+
+def shift_boundaries(boundaries: List[Dict[str, any]], alignment: Dict[str, any],
+                     old_page_count: int,
+                     detected: Optional[List[Dict[str, any]]] = None) -> List[Dict[str, any]]:
+    """
+    Report how each chapter boundary moves in the new version.
+
+    Args:
+        boundaries: chapter_boundaries.json entries for the old version
+        alignment: Result of align_pages()
+        old_page_count: Number of pages in the old version
+        detected: Boundaries detected in the new version; a chapter whose
+            marker is found there uses the detected page. A marker that
+            appears several times (e.g. a chapter split in two parts) is
+            matched by occurrence order
+
+    Returns:
+        One entry per old boundary with 'status' ('unchanged', 'shifted',
+        'content_changed' or 'removed'), old and new start pages and the
+        changed and deleted (old numbering) and inserted (new numbering)
+        pages that fall inside the chapter
+    """
+    page_map = alignment['page_map']
+    changed_old = {old for old, _ in alignment['changed']}
+    detected_pages = defaultdict(list)
+    for entry in detected or []:
+        detected_pages[marker_key(entry['chapter_marker'])].append(entry['page_number'])
+    occurrences = Counter()
+
+    new_starts = []
+    for boundary in boundaries:
+        key = marker_key(boundary['chapter_marker'])
+        pages = detected_pages.get(key, [])
+        new_start = pages[occurrences[key]] if occurrences[key] < len(pages) else None
+        occurrences[key] += 1
+        if new_start is None:
+            new_start = _map_page(boundary['page_number'], page_map, old_page_count)
+        new_starts.append(new_start)
+
+    report = []
+    for i, boundary in enumerate(boundaries):
+        start = boundary['page_number']
+        end = boundary['end_page'] if boundary['end_page'] is not None else old_page_count - 1
+        pages = range(start, end + 1)
+
+        new_start = new_starts[i]
+        new_next = next((page for page in new_starts[i + 1:] if page is not None), None)
+        new_end = new_next - 1 if new_next is not None else None
+
+        # Inserted pages that land inside the chapter's new page range
+        inserted = [page for page in alignment['inserted']
+                    if new_start is not None and page >= new_start
+                    and (new_end is None or page <= new_end)]
+
+        entry = {
+            'chapter_marker': boundary['chapter_marker'],
+            'old_page_number': start,
+            'new_page_number': new_start,
+            'old_end_page': boundary['end_page'],
+            'new_end_page': new_end,
+            'changed_old_pages': [page for page in pages if page in changed_old],
+            'deleted_old_pages': [page for page in alignment['deleted'] if page in pages],
+            'inserted_new_pages': inserted
+        }
+
+        if new_start is None:
+            entry['status'] = 'removed'
+        elif new_start != start or new_end != boundary['end_page']:
+            entry['status'] = 'shifted'
+        elif entry['changed_old_pages'] or entry['deleted_old_pages'] or inserted:
+            entry['status'] = 'content_changed'
+        else:
+            entry['status'] = 'unchanged'
+
+        report.append(entry)
+
+    return report
+
+
+def added_chapters(boundaries: List[Dict[str, any]],
+                   detected: List[Dict[str, any]]) -> List[Dict[str, any]]:
+    """
+    Detected boundaries with no counterpart in the old boundaries.
+
+    Markers are counted by occurrence, so a second "CHAPTER 5" part is new
+    only if the old version had a single one.
+    """
+    old_counts = Counter(marker_key(boundary['chapter_marker']) for boundary in boundaries)
+    seen = Counter()
+    added = []
+    for entry in detected:
+        key = marker_key(entry['chapter_marker'])
+        seen[key] += 1
+        if seen[key] > old_counts[key]:
+            added.append(entry)
+    return added
+
+
+def diff_versions(old_pdf: str, new_pdf: str,
+                  boundaries: Optional[List[Dict[str, any]]] = None,
+                  workers: int = 1, use_cache: bool = True,
+                  backend: str = 'pypdfium2') -> Dict[str, any]:
+    """
+    Diff two versions of a manual page by page.
+
+    Args:
+        old_pdf: Path to the old version
+        new_pdf: Path to the new version
+        boundaries: Old chapter boundaries; detected from the old PDF if None
+        workers: Number of worker processes for hashing
+        use_cache: Read through the on-disk page cache
+        backend: Extraction backend used for hashing
+
+    Returns:
+        Report with page counts, the alignment, per-chapter boundary
+        shifts and the chapters detected in the new version
+    """
+    old = page_hashes(old_pdf, workers, use_cache, backend)
+    new = page_hashes(new_pdf, workers, use_cache, backend)
+
+    if boundaries is None:
+        boundaries = chapter_boundaries_from_pages(old)
+    detected = chapter_boundaries_from_pages(new)
+
+    alignment = align_pages(old, new)
+    chapters = shift_boundaries(boundaries, alignment, len(old), detected)
+
+    return {
+        'old_pdf': str(old_pdf),
+        'new_pdf': str(new_pdf),
+        'hash_backend': backend,
+        'old_page_count': len(old),
+        'new_page_count': len(new),
+        'unchanged_pages': alignment['unchanged_pages'],
+        'changed_pages': alignment['changed'],
+        'inserted_pages': alignment['inserted'],
+        'deleted_pages': alignment['deleted'],
+        'opcodes': alignment['opcodes'],
+        'page_map': {str(old_page): new_page
+                     for old_page, new_page in sorted(alignment['page_map'].items())},
+        'chapters': chapters,
+        'added_chapters': added_chapters(boundaries, detected),
+        'new_boundaries': detected
+    }
+
+
+def pages_to_update(report: Dict[str, any]) -> List[int]:
+    """New-version page numbers that are changed or inserted, in page order."""
+    return sorted({new for _, new in report['changed_pages']} | set(report['inserted_pages']))
+
+
+def extract_changed_pages(pdf_path: str, report: Dict[str, any], workers: int = 1,
+                          use_cache: bool = True,
+                          backend: str = DEFAULT_BACKEND) -> Iterator[Dict[str, any]]:
+    """
+    Re-extract only the changed and inserted pages of the new version.
+
+    Args:
+        pdf_path: Path to the new version
+        report: Result of diff_versions()
+        workers: Number of worker processes
+        use_cache: Read through the on-disk page cache
+        backend: Extraction backend for the output text
+
+    Yields:
+        Page records (as from iter_pages, empty pages included)
+    """
+    yield from iter_page_records(pdf_path, pages_to_update(report), workers,
+                                  use_cache, backend)
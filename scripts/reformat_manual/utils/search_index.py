@@ -0,0 +1,218 @@
+"""
+Inverted full-text index over extracted chapter files.
+
+Each chapter file gets its own JSON shard (term -> line numbers) keyed by
+the file's hash, so re-extracting one chapter only re-indexes that
+chapter. Hits map back to PDF page numbers through the per-page line
+starts recorded in the build manifest.
+"""
+
+import os
+import re
+import json
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .build_manifest import MANIFEST_FILENAME, BuildManifest, output_hash
+from .page_cache import atomic_write
+
+
+INDEX_FORMAT = 1
+
+# Bracket pairs used in the manual (see UNICODE_BRACKETS in analyze_template.py)
+BRACKET_PAIRS = [('˹', '˺'), ('〔', '〕'), ('【', '】'), ('「', '」')]
+
+_BRACKET_CHARS = ''.join(left + right for left, right in BRACKET_PAIRS)
+_WORD_PATTERN = re.compile(r'\w+')
+_BRACKET_PHRASE_PATTERN = re.compile('|'.join(
+    f"{re.escape(left)}[^{re.escape(_BRACKET_CHARS)}\\n]{{1,120}}{re.escape(right)}"
+    for left, right in BRACKET_PAIRS
+))
+_BRACKET_CHAR_PATTERN = re.compile(f"[{re.escape(_BRACKET_CHARS)}]")
+
+
+def tokenize(text: str) -> Set[str]:
+    """
+    Split a line into index terms.
+
+    Terms are lowercased words, whole bracketed phrases (e.g. '〔note〕',
+    with the inner text lowercased) and the bracket characters themselves.
+    """
+    lowered = text.lower()
+    terms = set(_WORD_PATTERN.findall(lowered))
+    terms.update(_BRACKET_PHRASE_PATTERN.findall(lowered))
+    terms.update(_BRACKET_CHAR_PATTERN.findall(lowered))
+    return terms
+
+
+def index_chapter(path: Path, page_lines: Iterable[Iterable[int]] = ()) -> Dict[str, any]:
+    """
+    Build the index shard for one chapter file.
+
+    Args:
+        path: Chapter text file
+        page_lines: (PDF page number, first line) pairs from the build manifest
+
+    Returns:
+        Shard dictionary with the file hash, page map and term postings
+    """
+    terms: Dict[str, List[int]] = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_num, line in enumerate(f):
+            for term in tokenize(line):
+                terms.setdefault(term, []).append(line_num)
+
+    return {
+        'format': INDEX_FORMAT,
+        'chapter': path.name,
+        'output_hash': output_hash(path),
+        'page_lines': [list(pair) for pair in page_lines],
+        'terms': terms
+    }
+
+
+class SearchIndex:
+    """
+    Directory of per-chapter index shards.
+
+    Args:
+        index_dir: Directory holding <chapter file name>.json shards
+    """
+
+    def __init__(self, index_dir: str):
+        self.index_dir = Path(index_dir)
+        self.shards: Dict[str, Dict[str, any]] = {}
+        self._page_starts: Dict[str, List[int]] = {}
+
+        if self.index_dir.exists():
+            for shard_path in sorted(self.index_dir.glob('*.json')):
+                try:
+                    with open(shard_path, 'r', encoding='utf-8') as f:
+                        shard = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if shard.get('format') == INDEX_FORMAT:
+                    self.shards[shard['chapter']] = shard
+
+    def _shard_path(self, chapter: str) -> Path:
+        return self.index_dir / f"{chapter}.json"
+
+    def _write_shard(self, shard: Dict[str, any]) -> None:
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        with atomic_write(self._shard_path(shard['chapter'])) as f:
+            json.dump(shard, f, ensure_ascii=False, separators=(',', ':'))
+
+    def update(self, chapters_dir: str, force: bool = False) -> Tuple[List[str], List[str]]:
+        """
+        Bring the index in line with the chapter files.
+
+        Only chapters whose file hash changed are re-indexed; shards for
+        deleted chapter files are removed.
+
+        Args:
+            chapters_dir: Directory of chapter_*.md files (and the build manifest)
+            force: Re-index every chapter
+
+        Returns:
+            (re-indexed chapter names, removed chapter names)
+        """
+        chapters_dir = Path(chapters_dir)
+        manifest = BuildManifest(chapters_dir / MANIFEST_FILENAME)
+        paths = {path.name: path for path in sorted(chapters_dir.glob('chapter_*.md'))}
+
+        updated = []
+        for name, path in paths.items():
+            shard = self.shards.get(name)
+            entry = manifest.get(name) or {}
+            page_lines = entry.get('page_lines', [])
+            if (not force and shard and shard['output_hash'] == output_hash(path)
+                    and shard['page_lines'] == page_lines):
+                continue
+
+            shard = index_chapter(path, page_lines)
+            self._write_shard(shard)
+            self.shards[name] = shard
+            self._page_starts.pop(name, None)
+            updated.append(name)
+
+        removed = [name for name in self.shards if name not in paths]
+        for name in removed:
+            del self.shards[name]
+            self._page_starts.pop(name, None)
+            try:
+                os.unlink(self._shard_path(name))
+            except OSError:
+                pass
+
+        return updated, removed
+
+    def _postings(self, term: str) -> Dict[str, Set[int]]:
+        """Chapter -> line numbers for a term; 'prefix*' matches any term with that prefix."""
+        postings: Dict[str, Set[int]] = {}
+        if term.endswith('*') and len(term) > 1:
+            prefix = term[:-1]
+            for name, shard in self.shards.items():
+                for candidate, lines in shard['terms'].items():
+                    if candidate.startswith(prefix):
+                        postings.setdefault(name, set()).update(lines)
+        else:
+            for name, shard in self.shards.items():
+                lines = shard['terms'].get(term)
+                if lines:
+                    postings[name] = set(lines)
+        return postings
+
+    def page_for_line(self, chapter: str, line_num: int) -> Optional[int]:
+        """PDF page number of a line in a chapter file, if the page map is known."""
+        page_lines = self.shards[chapter]['page_lines']
+        if not page_lines:
+            return None
+        if chapter not in self._page_starts:
+            self._page_starts[chapter] = [start for _, start in page_lines]
+        index = bisect_right(self._page_starts[chapter], line_num) - 1
+        return page_lines[max(index, 0)][0]
+
+    def search(self, query: str, any_term: bool = False) -> List[Dict[str, any]]:
+        """
+        Find lines matching a query.
+
+        Args:
+            query: Words and/or bracketed phrases; a trailing '*' on a word
+                matches by prefix
+            any_term: Match lines with any query term instead of all of them
+
+        Returns:
+            Hits sorted by chapter and line, each with 'chapter', 'line'
+            (0-indexed line in the chapter file) and 'page_number'
+        """
+        terms = [term for term in tokenize(query) if term]
+        terms += [word.lower() for word in query.split()
+                  if word.endswith('*') and len(word) > 1]
+        # Prefix words also tokenize to their stem; keep only the prefix form
+        prefixes = {term[:-1] for term in terms if term.endswith('*')}
+        terms = sorted(set(term for term in terms if term not in prefixes))
+        if not terms:
+            return []
+
+        matched: Optional[Dict[str, Set[int]]] = None
+        for term in terms:
+            postings = self._postings(term)
+            if matched is None:
+                matched = postings
+            elif any_term:
+                for name, lines in postings.items():
+                    matched.setdefault(name, set()).update(lines)
+            else:
+                matched = {name: lines & postings[name]
+                           for name, lines in matched.items() if name in postings}
+
+        hits = []
+        for name in sorted(matched or {}):
+            for line_num in sorted(matched[name]):
+                hits.append({
+                    'chapter': name,
+                    'line': line_num,
+                    'page_number': self.page_for_line(name, line_num)
+                })
+        return hits
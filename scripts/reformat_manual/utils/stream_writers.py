@@ -0,0 +1,219 @@
+"""
+Streaming writers that write extracted pages to disk as they are produced.
+Output is byte-identical to serializing the fully built in-memory result,
+but only the current page is held in memory.
+"""
+
+import gzip
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from .pdf_utils import detect_headings, preserve_unicode
+
+
+def _dumps(obj, level: int) -> str:
+    """Serialize obj as json.dump(indent=2) would when nested at `level` spaces."""
+    text = json.dumps(obj, indent=2, ensure_ascii=False)
+    return text.replace('\n', '\n' + ' ' * level)
+
+
+def open_output(path: str, compress: bool = False) -> TextIO:
+    """Open a UTF-8 text file for writing (creating parents), gzipped if requested."""
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if compress:
+        return gzip.open(output_path, 'wt', encoding='utf-8')
+    return open(output_path, 'w', encoding='utf-8')
+
+
+class JSONArrayWriter:
+    """
+    Incrementally write a JSON array in json.dump(indent=2) layout.
+
+    Args:
+        f: Open text file to write to
+        level: Indentation of the array items, in spaces
+    """
+
+    def __init__(self, f: TextIO, level: int = 2):
+        self.f = f
+        self.level = level
+        self.count = 0
+
+    def write(self, item) -> None:
+        """Append one item to the array."""
+        self.f.write('[\n' if self.count == 0 else ',\n')
+        self.f.write(' ' * self.level + _dumps(item, self.level))
+        self.count += 1
+
+    def close(self) -> None:
+        """Terminate the array."""
+        if self.count == 0:
+            self.f.write('[]')
+        else:
+            self.f.write('\n' + ' ' * (self.level - 2) + ']')
+
+
+class TextPageWriter:
+    """
+    Write page texts to a text file as they arrive.
+
+    Args:
+        path: Output file path
+        separator: Text placed between pages
+        trailing: If True, the separator also follows the last page
+            (extract_chapter's full_text layout); if False, pages are
+            joined like separator.join(...)
+
+    page_lines records (page number, first line index) for every page
+    written, so line positions in the file can be mapped back to PDF pages.
+    """
+
+    def __init__(self, path: str, separator: str = "\n\n", trailing: bool = True):
+        self.path = Path(path)
+        self.separator = separator
+        self.trailing = trailing
+        self.page_count = 0
+        self.page_lines: List[Tuple[int, int]] = []
+        self._line = 0
+        self._separator_lines = separator.count('\n')
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(self.path, 'w', encoding='utf-8')
+
+    def write_page(self, page: Dict[str, any]) -> None:
+        """Write one page's text."""
+        text = preserve_unicode(page['text'])
+        if self.page_count and not self.trailing:
+            self._f.write(self.separator)
+            self._line += self._separator_lines
+        self.page_lines.append((page['page_number'], self._line))
+        self._f.write(text)
+        self._line += text.count('\n')
+        if self.trailing:
+            self._f.write(self.separator)
+            self._line += self._separator_lines
+        self.page_count += 1
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PageListJSONWriter:
+    """
+    Write page dictionaries as a JSON array, one page at a time.
+
+    Produces the same file as json.dump(pages, f, indent=2, ensure_ascii=False),
+    gzip-compressed if compress is set.
+    """
+
+    def __init__(self, path: str, compress: bool = False):
+        self.path = Path(path)
+        self._f = open_output(self.path, compress)
+        self._array = JSONArrayWriter(self._f, level=2)
+
+    @property
+    def page_count(self) -> int:
+        return self._array.count
+
+    def write_page(self, page: Dict[str, any]) -> None:
+        """Append one page record."""
+        self._array.write(page)
+
+    def close(self) -> None:
+        self._array.close()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ChapterJSONWriter:
+    """
+    Write a chapter in extract_chapter's JSON layout, one page at a time.
+
+    Pages go straight to the output file; the full_text and headings
+    sections are spooled to temporary files and appended on close. The
+    result matches json.dump(extract_chapter(...), f, indent=2,
+    ensure_ascii=False), gzip-compressed if compress is set.
+    """
+
+    def __init__(self, path: str, chapter_name: str,
+                 start_page: Optional[int] = None,
+                 end_page: Optional[int] = None,
+                 compress: bool = False):
+        self.path = Path(path)
+        self.page_count = 0
+        self.heading_count = 0
+
+        self._f = open_output(self.path, compress)
+        self._text = tempfile.TemporaryFile('w+', encoding='utf-8')
+        self._headings_file = tempfile.TemporaryFile('w+', encoding='utf-8')
+        self._pages = JSONArrayWriter(self._f, level=4)
+        self._headings = JSONArrayWriter(self._headings_file, level=4)
+
+        self._f.write('{\n')
+        self._f.write(f'  "chapter_name": {_dumps(chapter_name, 2)},\n')
+        self._f.write(f'  "start_page": {_dumps(start_page, 2)},\n')
+        self._f.write(f'  "end_page": {_dumps(end_page, 2)},\n')
+        self._f.write('  "pages": ')
+
+    def write_page(self, page: Dict[str, any],
+                   headings: Optional[List[Dict[str, any]]] = None) -> None:
+        """
+        Append one page.
+
+        Args:
+            page: Page dictionary from iter_pages
+            headings: Headings already detected for this page; detected
+                here when omitted
+        """
+        if headings is None:
+            headings = detect_headings(page['text'], page['page_number'])
+
+        self._pages.write(page)
+        # JSON string escaping is per character, so escaped fragments
+        # concatenate to the escaped whole
+        self._text.write(json.dumps(preserve_unicode(page['text']) + "\n\n",
+                                    ensure_ascii=False)[1:-1])
+        for heading in headings:
+            self._headings.write(heading)
+
+        self.page_count += 1
+        self.heading_count += len(headings)
+
+    def close(self) -> None:
+        self._pages.close()
+
+        self._f.write(',\n  "full_text": "')
+        self._text.seek(0)
+        shutil.copyfileobj(self._text, self._f)
+        self._f.write('",\n  "headings": ')
+
+        self._headings.close()
+        self._headings_file.seek(0)
+        shutil.copyfileobj(self._headings_file, self._f)
+
+        self._f.write(f',\n  "page_count": {self.page_count}\n}}')
+
+        self._text.close()
+        self._headings_file.close()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,278 @@
+"""
+Deterministic synthetic manual PDFs for benchmarking the extraction pipeline.
+Writes PDF syntax directly (no extra dependencies) with a ToUnicode map so
+that unicode brackets and bullets extract exactly like the real manual.
+"""
+
+import random
+import zlib
+from pathlib import Path
+from typing import Dict, List
+
+
+# Non-ASCII characters the generator can emit, mapped to single-byte codes
+SPECIAL_CHARS = ['●', '•', '〔', '〕', '【', '】', '˹', '˺', '「', '」']
+_CHAR_CODES = {char: 0x80 + i for i, char in enumerate(SPECIAL_CHARS)}
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+FONT_SIZE = 10
+LEADING = 12
+LINES_PER_PAGE = 56
+GLYPH_WIDTH = 500  # Font units (1/1000 em); every glyph has the same width
+
+_WORDS = [
+    'child', 'children', 'caregiver', 'care', 'play', 'learning', 'safety',
+    'hygiene', 'routine', 'activity', 'group', 'meal', 'rest', 'story',
+    'song', 'observe', 'support', 'encourage', 'gently', 'daily', 'clean',
+    'hands', 'water', 'toys', 'outdoor', 'indoor', 'language', 'counting',
+    'colors', 'shapes', 'friends', 'family', 'teacher', 'record', 'health',
+    'the', 'a', 'and', 'with', 'for', 'each', 'every', 'before', 'after',
+    'during', 'to', 'of', 'in', 'on', 'at', 'is', 'are', 'should', 'can',
+]
+
+_TITLES = [
+    'FRONT MATTER', 'CHILD ADMISSION', 'CHILD CARE', 'SAFETY AND HYGIENE',
+    'CHILD INTERACTION STRATEGIES', 'STRUCTURED ENRICHMENT', 'DAILY ROUTINES',
+    'STAFF STAYING IN DAYCARE', 'CAREGIVER CHALLENGE STORIES', 'APPENDIX',
+]
+
+# Footer printed at the bottom of every page, like the real manual's
+FOOTER_TEXT = 'EL_CgManual_SYNTHETIC_v001 November 5, 2025'
+
+_BRACKET_PAIRS = [('〔', '〕'), ('【', '】'), ('˹', '˺'), ('「', '」')]
+
+
+def _sentence(rng: random.Random, min_words: int, max_words: int) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return ' '.join(words)
+
+
+def _body_line(rng: random.Random, chapter_num: int, counters: Dict[str, int]) -> List[str]:
+    """Return one or more lines of body content."""
+    roll = rng.random()
+
+    if roll < 0.06:
+        counters['section'] += 1
+        return ['', f"{chapter_num}.{counters['section']} {_sentence(rng, 2, 4).title()}", '']
+    if roll < 0.10:
+        return ['', _sentence(rng, 2, 4).upper(), '']
+    if roll < 0.22:
+        marker = '●' if rng.random() < 0.6 else '•'
+        indent = '  ' if rng.random() < 0.2 else ''
+        return [f"{indent}{marker} {_sentence(rng, 3, 10)}"]
+    if roll < 0.28:
+        counters['step'] += 1
+        return [f"{counters['step']}. {_sentence(rng, 3, 9)}"]
+    if roll < 0.36:
+        left, right = rng.choice(_BRACKET_PAIRS)
+        return [f"{_sentence(rng, 2, 6)} {left}{_sentence(rng, 1, 3)}{right} "
+                f"{_sentence(rng, 2, 6)}"]
+    if roll < 0.40:
+        return ['']
+    return [_sentence(rng, 8, 14)]
+
+
+def generate_manual_pages(page_count: int = 100, chapter_count: int = 5,
+                          seed: int = 0) -> List[List[str]]:
+    """
+    Generate the text lines of a synthetic manual.
+
+    Args:
+        page_count: Number of pages
+        chapter_count: Number of CHAPTER markers, spread evenly from page 2
+        seed: Random seed; equal seeds give identical content
+
+    Returns:
+        One list of lines per page
+    """
+    rng = random.Random(seed)
+    chapter_starts = expected_chapter_starts(page_count, chapter_count)
+
+    pages = []
+    chapter_num = 0
+    counters = {'section': 0, 'step': 0}
+
+    chapter_page = 0
+
+    for page_num in range(page_count):
+        lines = []
+        if page_num in chapter_starts:
+            chapter_num = chapter_starts.index(page_num)
+            chapter_page = 0
+            counters = {'section': 0, 'step': 0}
+
+        if chapter_starts and page_num >= chapter_starts[0]:
+            # Running header with a page counter, as in "2. CHILD CARE Page 4 of XX"
+            chapter_page += 1
+            lines.append(f"{chapter_num}. {_TITLES[chapter_num % len(_TITLES)]} "
+                         f"Page {chapter_page} of XX")
+            lines.append('')
+
+        if page_num in chapter_starts:
+            lines.append(f"CHAPTER {chapter_num}. {_TITLES[chapter_num % len(_TITLES)]}")
+            lines.append('')
+        elif page_num < 2:
+            lines.append(f"EL CAREGIVER MANUAL {page_num + 1}")
+            lines.append('')
+
+        while len(lines) < LINES_PER_PAGE - 5:
+            lines.extend(_body_line(rng, chapter_num, counters))
+            if rng.random() < 0.08:
+                counters['step'] = 0
+
+        pages.append(lines[:LINES_PER_PAGE - 4] + ['', FOOTER_TEXT])
+
+    return pages
+
+
+def expected_chapter_starts(page_count: int, chapter_count: int) -> List[int]:
+    """Return the page numbers where the generator places CHAPTER markers."""
+    first_page = min(2, page_count - 1)
+    usable = page_count - first_page
+    chapter_count = max(0, min(chapter_count, usable))
+    return [first_page + (usable * i) // chapter_count for i in range(chapter_count)]
+
+
+def expected_boundaries(page_count: int, chapter_count: int) -> List[Dict[str, any]]:
+    """
+    Return the boundaries find_chapter_boundaries should report.
+
+    Args:
+        page_count: Number of pages passed to write_manual_pdf
+        chapter_count: Number of chapters passed to write_manual_pdf
+
+    Returns:
+        List in chapter_boundaries.json format
+    """
+    starts = expected_chapter_starts(page_count, chapter_count)
+    boundaries = []
+    for i, start in enumerate(starts):
+        boundaries.append({
+            'chapter_marker': f"CHAPTER {i}. {_TITLES[i % len(_TITLES)]}",
+            'page_number': start,
+            'chapter_type': 'CHAPTER',
+            'chapter_number': str(i),
+            'end_page': starts[i + 1] - 1 if i + 1 < len(starts) else None
+        })
+    return boundaries
+
+
+def _encode_line(line: str) -> str:
+    """Encode a line as a PDF hex string using the synthetic font's codes."""
+    codes = bytearray()
+    for char in line:
+        if char in _CHAR_CODES:
+            codes.append(_CHAR_CODES[char])
+        elif 32 <= ord(char) < 127:
+            codes.append(ord(char))
+        else:
+            codes.append(ord('?'))
+    return '<' + codes.hex() + '>'
+
+
+def _to_unicode_cmap() -> bytes:
+    entries = '\n'.join(f"<{code:02x}> <{ord(char):04x}>"
+                        for char, code in _CHAR_CODES.items())
+    return (
+        "/CIDInit /ProcSet findresource begin\n"
+        "12 dict begin\n"
+        "begincmap\n"
+        "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n"
+        "/CMapName /Adobe-Identity-UCS def\n"
+        "/CMapType 2 def\n"
+        "1 begincodespacerange\n<00> <ff>\nendcodespacerange\n"
+        "1 beginbfrange\n<20> <7e> <0020>\nendbfrange\n"
+        f"{len(_CHAR_CODES)} beginbfchar\n{entries}\nendbfchar\n"
+        "endcmap\n"
+        "CMapName currentdict /CMap defineresource pop\n"
+        "end\nend\n"
+    ).encode('ascii')
+
+
+def _stream(data: bytes, compress: bool) -> bytes:
+    if compress:
+        data = zlib.compress(data)
+        header = f"<< /Length {len(data)} /Filter /FlateDecode >>"
+    else:
+        header = f"<< /Length {len(data)} >>"
+    return header.encode('ascii') + b"\nstream\n" + data + b"\nendstream"
+
+
+def write_manual_pdf(path: str, page_count: int = 100, chapter_count: int = 5,
+                     seed: int = 0, compress: bool = True) -> Path:
+    """
+    Write a deterministic synthetic manual PDF.
+
+    The manual has CHAPTER markers at the top of chapter start pages, a
+    running header with a per-chapter page counter on chapter pages, a
+    footer on every page, numbered and all-caps headings, bullet and numbered lists, and tortoise-shell,
+    lenticular, corner and modifier-letter brackets.
+
+    Args:
+        path: Output PDF path
+        page_count: Number of pages
+        chapter_count: Number of chapters
+        seed: Random seed for the content
+        compress: Flate-compress page content streams
+
+    Returns:
+        Path of the written PDF
+    """
+    pages = generate_manual_pages(page_count, chapter_count, seed)
+
+    # Object numbers: 1 catalog, 2 page tree, 3 font, 4 descriptor,
+    # 5 ToUnicode, then a (page, content) pair per page
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: (f"<< /Type /Font /Subtype /Type1 /BaseFont /ELSyntheticSans "
+            f"/FirstChar 32 /LastChar 255 "
+            f"/Widths [{' '.join([str(GLYPH_WIDTH)] * 224)}] "
+            f"/FontDescriptor 4 0 R /ToUnicode 5 0 R >>").encode('ascii'),
+        4: (b"<< /Type /FontDescriptor /FontName /ELSyntheticSans /Flags 32 "
+            b"/FontBBox [0 -200 1000 800] /ItalicAngle 0 /Ascent 800 "
+            b"/Descent -200 /CapHeight 700 /StemV 80 >>"),
+        5: _stream(_to_unicode_cmap(), compress),
+    }
+
+    kids = []
+    for i, lines in enumerate(pages):
+        page_obj = 6 + 2 * i
+        content_obj = page_obj + 1
+        kids.append(f"{page_obj} 0 R")
+
+        content = [f"BT /F1 {FONT_SIZE} Tf {LEADING} TL 54 {PAGE_HEIGHT - 54} Td"]
+        for line in lines:
+            content.append(f"{_encode_line(line)} Tj T*")
+        content.append("ET")
+
+        objects[page_obj] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_obj} 0 R >>"
+        ).encode('ascii')
+        objects[content_obj] = _stream('\n'.join(content).encode('ascii'), compress)
+
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode('ascii')
+
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(output_path, 'wb') as f:
+        f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = {}
+        for number in sorted(objects):
+            offsets[number] = f.tell()
+            f.write(f"{number} 0 obj\n".encode('ascii'))
+            f.write(objects[number])
+            f.write(b"\nendobj\n")
+
+        xref_offset = f.tell()
+        size = max(objects) + 1
+        f.write(f"xref\n0 {size}\n0000000000 65535 f \n".encode('ascii'))
+        for number in range(1, size):
+            f.write(f"{offsets[number]:010d} 00000 n \n".encode('ascii'))
+        f.write(f"trailer\n<< /Size {size} /Root 1 0 R >>\n"
+                f"startxref\n{xref_offset}\n%%EOF\n".encode('ascii'))
+
+    return output_path
+
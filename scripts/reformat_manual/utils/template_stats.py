@@ -0,0 +1,126 @@
+"""
+Mergeable formatting statistics for template analysis.
+
+A chapter's classified lines are reduced in one pass to counters and
+histograms (bullet markers, indentation, blank-line runs, heading kinds and
+depths, line lengths). Statistics from separate chapters merge by adding
+counters, so chapters can be analyzed in separate processes and reduced in
+any order into a corpus-wide summary.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from .line_classifier import ClassifiedLine
+
+
+# Width of the line length histogram buckets (characters)
+LINE_LENGTH_BUCKET = 10
+
+# Lines shorter than this and followed by a blank line count as short lines
+# (the 'short_lines' heading pattern in analyze_template.py)
+SHORT_LINE_LENGTH = 80
+
+
+def _histogram(counter: Counter) -> Dict[str, int]:
+    """Counter with numeric keys as a JSON object in key order."""
+    return {str(key): count for key, count in sorted(counter.items())}
+
+
+class TemplateStatistics:
+    """
+    Counters describing the formatting of one or more chapters.
+
+    Attributes:
+        chapters, pages, lines, blank_lines, numbered_list_items: Totals
+        heading_types: Lines per heading pattern (all_caps, numbered,
+            bracketed, short_lines), as in analyze_heading_patterns
+        heading_depths: Numbered headings per section depth ("2.1" is 2)
+        bullet_markers: Bullet lines per marker character
+        bullet_indentation: Bullet lines per leading whitespace width
+        indentation: Non-blank lines per leading whitespace width
+        blank_runs: Runs of consecutive blank lines per run length
+        line_lengths: Non-blank lines per length bucket (bucket start)
+        brackets: Occurrences per unicode bracket character
+    """
+
+    COUNTERS = ('heading_types', 'heading_depths', 'bullet_markers',
+                'bullet_indentation', 'indentation', 'blank_runs',
+                'line_lengths', 'brackets')
+    TOTALS = ('chapters', 'pages', 'lines', 'blank_lines', 'numbered_list_items')
+
+    def __init__(self):
+        for name in self.TOTALS:
+            setattr(self, name, 0)
+        for name in self.COUNTERS:
+            setattr(self, name, Counter())
+
+    @classmethod
+    def for_chapter(cls, lines: Iterable[ClassifiedLine], page_count: Optional[int] = None,
+                    bracket_counts: Optional[Dict[str, int]] = None) -> 'TemplateStatistics':
+        """
+        Statistics of one chapter.
+
+        Args:
+            lines: The chapter's classified lines
+            page_count: Number of PDF pages, if known
+            bracket_counts: Occurrences per bracket character (e.g. from
+                analyze_unicode_brackets), so the text is not scanned again
+        """
+        stats = cls()
+        stats.chapters = 1
+        stats.pages = page_count or 0
+        stats.add_lines(lines)
+        if bracket_counts:
+            stats.brackets.update(bracket_counts)
+        return stats
+
+    def add_lines(self, lines: Iterable[ClassifiedLine]) -> None:
+        """Count classified lines; a trailing run of blank lines is not a run."""
+        blank_run = 0
+        for line in lines:
+            self.lines += 1
+            if line.blank:
+                self.blank_lines += 1
+                blank_run += 1
+                continue
+
+            if blank_run:
+                self.blank_runs[blank_run] += 1
+                blank_run = 0
+
+            self.indentation[line.indent] += 1
+            self.line_lengths[len(line.stripped) // LINE_LENGTH_BUCKET * LINE_LENGTH_BUCKET] += 1
+
+            if line.bullet:
+                self.bullet_markers[line.bullet] += 1
+                self.bullet_indentation[line.indent] += 1
+            if line.numbered_list:
+                self.numbered_list_items += 1
+
+            if line.all_caps:
+                self.heading_types['all_caps'] += 1
+            if line.numbered_heading:
+                self.heading_types['numbered'] += 1
+                self.heading_depths[line.stripped.split()[0].rstrip('.').count('.') + 1] += 1
+            if line.bracketed:
+                self.heading_types['bracketed'] += 1
+            if len(line.stripped) < SHORT_LINE_LENGTH and line.followed_by_blank:
+                self.heading_types['short_lines'] += 1
+
+    def merge(self, other: 'TemplateStatistics') -> None:
+        """Add another set of statistics into this one."""
+        for name in self.TOTALS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for name in self.COUNTERS:
+            getattr(self, name).update(getattr(other, name))
+
+    def to_dict(self) -> Dict[str, any]:
+        data = {name: getattr(self, name) for name in self.TOTALS}
+        data['heading_types'] = dict(self.heading_types.most_common())
+        data['bullet_markers'] = dict(self.bullet_markers.most_common())
+        data['brackets'] = dict(self.brackets.most_common())
+        for name in ('heading_depths', 'bullet_indentation', 'indentation',
+                     'blank_runs', 'line_lengths'):
+            data[name] = _histogram(getattr(self, name))
+        return data